@@ -3,91 +3,1134 @@ import os
 import json
 import math
 import time
+import hashlib
+import copy
+import random
 
 PROJECT_DIR = unreal.SystemLibrary.get_project_directory()
-SAVED_DIR = os.path.join(PROJECT_DIR, "Saved", "GPUCrashFinder")
+BASE_DIR = os.path.join(PROJECT_DIR, "Saved", "GPUCrashFinder")
+JOB_FILE = os.path.join(BASE_DIR, "job.json")
+
+def job_state_dir():
+    # The watchdog's job queue gives every map its own state directory through job.json
+    try:
+        with open(JOB_FILE, "r") as f:
+            return json.load(f).get("state_dir") or BASE_DIR
+    except (OSError, ValueError, AttributeError):
+        return BASE_DIR
+
+SAVED_DIR = job_state_dir()
 os.makedirs(SAVED_DIR, exist_ok=True)
 
 STATE_FILE = os.path.join(SAVED_DIR, "crash_isolation_state.json")
+JOURNAL_FILE = os.path.join(SAVED_DIR, "crash_isolation_state.journal")
 EXPORT_FILE = os.path.join(SAVED_DIR, "crashing_actors_list.txt")
 STATUS_FILE = os.path.join(SAVED_DIR, "status.json")
+VERDICT_CACHE_FILE = os.path.join(SAVED_DIR, "verdict_cache.jsonl")
+FEATURES_FILE = os.path.join(SAVED_DIR, "actor_features.json")
+# Shared by every project on this machine; GPUCF_CRASH_HISTORY moves it
+CRASH_HISTORY_FILE = (os.environ.get("GPUCF_CRASH_HISTORY")
+                      or os.path.join(os.path.expanduser("~"), "GPUCrashFinder", "crash_history.sqlite"))
+HANDSHAKE_FILE = os.path.join(BASE_DIR, "handshake.json")
 CHUNK_COUNT = 10
+# Rewrite the state snapshot after this many journal records
+COMPACT_EVERY = 64
 
-def get_relevant_actors():
-    subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
-    all_actors = subsystem.get_all_level_actors()
-    relevant = []
-    for actor in all_actors:
-        name = actor.get_name()
-        if isinstance(actor, (unreal.StaticMeshActor, unreal.Landscape)):
-            relevant.append(actor)
-        elif actor.get_components_by_class(unreal.SplineMeshComponent):
-            relevant.append(actor)
-        elif name.startswith("BP_") or "Blueprint" in actor.get_class().get_name():
-            relevant.append(actor)
-        else:
-            relevant.append(actor)
-    return relevant
-
-def destroy_actors_not_in(names_to_keep):
-    subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
-    all_actors = subsystem.get_all_level_actors()
-    for actor in all_actors:
-        if actor.get_name() not in names_to_keep:
+# Search strategy used to pick chunks and to split crashing ones:
+#   "bisect"   - CHUNK_COUNT chunks, every half of a crashing chunk baked (original behaviour)
+#   "kway"     - crashing chunks split into SPLIT_FACTOR parts
+#   "hwang"    - generalized binary splitting tuned for EXPECTED_CULPRITS culprits
+#   "adaptive" - split factor picked from the observed crash rate
+#   "ddmin"    - delta-debug the whole level for a minimal crashing combination of actors
+SEARCH_STRATEGY = "hwang"
+SPLIT_FACTOR = 4
+MAX_SPLIT_FACTOR = 16
+EXPECTED_CULPRITS = 1
+# Bake a single actor even when its passing siblings already prove it crashes
+CONFIRM_CULPRITS = True
+# Switch to delta debugging when a crashing chunk's parts all pass on their own
+INTERACTION_SEARCH = True
+# Skip actors whose fingerprint passed in an earlier run; a share of them is baked again anyway
+VERDICT_CACHE = True
+SPOT_CHECK_SHARE = 0.02
+SPOT_CHECK_MIN = 8
+# Search actors whose meshes, materials or component types crashed in earlier runs of any
+# project first, and in smaller chunks
+CRASH_HISTORY = True
+# Actors the crash log of a crashing chunk names are baked on their own before it is split
+MAX_SUSPECTS = 3
+# How a chunk is cut out of the level:
+#   "destroy" - every other actor is destroyed; the watchdog reloads the map after each bake
+#   "exclude" - every other actor is made movable and invisible, which keeps it out of the
+#               lighting build; the next run puts back what the next chunk needs, so the map
+#               is only loaded again when the editor restarts after a crash
+ISOLATION_MODE = "exclude"
+
+class LevelSnapshot:
+    # One enumeration of the level per run; every lookup afterwards is a dict hit
+    def __init__(self):
+        self.subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+        self.actors = list(self.subsystem.get_all_level_actors())
+        self.names = [actor.get_name() for actor in self.actors]
+        self.by_name = dict(zip(self.names, self.actors))
+        self._labels = {}
+
+    def label(self, name):
+        if name not in self._labels:
+            try:
+                self._labels[name] = self.by_name[name].get_actor_label()
+            except Exception:
+                self._labels[name] = name
+        return self._labels[name]
+
+# ---------- RELEVANCE ----------
+# Which actors the isolation searches, decided in one pass over the level:
+#   search   - has a component that gets a lightmap or casts a static shadow; split into chunks
+#   required - the lighting itself (lights, sky, fog, Lightmass volumes); kept in every bake
+#   skip     - nothing the bake sees (cameras, triggers, decals, sounds, movable actors); kept too
+# Class names also match subclasses, and names this engine version lacks are ignored. The
+# class rules are decided once per class; an actor of any other class is searched when it
+# has one of LIGHTMAP_COMPONENTS, which costs one component lookup per actor.
+REQUIRED_CLASSES = ("Light", "SkyLight", "SkyAtmosphere", "ExponentialHeightFog", "VolumetricCloud",
+                    "LightmassImportanceVolume", "LightmassCharacterIndirectDetailVolume", "LightmassPortal",
+                    "WorldSettings")
+SKIPPED_CLASSES = ("CameraActor", "PlayerStart", "TriggerBase", "DecalActor", "Note", "TextRenderActor",
+                   "PostProcessVolume", "BlockingVolume", "AudioVolume", "AmbientSound", "NavMeshBoundsVolume",
+                   "NavigationData", "ReflectionCapture", "NiagaraActor", "Emitter")
+SEARCHED_CLASSES = ("StaticMeshActor", "LandscapeProxy", "InstancedFoliageActor")
+LIGHTMAP_COMPONENTS = ("StaticMeshComponent", "LandscapeComponent", "ModelComponent")
+# Movable components get no lightmap and cast no static shadow
+SKIP_MOVABLE = True
+
+def unreal_classes(names):
+    return tuple(c for c in (getattr(unreal, name, None) for name in names) if isinstance(c, type))
+
+def is_movable(component):
+    try:
+        return component.get_editor_property("mobility") == unreal.ComponentMobility.MOVABLE
+    except Exception:
+        return False
+
+def classify_actors(level):
+    # {"search": [...], "required": [...], "skip": [...]}, each in level order
+    rules = [("required", unreal_classes(REQUIRED_CLASSES)), ("skip", unreal_classes(SKIPPED_CLASSES)),
+             ("search", unreal_classes(SEARCHED_CLASSES))]
+    lightmap = unreal_classes(LIGHTMAP_COMPONENTS)
+    by_class = {}
+    roles = {"search": [], "required": [], "skip": []}
+    for actor in level.actors:
+        cls = actor.get_class().get_name()
+        if cls not in by_class:
+            by_class[cls] = next((role for role, classes in rules if classes and isinstance(actor, classes)), None)
+        role = by_class[cls]
+        if role is None:
+            components = [c for c in actor.get_components_by_class(unreal.PrimitiveComponent) if isinstance(c, lightmap)]
+            if SKIP_MOVABLE:
+                components = [c for c in components if not is_movable(c)]
+            role = "search" if components else "skip"
+        elif role == "search" and SKIP_MOVABLE:
+            try:
+                role = "skip" if is_movable(actor.get_editor_property("root_component")) else role
+            except Exception:
+                pass
+        roles[role].append(actor)
+    return roles
+
+def get_relevant_actors(level):
+    return classify_actors(level)["search"]
+
+def destroy_actors_not_in(level, names_to_keep, searched=None):
+    # Only searched actors leave the level; None searches all of them
+    names_to_keep = set(names_to_keep)
+    for name in level.names if searched is None else searched:
+        actor = level.by_name.get(name)
+        if actor is not None and name not in names_to_keep:
+            try:
+                level.subsystem.destroy_actor(actor)
+            except Exception as e:
+                unreal.log_warning(f"Could not delete {name}: {e}")
+
+# ---------- EXCLUSION ----------
+# This script starts fresh every cycle, so the flags excluded actors had before are kept on
+# the unreal module, which lives as long as the editor: {name: (actor, [(component, mobility,
+# visible), ...])}. A reloaded map has new actor objects with their saved flags, so entries
+# whose actor is no longer the one in the level are dropped instead of restored.
+
+def exclude_actor(actor):
+    components = actor.get_components_by_class(unreal.SceneComponent)
+    saved = [(c, c.get_editor_property("mobility"), c.get_editor_property("visible")) for c in components]
+    for component in components:
+        component.set_mobility(unreal.ComponentMobility.MOVABLE)
+        component.set_visibility(False)
+    return actor, saved
+
+def restore_actor(entry):
+    for component, mobility, visible in entry[1]:
+        component.set_mobility(mobility)
+        component.set_visibility(visible)
+
+def exclude_actors_not_in(level, names_to_keep, searched=None):
+    # Only actors whose side of the chunk changed since the last run are touched
+    names_to_keep = set(names_to_keep)
+    excluded = {name: entry for name, entry in getattr(unreal, "_gpucf_excluded", {}).items()
+                if level.by_name.get(name) == entry[0]}
+    for name in [name for name in excluded if name in names_to_keep]:
+        try:
+            restore_actor(excluded.pop(name))
+        except Exception as e:
+            unreal.log_warning(f"Could not restore {name}: {e}")
+    for name in level.names if searched is None else searched:
+        actor = level.by_name.get(name)
+        if actor is not None and name not in names_to_keep and name not in excluded:
             try:
-                subsystem.destroy_actor(actor)
+                excluded[name] = exclude_actor(actor)
             except Exception as e:
-                unreal.log_warning(f"Could not delete {actor.get_name()}: {e}")
+                unreal.log_warning(f"Could not exclude {name}: {e}")
+    unreal._gpucf_excluded = excluded
+
+def isolate_chunk(level, names_to_keep, searched=None):
+    if ISOLATION_MODE == "exclude":
+        exclude_actors_not_in(level, names_to_keep, searched)
+    else:
+        destroy_actors_not_in(level, names_to_keep, searched)
+
+def restore_level(level):
+    # Excluded actors go back before the level is baked whole or handed back to the user
+    if getattr(unreal, "_gpucf_excluded", None):
+        exclude_actors_not_in(level, level.names)
+
+# ---------- BAKE COST ----------
+# A relative estimate of what an actor adds to a GPU Lightmass bake, taken once when the
+# isolation starts: lightmap texels dominate, triangles and components add to it.
+TEXELS_PER_COST = 64 * 64
+TRIANGLES_PER_COST = 20000
+LANDSCAPE_COMPONENT_COST = 4.0
+
+def lightmap_resolution(component):
+    try:
+        if component.get_editor_property("override_light_map_res"):
+            return component.get_editor_property("overridden_light_map_res")
+        mesh = component.get_editor_property("static_mesh")
+        return mesh.get_editor_property("light_map_resolution") if mesh else 0
+    except Exception:
+        return 0
+
+def triangle_count(component):
+    try:
+        mesh = component.get_editor_property("static_mesh")
+        return mesh.get_num_triangles(0) if mesh else 0
+    except Exception:
+        return 0
+
+def actor_cost(actor):
+    cost = 1.0
+    for component in actor.get_components_by_class(unreal.StaticMeshComponent):
+        resolution = lightmap_resolution(component)
+        cost += 0.25 + resolution * resolution / TEXELS_PER_COST + triangle_count(component) / TRIANGLES_PER_COST
+    if isinstance(actor, unreal.Landscape):
+        cost += LANDSCAPE_COMPONENT_COST * len(actor.get_components_by_class(unreal.LandscapeComponent))
+    return round(cost, 2)
+
+# ---------- VERDICT CACHE ----------
+# verdict_cache.jsonl maps actor fingerprints to "good", "bad" or "combination" and is not
+# touched by Reset Isolation Progress. Each save appends the verdicts it added as one line
+#   {"good": ["3f2a…", …], "bad": [...], "combination": [...]}
+# and the file is rewritten compacted whenever an isolation starts. A fingerprint covers what
+# the bake sees of an actor, so an edited, moved or re-meshed actor gets a new one.
+# Members of a crashing combination pass on their own, so they are never trusted as good nor
+# baked alone: the next run bakes them together with the changed actors.
+
+def asset_path(obj):
+    try:
+        return obj.get_path_name() if obj else ""
+    except Exception:
+        return "?"
+
+def actor_fingerprint(actor):
+    parts = [actor.get_class().get_name()]
+    try:
+        loc, rot, scale = actor.get_actor_location(), actor.get_actor_rotation(), actor.get_actor_scale3d()
+        parts.append("%.1f %.1f %.1f %.2f %.2f %.2f %.3f %.3f %.3f" % (loc.x, loc.y, loc.z, rot.roll, rot.pitch, rot.yaw,
+                                                                         scale.x, scale.y, scale.z))
+    except Exception:
+        parts.append("?")
+    for component in actor.get_components_by_class(unreal.StaticMeshComponent):
+        try:
+            materials = [asset_path(m) for m in component.get_materials()]
+        except Exception:
+            materials = ["?"]
+        parts.append(" ".join([asset_path(component.get_editor_property("static_mesh")),
+                               str(lightmap_resolution(component))] + materials))
+    if isinstance(actor, unreal.Landscape):
+        parts.append(str(len(actor.get_components_by_class(unreal.LandscapeComponent))))
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()[:16]
+
+def load_verdict_cache():
+    verdicts = {}
+    if not VERDICT_CACHE or not os.path.exists(VERDICT_CACHE_FILE):
+        return verdicts
+    with open(VERDICT_CACHE_FILE, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            # Later lines win: an actor that crashed once and passed after a fix is good again
+            verdicts.update((fp, "good") for fp in record.get("good", []))
+            verdicts.update((fp, "bad") for fp in record.get("bad", []))
+            verdicts.update((fp, "combination") for fp in record.get("combination", []))
+    return verdicts
+
+def write_verdict_cache(verdicts):
+    record = {key: [fp for fp, v in verdicts.items() if v == key] for key in ("good", "bad", "combination")}
+    tmp = VERDICT_CACHE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    os.replace(tmp, VERDICT_CACHE_FILE)
+
+def remember_verdicts(state, known_good, known_bad, known_sets):
+    # Appends the verdicts added since the last save; known_* are what the last save had
+    fingerprints = state.get("fingerprints")
+    if not VERDICT_CACHE or not fingerprints or len(fingerprints) != len(state["to_test"]):
+        return
+    index = name_index(state)
+    record = {}
+    good = state["tested_good"] - known_good
+    if good:
+        record["good"] = [fingerprints[index[n]] for n in good]
+    if len(state["tested_bad"]) > known_bad:
+        record["bad"] = [fingerprints[index[n]] for n in state["tested_bad"][known_bad:]]
+    if len(state["crashing_sets"]) > known_sets:
+        record["combination"] = [fingerprints[index[n]] for names in state["crashing_sets"][known_sets:] for n in names]
+    if record:
+        with open(VERDICT_CACHE_FILE, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+# ---------- CRASH HISTORY ----------
+# CRASH_HISTORY_FILE is an SQLite database that every finished isolation adds to:
+#   runs      one row per isolation: project, searched actors, culprits
+#   features  per feature, how many searched actors had it and how many culprits
+#   culprits  every culprit's name and features
+# A feature is something a bake sees and other actors share: the class, a mesh or material
+# package, a component type (SplineMeshComponent, …) or the lightmap size. A feature's crash
+# rate starts out as the base rate of all runs, worth RISK_SMOOTHING culprits, so one unlucky
+# crash does not mark a mesh; an actor's risk is the rate of its riskiest feature. When an
+# isolation starts, actors at RISK_LIFT times the base rate or more go to the front of the
+# actor list, riskiest first, and crashing chunks are split into parts of equal risk instead
+# of equal cost, so a likely culprit ends up in a small part early.
+# actor_features.json keeps the features of the running isolation until it is recorded.
+RISK_SMOOTHING = 1.0
+RISK_LIFT = 3.0
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (time REAL, project TEXT, actors INTEGER, culprits INTEGER);
+CREATE TABLE IF NOT EXISTS features (feature TEXT PRIMARY KEY, seen INTEGER NOT NULL, crashed INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS culprits (time REAL, project TEXT, actor TEXT, features TEXT);
+"""
+
+def actor_features(actor):
+    features = {"class:" + actor.get_class().get_name()}
+    for component in actor.get_components_by_class(unreal.StaticMeshComponent):
+        try:
+            features.add("component:" + component.get_class().get_name())
+            paths = [asset_path(component.get_editor_property("static_mesh"))]
+            materials = [asset_path(m) for m in component.get_materials()]
+        except Exception:
+            continue
+        features.update("mesh:" + path.split(".")[0] for path in paths if path)
+        features.update("material:" + path.split(".")[0] for path in materials if path)
+        resolution = lightmap_resolution(component)
+        if resolution > 0:
+            features.add("lightmap:%d" % 2 ** int(math.log2(resolution)))
+    return sorted(features)
 
-def export_crashing_actors(state):
-    subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
-    all_actors = subsystem.get_all_level_actors()
-    name_to_label = {actor.get_name(): actor.get_actor_label() for actor in all_actors}
+def open_crash_history():
+    # None when the history is off or the editor's Python has no sqlite3
+    if not CRASH_HISTORY:
+        return None
+    try:
+        import sqlite3
+        os.makedirs(os.path.dirname(CRASH_HISTORY_FILE), exist_ok=True)
+        db = sqlite3.connect(CRASH_HISTORY_FILE, timeout=30)
+        db.executescript(HISTORY_SCHEMA)
+        return db
+    except Exception as e:
+        unreal.log_warning(f"⚠️ Crash history unavailable: {e}")
+        return None
+
+def rank_by_risk(features):
+    # (order, risks, risky count) for the actor list, or None when the history knows nothing risky about it
+    db = open_crash_history()
+    if db is None:
+        return None
+    try:
+        actors, culprits = db.execute("SELECT TOTAL(actors), TOTAL(culprits) FROM runs").fetchone()
+        if not actors:
+            return None
+        prior = (culprits + 1) / (actors + 2)
+        wanted = {feature for names in features for feature in names}
+        rates = {feature: (crashed + RISK_SMOOTHING) / (seen + RISK_SMOOTHING / prior)
+                 for feature, seen, crashed in db.execute("SELECT feature, seen, crashed FROM features")
+                 if feature in wanted}
+    finally:
+        db.close()
+    risks = [max([rates.get(feature, prior) for feature in names] or [prior]) for names in features]
+    risky = sorted((i for i, risk in enumerate(risks) if risk >= RISK_LIFT * prior), key=lambda i: -risks[i])
+    if not risky:
+        return None
+    flagged = set(risky)
+    return risky + [i for i in range(len(risks)) if i not in flagged], risks, len(risky)
+
+def write_actor_features(features):
+    # Feature lists as indices into one vocabulary, in actor list order
+    vocabulary = {}
+    actors = [[vocabulary.setdefault(feature, len(vocabulary)) for feature in names] for names in features]
+    tmp = FEATURES_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"features": list(vocabulary), "actors": actors}, f, separators=(",", ":"))
+    os.replace(tmp, FEATURES_FILE)
+
+def record_crash_history(state):
+    # Adds a finished isolation once: actor_features.json is removed afterwards
+    try:
+        with open(FEATURES_FILE, "r") as f:
+            saved = json.load(f)
+        vocabulary, actors = saved["features"], saved["actors"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return
+    if len(actors) != len(state["to_test"]):
+        return
+    index = name_index(state)
+    culprits = list(dict.fromkeys(state["tested_bad"] + [n for names in state.get("crashing_sets", []) for n in names]))
+    seen, crashed = [0] * len(vocabulary), [0] * len(vocabulary)
+    for ids in actors:
+        for i in ids:
+            seen[i] += 1
+    for name in culprits:
+        for i in actors[index[name]]:
+            crashed[i] += 1
+    db = open_crash_history()
+    if db is None:
+        return
+    try:
+        now = time.time()
+        with db:
+            db.execute("INSERT INTO runs VALUES (?, ?, ?, ?)", (now, PROJECT_DIR, len(actors), len(culprits)))
+            db.executemany("INSERT INTO features VALUES (?, ?, ?) ON CONFLICT(feature) DO UPDATE SET "
+                           "seen = seen + excluded.seen, crashed = crashed + excluded.crashed",
+                           zip(vocabulary, seen, crashed))
+            db.executemany("INSERT INTO culprits VALUES (?, ?, ?, ?)",
+                           [(now, PROJECT_DIR, name, json.dumps([vocabulary[i] for i in actors[index[name]]]))
+                            for name in culprits])
+    except Exception as e:
+        unreal.log_warning(f"⚠️ Could not update the crash history: {e}")
+        return
+    finally:
+        db.close()
+    os.remove(FEATURES_FILE)
+    unreal.log(f"📚 Crash history updated: {len(culprits)} culprits among {len(actors)} actors.")
+
+def export_crashing_actors(state, level):
+    name_to_label = {name: level.label(name) for name in state["tested_bad"]}
+    for names in state.get("crashing_sets", []):
+        name_to_label.update((name, level.label(name)) for name in names)
 
     with open(EXPORT_FILE, "w") as f:
         f.write("Crashing Actors:\n")
         for name in state["tested_bad"]:
             label = name_to_label.get(name, name)
             f.write(label + "\n")
+        if state.get("crashing_sets"):
+            f.write("Crashing Combinations:\n")
+            for names in state["crashing_sets"]:
+                f.write(" + ".join(name_to_label.get(name, name) for name in names) + "\n")
     unreal.log(f"📝 Exported crashing actors to: {EXPORT_FILE}")
 
 
-def load_state():
-    if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, "r") as f:
-            return json.load(f)
-    else:
-        return {
-            "tested_good": [],
-            "tested_bad": [],
-            "to_test": [],
-            "index_stack": [],
-            "initialized": False,
-            "last_chunk": [],
-            "finished": False
-        }
+def new_state():
+    return {
+        "tested_good": set(),
+        "tested_bad": [],
+        "to_test": [],
+        "index_stack": [],
+        "initialized": False,
+        "last_chunk": [],
+        "last_entry": None,
+        "finished": False,
+        "strategy": SEARCH_STRATEGY,
+        "groups": {},
+        "next_group": 0,
+        "bakes": 0,
+        "crashes": 0,
+        "baked_actors": 0,
+        "ddmin": None,
+        "ddmin_cache": {},
+        "crashing_sets": [],
+        "workers": 1,
+        "costs": [],
+        "fingerprints": [],
+        "risks": [],
+        "journal_seq": 0
+    }
 
-def save_state(state):
+# ---------- STATE FILE ----------
+# crash_isolation_state.json is a snapshot whose first line is a one-line summary header:
+#   {"summary": {...},
+#   "state": {...}}
+# The actor list is stored once and everything else refers to it by index, as [start, end)
+# runs where possible. Each save appends the changed fields to crash_isolation_state.journal;
+# every COMPACT_EVERY records the snapshot is rewritten (temp file + rename) and the journal dropped.
+
+STATE_FORMAT = 2
+SUMMARY_PREFIX = '{"summary": '
+# Fields that only ever grow and are journaled as additions
+APPENDED_FIELDS = ("good", "bad", "crashing_sets", "ddmin_cache")
+
+def state_summary(state):
     total_chunks = len(state.get("index_stack", [])) + (1 if state.get("last_chunk") else 0)
     completed_chunks = len(state.get("tested_good", [])) + len(state.get("tested_bad", []))
-    all_chunks = total_chunks + completed_chunks
+    return {
+        "format": STATE_FORMAT,
+        "seq": state.get("journal_seq", 0),
+        "finished": state.get("finished", False),
+        "chunks_remaining": total_chunks,
+        "chunks_completed": completed_chunks,
+        "all_chunks": total_chunks + completed_chunks,
+        "current_chunk_size": len(state.get("last_chunk", [])),
+        "actors": len(state.get("to_test", [])),
+        "culprits": len(state.get("tested_bad", [])) + len(state.get("crashing_sets", [])),
+        "bakes": state.get("bakes", 0),
+        "strategy": state.get("strategy"),
+        "minimizing": bool(state.get("ddmin"))
+    }
+
+def pack_entry(entry):
+    entry = as_entry(entry)
+    flags = {k: v for k, v in entry.items() if k not in ("start", "end")}
+    return [entry["start"], entry["end"], flags] if flags else [entry["start"], entry["end"]]
 
-    extended_state = state.copy()
-    extended_state["chunks_remaining"] = total_chunks
-    extended_state["chunks_completed"] = completed_chunks
-    extended_state["all_chunks"] = all_chunks
-    extended_state["current_chunk_size"] = len(state.get("last_chunk", []))
+def encode_state(state):
+    # A detached copy: the journal diffs the next save against it
+    index = name_index(state)
+    name_fields = ("to_test", "tested_good", "tested_bad", "last_chunk", "crashing_sets", "costs", "fingerprints", "risks")
+    body = copy.deepcopy({k: v for k, v in state.items() if not k.startswith("_") and k not in name_fields})
+    body["actors"] = state["to_test"]
+    # Set once with the actor list and never changed, so shared rather than copied
+    body["costs"] = state.get("costs", [])
+    body["fingerprints"] = state.get("fingerprints", [])
+    body["risks"] = state.get("risks", [])
+    body["good"] = to_runs(sorted(index[n] for n in state["tested_good"]))
+    body["bad"] = [index[n] for n in state["tested_bad"]]
+    body["last_chunk"] = to_runs([index[n] for n in state["last_chunk"]])
+    body["crashing_sets"] = [[index[n] for n in names] for names in state["crashing_sets"]]
+    body["index_stack"] = [pack_entry(e) for e in state["index_stack"]]
+    return body
 
-    with open(STATE_FILE, "w") as f:
-        json.dump(extended_state, f, indent=2)
+def decode_fields(state, fields):
+    names = state["to_test"]
+    for key, value in fields.items():
+        if key == "last_chunk":
+            state[key] = [names[i] for i in from_runs(value)]
+        else:
+            state[key] = value
 
-def initialize_chunks(all_names):
+def apply_journal_record(state, record):
+    names = state["to_test"]
+    state["tested_good"].update(names[i] for i in from_runs(record.get("good", [])))
+    state["tested_bad"].extend(names[i] for i in record.get("bad", []))
+    state["crashing_sets"].extend([names[i] for i in s] for s in record.get("crashing_sets", []))
+    state["ddmin_cache"].update(record.get("ddmin_cache", {}))
+    decode_fields(state, record.get("set", {}))
+    state["journal_seq"] = record["seq"]
+
+def read_journal():
+    # (records, torn); torn when an interrupted append left a partial last line
+    records = []
+    if not os.path.exists(JOURNAL_FILE):
+        return records, False
+    with open(JOURNAL_FILE, "r") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                return records, True
+            if not line.endswith("\n"):
+                return records, True
+    return records, False
+
+def load_state():
+    state = new_state()
+    if not os.path.exists(STATE_FILE):
+        return state
+    with open(STATE_FILE, "r") as f:
+        saved = json.load(f)
+
+    if "state" not in saved:
+        # Plain JSON written before the snapshot format; it is converted on the next save.
+        # Files written before search strategies existed keep their original bisection.
+        saved.setdefault("strategy", "bisect")
+        for key in ("chunks_remaining", "chunks_completed", "all_chunks", "current_chunk_size"):
+            saved.pop(key, None)
+        state.update(saved)
+        state["tested_good"] = set(state["tested_good"])
+        return state
+
+    body = saved["state"]
+    names = body.pop("actors")
+    state["to_test"] = names
+    state["tested_good"] = {names[i] for i in from_runs(body.pop("good"))}
+    state["tested_bad"] = [names[i] for i in body.pop("bad")]
+    state["crashing_sets"] = [[names[i] for i in s] for s in body.pop("crashing_sets")]
+    decode_fields(state, body)
+
+    replayed = 0
+    records, torn = read_journal()
+    for record in records:
+        if record["seq"] > state["journal_seq"]:
+            apply_journal_record(state, record)
+            replayed += 1
+    state["_persisted"] = encode_state(state)
+    state["_persisted_good"] = set(state["tested_good"])
+    # The next append would land on the torn line, so the next save rewrites the snapshot instead
+    state["_journal_records"] = COMPACT_EVERY if torn else replayed
+    return state
+
+def write_snapshot(state, body):
+    body["journal_seq"] = state["journal_seq"]
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(SUMMARY_PREFIX + json.dumps(state_summary(state)) + ",\n")
+        f.write('"state": ' + json.dumps(body, separators=(",", ":")) + "}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, STATE_FILE)
+    # Records up to journal_seq are now in the snapshot; a crash before this removal is harmless
+    if os.path.exists(JOURNAL_FILE):
+        os.remove(JOURNAL_FILE)
+    state["_journal_records"] = 0
+
+def journal_record(state, body):
+    persisted = state["_persisted"]
+    record = {"seq": state["journal_seq"], "summary": state_summary(state)}
+    added_good = state["tested_good"] - state["_persisted_good"]
+    if added_good:
+        index = name_index(state)
+        record["good"] = to_runs(sorted(index[n] for n in added_good))
+    for key in ("bad", "crashing_sets"):
+        if len(body[key]) > len(persisted[key]):
+            record[key] = body[key][len(persisted[key]):]
+    cache = {k: v for k, v in body["ddmin_cache"].items() if persisted["ddmin_cache"].get(k) != v}
+    if cache:
+        record["ddmin_cache"] = cache
+    changed = {k: v for k, v in body.items()
+               if k not in APPENDED_FIELDS and k not in ("actors", "costs", "fingerprints", "risks", "journal_seq") and persisted.get(k) != v}
+    if changed:
+        record["set"] = changed
+    return record
+
+def save_state(state):
+    body = encode_state(state)
+    persisted = state.get("_persisted")
+    remember_verdicts(state, state.get("_persisted_good", state.get("_cached_good", set())),
+                      len(persisted["bad"]) if persisted else 0, len(persisted["crashing_sets"]) if persisted else 0)
+    state["journal_seq"] = state.get("journal_seq", 0) + 1
+
+    if (persisted is None or persisted["actors"] is not body["actors"] or state["finished"]
+            or state.get("_journal_records", 0) >= COMPACT_EVERY):
+        write_snapshot(state, body)
+    else:
+        with open(JOURNAL_FILE, "a") as f:
+            f.write(json.dumps(journal_record(state, body), separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        state["_journal_records"] = state.get("_journal_records", 0) + 1
+
+    state["_persisted"] = body
+    state["_persisted_good"] = set(state["tested_good"])
+
+def initialize_chunks(all_names, costs=None):
+    if costs:
+        # CHUNK_COUNT runs of about equal estimated bake cost instead of equal size
+        chunks = []
+        for part in split_evenly(list(range(len(all_names))), CHUNK_COUNT, costs):
+            chunks.append([part[0], part[-1] + 1])
+        return chunks
     chunks = []
     chunk_size = math.ceil(len(all_names) / CHUNK_COUNT)
     for i in range(0, len(all_names), chunk_size):
         chunks.append([i, min(i + chunk_size, len(all_names))])
     return chunks
 
+# ---------- SEARCH STRATEGIES ----------
+# Every bake costs a full editor cycle, so strategies are judged by bakes per isolation.
+# A strategy turns the untested indices of a crashing chunk into parts to bake next.
+
+def split_evenly(indices, parts, costs=None):
+    parts = max(1, min(parts, len(indices)))
+    if not costs:
+        step = len(indices) / parts
+        return [indices[round(i * step):round((i + 1) * step)] for i in range(parts)]
+    # Consecutive runs of about equal cost; costs is indexed like the actor list
+    total = sum(costs[i] for i in indices)
+    result, current, acc = [], [], 0.0
+    for pos, i in enumerate(indices):
+        current.append(i)
+        acc += costs[i]
+        cuts_left = parts - len(result) - 1
+        if cuts_left and (acc >= total * (len(result) + 1) / parts or len(indices) - pos - 1 == cuts_left):
+            result.append(current)
+            current = []
+    result.append(current)
+    return result
+
+def actor_costs(state):
+    # Per-actor bake cost estimates, or None for states started before they were recorded
+    costs = state.get("costs")
+    return costs if costs and len(costs) == len(state["to_test"]) else None
+
+def split_weights(state):
+    # Crash risk when the history ranked the level, so parts are equally likely to crash; else bake cost
+    risks = state.get("risks")
+    if risks and len(risks) == len(state["to_test"]):
+        return risks
+    return actor_costs(state)
+
+def estimated_culprit_rate(state):
+    # Per-actor crash probability p from group tests: P(chunk of s actors crashes) = 1 - (1 - p)^s
+    bakes = state.get("bakes", 0)
+    mean_size = state.get("baked_actors", 0) / bakes if bakes else max(len(state["to_test"]), 1)
+    crash_rate = (state.get("crashes", 0) + 0.5) / (bakes + 1)
+    return 1.0 - (1.0 - crash_rate) ** (1.0 / max(mean_size, 1.0))
+
+class BisectSearch:
+    name = "bisect"
+    # A crashing chunk whose other parts all passed is known to crash without baking it
+    infer = False
+
+    def split(self, state, indices, entry):
+        if entry.get("root"):
+            weights = split_weights(state)
+            chunks = initialize_chunks(indices, [weights[i] for i in indices] if weights else None)
+            return [indices[start:end] for start, end in chunks]
+        return split_evenly(indices, 2, split_weights(state))
+
+    def group_size(self, state, remaining):
+        return remaining
+
+class KWaySearch(BisectSearch):
+    name = "kway"
+    infer = True
+
+    def split(self, state, indices, entry):
+        return split_evenly(indices, SPLIT_FACTOR, split_weights(state))
+
+class HwangSearch(KWaySearch):
+    name = "hwang"
+
+    def remaining_culprits(self, state):
+        return max(1, EXPECTED_CULPRITS - len(state["tested_bad"]))
+
+    def split(self, state, indices, entry):
+        if entry.get("root") and self.remaining_culprits(state) > 1:
+            # Several culprits expected: put the level into the pool and carve test groups from it
+            return None
+        return split_evenly(indices, 2, split_weights(state))
+
+    def group_size(self, state, remaining):
+        # Hwang's generalized binary splitting: test 2^a items, a = floor(log2((n - d + 1) / d))
+        d = self.remaining_culprits(state)
+        if remaining <= 2 * d - 2:
+            return 1
+        return min(remaining, 2 ** int(math.log2((remaining - d + 1) / d)))
+
+class DdminSearch(KWaySearch):
+    name = "ddmin"
+
+    def split(self, state, indices, entry):
+        return "ddmin"
+
+class AdaptiveSearch(KWaySearch):
+    name = "adaptive"
+
+    def split(self, state, indices, entry):
+        # Aim for parts that crash about half the time: s * p / ln 2 parts of ln 2 / p actors
+        p = estimated_culprit_rate(state)
+        parts = math.ceil(len(indices) * p / math.log(2))
+        return split_evenly(indices, min(max(parts, 2), MAX_SPLIT_FACTOR), split_weights(state))
+
+SEARCH_STRATEGIES = {cls.name: cls for cls in (BisectSearch, KWaySearch, HwangSearch, AdaptiveSearch, DdminSearch)}
+
+def get_strategy(state):
+    return SEARCH_STRATEGIES.get(state.get("strategy"), BisectSearch)()
+
+def make_entry(start, end, **flags):
+    entry = {"start": start, "end": end}
+    entry.update(flags)
+    return entry
+
+def as_entry(entry):
+    # Saved index_stack entries are [start, end] or [start, end, flags]
+    if isinstance(entry, dict):
+        return entry
+    return make_entry(entry[0], entry[1], **(entry[2] if len(entry) > 2 else {}))
+
+def name_index(state):
+    if "_index" not in state:
+        state["_index"] = {n: i for i, n in enumerate(state["to_test"])}
+    return state["_index"]
+
+def untested_indices(state, start, end):
+    names = state["to_test"]
+    good = state["tested_good"]
+    bad = set(state["tested_bad"])
+    return [i for i in range(start, end) if names[i] not in good and names[i] not in bad]
+
+def to_runs(indices):
+    # Sorted indices as [start, end) runs; chunks are mostly contiguous so this stays tiny
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    return runs
+
+def from_runs(runs):
+    return [i for start, end in runs for i in range(start, end)]
+
+def set_key(indices):
+    return hashlib.sha1(",".join(map(str, indices)).encode()).hexdigest()[:16]
+
+def push_parts(state, parts, origin):
+    # Parts of one crashing chunk share a group; origin is the last chunk that really crashed in a bake
+    gid = state["next_group"]
+    state["next_group"] += 1
+    state["groups"][str(gid)] = {"left": len(parts), "hit": False, "origin": to_runs(origin), "passed": []}
+    costs = actor_costs(state)
+    if costs and not state.get("risks"):
+        # Cheapest first: when the others pass, the last part is known to crash without a bake
+        parts = sorted(parts, key=lambda part: sum(costs[i] for i in part))
+    for part in reversed(parts):
+        state["index_stack"].append(make_entry(part[0], part[-1] + 1, group=gid))
+
+def settle_group(state, entry, crashed, indices=None):
+    if not entry or "group" not in entry:
+        return
+    key = str(entry["group"])
+    group = state["groups"].get(key)
+    if group is None:
+        return
+    group["left"] -= 1
+    group["hit"] = group["hit"] or crashed
+    if not crashed and indices:
+        group["passed"].append(set_key(indices))
+    if group["left"] <= 0:
+        del state["groups"][key]
+        if "rest" in group:
+            # Unless a suspect crashed on its own, the rest still holds the crash
+            rest = as_entry(group["rest"])
+            if not group["hit"]:
+                rest["known"] = True
+            state["index_stack"].append(rest)
+        elif not group["hit"] and INTERACTION_SEARCH:
+            start_ddmin(state, from_runs(group["origin"]), group["passed"])
+
+def known_to_crash(state, entry):
+    group = state["groups"].get(str(entry.get("group")))
+    return (get_strategy(state).infer and bool(group) and group["left"] == 1 and not group["hit"]
+            and "rest" not in group)
+
+def split_crashing(state, indices, entry, origin):
+    names = state["to_test"]
+    if len(indices) == 1:
+        state["tested_bad"].append(names[indices[0]])
+        unreal.log_warning(f"❌ Crash confirmed: {names[indices[0]]}")
+        return
+    parts = get_strategy(state).split(state, indices, entry)
+    if parts is None:
+        # The pool is one group until every chunk carved from it is baked, so a crash that needs
+        # several actors together still ends in ddmin over the origin once all of them passed
+        gid = state["next_group"]
+        state["next_group"] += 1
+        state["groups"][str(gid)] = {"left": 1, "hit": False, "origin": to_runs(origin), "passed": []}
+        state["index_stack"].append(make_entry(indices[0], indices[-1] + 1, pool=True, group=gid))
+        unreal.log_warning(f"⚠️ Crash detected. {len(indices)} actors returned to the test pool.")
+    elif parts == "ddmin":
+        start_ddmin(state, indices, [])
+    else:
+        # A worker pool bakes the parts side by side, so there is at least one per worker
+        if len(parts) < state.get("workers", 1):
+            parts = split_evenly(indices, state["workers"], split_weights(state))
+        push_parts(state, parts, origin)
+        unreal.log_warning(f"⚠️ Crash detected. Chunk split in {len(parts)}.")
+
+# ---------- CRASH SUSPECTS ----------
+# The watchdog reads the crash section of the editor log after a crash and passes the actor
+# names and asset paths it found on in status.json as "suspects". Suspects inside the
+# crashing chunk are baked alone first, as one group; once all of them are baked the rest of
+# the chunk is baked again if one of them crashed, otherwise it still holds the crash and is
+# split without a bake. A right guess costs one bake where the split would have taken
+# several levels.
+
+def load_crash_suspects():
+    try:
+        with open(STATUS_FILE, "r") as f:
+            return json.load(f).get("suspects")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def suspect_names(level, chunk, suspects):
+    # Actors of the chunk named by object name or label, else the few using a named asset
+    if not suspects:
+        return []
+    named = set(suspects.get("actors", []))
+    hits = [name for name in chunk if name in named or level.label(name) in named]
+    assets = {path.split(".")[0] for path in suspects.get("assets", [])}
+    if hits or not assets:
+        return hits
+    for name in chunk:
+        actor = level.by_name.get(name)
+        if actor is None:
+            continue
+        for component in actor.get_components_by_class(unreal.StaticMeshComponent):
+            try:
+                paths = [asset_path(component.get_editor_property("static_mesh"))]
+                paths += [asset_path(m) for m in component.get_materials()]
+            except Exception:
+                continue
+            if any(path.split(".")[0] in assets for path in paths):
+                hits.append(name)
+                break
+        if len(hits) > MAX_SUSPECTS:
+            # A mesh or material half the chunk uses narrows nothing down
+            return []
+    return hits
+
+def push_suspects(state, indices, entry, names):
+    # False when none of the names is an untested actor of the crashing chunk
+    index_of = name_index(state)
+    inside = set(indices)
+    picks = []
+    for name in names:
+        i = index_of.get(name)
+        if i in inside and i not in picks:
+            picks.append(i)
+    picks = picks[:MAX_SUSPECTS]
+    if not picks or len(picks) >= len(indices):
+        return False
+    # The suspects form a group; the rest of the chunk goes back on the stack once all of them are baked
+    gid = state["next_group"]
+    state["next_group"] += 1
+    flags = {"root": True} if entry.get("root") else {}
+    state["groups"][str(gid)] = {"left": len(picks), "hit": False, "origin": to_runs(indices), "passed": [],
+                                 "rest": pack_entry(make_entry(indices[0], indices[-1] + 1, **flags))}
+    state["index_stack"].extend(make_entry(i, i + 1, group=gid) for i in reversed(picks))
+    unreal.log_warning(f"🔍 Crash log names {', '.join(state['to_test'][i] for i in picks)} – baking them alone first.")
+    return True
+
+# ---------- DELTA DEBUGGING ----------
+# Zeller's ddmin over a crashing set C: bake n subsets, then their complements, then refine n.
+# Verdicts are cached per actor set so no subset is ever baked twice.
+
+def start_ddmin(state, indices, passed_keys):
+    unreal.log_warning(f"🧩 Crash needs a combination of actors – minimizing {len(indices)} actors.")
+    state["ddmin"] = {"set": to_runs(indices), "n": 2, "phase": "subsets", "i": 0}
+    cache = state.setdefault("ddmin_cache", {})
+    cache[set_key(indices)] = True
+    for key in passed_keys:
+        cache[key] = False
+
+def ddmin_test(ddmin):
+    current = from_runs(ddmin["set"])
+    part = split_evenly(current, ddmin["n"])[ddmin["i"]]
+    if ddmin["phase"] == "subsets":
+        return part
+    excluded = set(part)
+    return [i for i in current if i not in excluded]
+
+def advance_ddmin(ddmin, test, crashed):
+    if crashed:
+        ddmin["n"] = 2 if ddmin["phase"] == "subsets" else max(ddmin["n"] - 1, 2)
+        ddmin["set"] = to_runs(test)
+        ddmin["phase"], ddmin["i"] = "subsets", 0
+        return
+    ddmin["i"] += 1
+    if ddmin["i"] < ddmin["n"]:
+        return
+    size = sum(end - start for start, end in ddmin["set"])
+    if ddmin["phase"] == "subsets" and ddmin["n"] > 2:
+        ddmin["phase"], ddmin["i"] = "complements", 0
+    elif ddmin["n"] < size:
+        ddmin["n"] = min(ddmin["n"] * 2, size)
+        ddmin["phase"], ddmin["i"] = "subsets", 0
+    else:
+        ddmin["done"] = True
+
+def next_ddmin_chunk(state):
+    ddmin = state["ddmin"]
+    cache = state["ddmin_cache"]
+    while not ddmin.get("done") and sum(end - start for start, end in ddmin["set"]) > 1:
+        test = ddmin_test(ddmin)
+        key = set_key(test)
+        if key in cache:
+            advance_ddmin(ddmin, test, cache[key])
+            continue
+        state["last_entry"] = make_entry(test[0], test[-1] + 1, ddmin=to_runs(test))
+        state["last_chunk"] = [state["to_test"][i] for i in test]
+        return state["last_chunk"]
+
+    names = [state["to_test"][i] for i in from_runs(ddmin["set"])]
+    state["ddmin"] = None
+    if len(names) == 1:
+        if names[0] not in state["tested_bad"]:
+            state["tested_bad"].append(names[0])
+        unreal.log_warning(f"❌ Crash confirmed: {names[0]}")
+    else:
+        state["crashing_sets"].append(names)
+        unreal.log_warning(f"❌ Crash needs all of: {', '.join(names)}")
+    return None
+
+def start_isolation(state, actor_names, costs=None, fingerprints=None, verdicts=None, features=None):
+    # The watchdog bakes the untouched level right after this run; that bake tests every actor
+    ranked = rank_by_risk(features) if features else None
+    if ranked:
+        order, risks, flagged = ranked
+        pick = lambda values: [values[i] for i in order] if values else values
+        actor_names, costs, fingerprints, features = map(pick, (actor_names, costs, fingerprints, features))
+        state["risks"] = [round(risks[i], 6) for i in order]
+        unreal.log(f"📚 Crash history ranks {flagged} actors as risky – they are searched first.")
+    else:
+        state["risks"] = []
+    if features:
+        write_actor_features(features)
+    elif os.path.exists(FEATURES_FILE):
+        os.remove(FEATURES_FILE)
+    state["to_test"] = actor_names
+    state["costs"] = list(costs) if costs else []
+    state["fingerprints"] = list(fingerprints) if fingerprints else []
+    state.pop("_index", None)
+    state["initialized"] = True
+    state["index_stack"] = []
+    if verdicts and fingerprints and apply_cached_verdicts(state, verdicts):
+        return
+    if actor_names:
+        state["last_entry"] = make_entry(0, len(actor_names), root=True)
+        state["last_chunk"] = list(actor_names)
+
+def apply_cached_verdicts(state, verdicts):
+    # Unchanged actors keep their verdict; the rest of the level is searched as usual.
+    # Returns False when nothing is known, so the run starts with the untouched level.
+    names, fingerprints = state["to_test"], state["fingerprints"]
+    good = [i for i, fp in enumerate(fingerprints) if verdicts.get(fp) == "good"]
+    bad = [i for i, fp in enumerate(fingerprints) if verdicts.get(fp) == "bad"]
+    combined = sum(verdicts.get(fp) == "combination" for fp in fingerprints)
+    write_verdict_cache(verdicts)
+    if not good and not bad:
+        return False
+    spot_checks = set(random.sample(good, min(len(good), max(SPOT_CHECK_MIN, math.ceil(len(good) * SPOT_CHECK_SHARE)))))
+    state["tested_good"].update(names[i] for i in good if i not in spot_checks)
+    state["_cached_good"] = set(state["tested_good"])
+    # The whole level minus known verdicts, after every earlier culprit is baked on its own again;
+    # members of earlier combinations stay in it, so they are baked together
+    state["index_stack"].append(make_entry(0, len(names), root=True))
+    state["index_stack"].extend(make_entry(i, i + 1) for i in reversed(bad))
+    unreal.log(f"🗂 {len(good) + len(bad) + combined} of {len(names)} actors unchanged since an earlier run: "
+               f"{len(bad)} earlier culprits baked again, {combined} combination members baked together, "
+               f"{len(spot_checks)} passed actors spot-checked.")
+    return True
+
+def record_verdict(state, crashed, suspects=None):
+    chunk = state["last_chunk"]
+    if not chunk:
+        return
+    entry = state.get("last_entry")
+    state["bakes"] = state.get("bakes", 0) + 1
+    state["baked_actors"] = state.get("baked_actors", 0) + len(chunk)
+    if crashed:
+        state["crashes"] = state.get("crashes", 0) + 1
+    state["last_chunk"] = []
+    state["last_entry"] = None
+
+    if entry and "ddmin" in entry:
+        test = from_runs(entry["ddmin"])
+        state["ddmin_cache"][set_key(test)] = crashed
+        if state.get("ddmin"):
+            advance_ddmin(state["ddmin"], test, crashed)
+        unreal.log(f"🧩 Combination {'crashed' if crashed else 'passed'} ({len(test)} actors).")
+        return
+
+    if entry:
+        indices = untested_indices(state, entry["start"], entry["end"])
+    else:
+        # Chunk saved before entries were tracked: map it back through the actor list
+        index_of = name_index(state)
+        indices = sorted(index_of[n] for n in chunk if n in index_of)
+        entry = make_entry(indices[0], indices[-1] + 1) if indices else None
+    settle_group(state, entry, crashed, indices)
+
+    if not crashed:
+        state["tested_good"].update(chunk)
+        if entry and entry.get("inferred"):
+            unreal.log_warning(f"⚠️ {chunk[0]} does not crash on its own – the crash needs a combination of actors.")
+        unreal.log("✅ Chunk passed. Moving on...")
+        return
+
+    if not indices:
+        unreal.log_error("⚠️ Index mapping failed. Skipping.")
+        return
+    if suspects and push_suspects(state, indices, entry, suspects):
+        return
+    split_crashing(state, indices, entry, indices)
+
+def next_chunk(state):
+    strategy = get_strategy(state)
+    names = state["to_test"]
+    stack = state["index_stack"]
+    while True:
+        # A running minimization always goes first; it may have been started by the last verdict
+        if state.get("ddmin") and next_ddmin_chunk(state):
+            return state["last_chunk"]
+        if not stack:
+            break
+
+        entry = as_entry(stack.pop())
+        indices = untested_indices(state, entry["start"], entry["end"])
+        if not indices:
+            settle_group(state, entry, False)
+            continue
+
+        if entry.get("known") and (not CONFIRM_CULPRITS or len(indices) > 1):
+            unreal.log(f"🧮 No suspect crashed – {len(indices)} actors must contain the crash, splitting without a bake.")
+            split_crashing(state, indices, entry, indices)
+            continue
+
+        if entry.get("pool"):
+            size = strategy.group_size(state, len(indices))
+            # Carved chunks and the rest of the pool stay in the pool's group
+            flags = {"group": entry["group"]} if "group" in entry else {}
+            if size < len(indices):
+                stack.append(make_entry(indices[size], entry["end"], pool=True, **flags))
+                group = state["groups"].get(str(entry.get("group")))
+                if group:
+                    group["left"] += 1
+            indices = indices[:size]
+            entry = make_entry(indices[0], indices[-1] + 1, **flags)
+        elif known_to_crash(state, entry):
+            if not CONFIRM_CULPRITS or len(indices) > 1:
+                origin = from_runs(state["groups"][str(entry["group"])]["origin"])
+                settle_group(state, entry, True)
+                unreal.log(f"🧮 {len(indices)} actors must contain the crash – splitting without a bake.")
+                split_crashing(state, indices, entry, origin)
+                continue
+            entry["inferred"] = True
+
+        state["last_entry"] = entry
+        state["last_chunk"] = [names[i] for i in indices]
+        return state["last_chunk"]
+
+    state["finished"] = True
+    return None
+
 def check_previous_crash():
     if not os.path.exists(STATUS_FILE):
         return None
@@ -103,89 +1146,82 @@ def clear_crash_flag():
     with open(STATUS_FILE, "w") as f:
         json.dump({"crashed": False}, f)
 
-def get_label_by_name(name):
-    subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
-    for actor in subsystem.get_all_level_actors():
-        if actor.get_name() == name:
-            try:
-                return actor.get_actor_label()
-            except Exception:
-                return name
-    return name
+def write_handshake(phase):
+    # The watchdog waits for the sequence number to move instead of sleeping a fixed time
+    seq = 0
+    try:
+        with open(HANDSHAKE_FILE, "r") as f:
+            seq = json.load(f).get("seq", 0)
+    except (OSError, ValueError, AttributeError):
+        pass
+    tmp = HANDSHAKE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"seq": seq + 1, "phase": phase, "time": time.time(), "isolation": ISOLATION_MODE}, f)
+    os.replace(tmp, HANDSHAKE_FILE)
 
-def main():
+def run_cycle():
     time.sleep(1)
     state = load_state()
 
+    level = LevelSnapshot()
+
     if state["finished"]:
         unreal.log("🏁 All chunks tested. Done.")
-        export_crashing_actors(state)
-        return
+        restore_level(level)
+        export_crashing_actors(state, level)
+        return "finished"
 
     if not state["initialized"]:
-        all_actors = get_relevant_actors()
-        actor_names = [a.get_name() for a in all_actors]
-        state["to_test"] = actor_names
-        state["index_stack"] = initialize_chunks(actor_names)
-        state["initialized"] = True
-        save_state(state)
-        unreal.log("🟢 First run complete. Run lighting and allow Watchdog to continue.")
-        return
-
-    crashed = check_previous_crash()
-    if crashed is None:
-        unreal.log_warning("⚠️ Could not determine crash status.")
-        return
-
-    if state["last_chunk"]:
-        chunk = state["last_chunk"]
-        unreal.log(f"📋 Last tested chunk: {chunk}")
-        if crashed:
-            if len(chunk) == 1:
-                state["tested_bad"].append(chunk[0])
-                state["last_chunk"] = []
-                unreal.log_warning(f"❌ Crash confirmed: {chunk[0]}")
-            else:
-                all_names = state["to_test"]
-                indices = [all_names.index(n) for n in chunk if n in all_names]
-                if not indices:
-                    unreal.log_error("⚠️ Index mapping failed. Skipping.")
-                    state["last_chunk"] = []
-                    return
-                start, end = min(indices), max(indices) + 1
-                mid = (start + end) // 2
-                state["index_stack"].append([mid, end])
-                state["index_stack"].append([start, mid])
-                state["last_chunk"] = []
-                unreal.log_warning("⚠️ Crash detected. Chunk split in two.")
-        else:
-            state["tested_good"].extend(chunk)
-            state["last_chunk"] = []
-            unreal.log("✅ Chunk passed. Moving on...")
-        save_state(state)
-        clear_crash_flag()
+        restore_level(level)
+        roles = classify_actors(level)
+        all_actors = roles["search"]
+        unreal.log(f"🔎 {len(all_actors)} actors to search, {len(roles['required'])} kept in every bake, "
+                   f"{len(roles['skip'])} left out")
+        start_isolation(state, [a.get_name() for a in all_actors], [actor_cost(a) for a in all_actors],
+                        [actor_fingerprint(a) for a in all_actors], load_verdict_cache(),
+                        [actor_features(a) for a in all_actors])
+        if state["last_chunk"]:
+            save_state(state)
+            unreal.log("🟢 First run complete. Run lighting and allow Watchdog to continue.")
+            return "initialized"
+        # Cached verdicts cover part of the level, so the first bake is already a chunk
+    else:
+        crashed = check_previous_crash()
+        if crashed is None:
+            unreal.log_warning("⚠️ Could not determine crash status.")
+            return "error"
 
-    while state["index_stack"]:
-        start, end = state["index_stack"].pop()
-        chunk = state["to_test"][start:end]
-        chunk = [n for n in chunk if n not in state["tested_good"] and n not in state["tested_bad"]]
-        if not chunk:
-            continue
+        if state["last_chunk"]:
+            unreal.log(f"📋 Last tested chunk: {state['last_chunk']}")
+            suspects = suspect_names(level, state["last_chunk"], load_crash_suspects()) if crashed else None
+            record_verdict(state, crashed, suspects)
+            save_state(state)
+            clear_crash_flag()
 
-        state["last_chunk"] = chunk
+    chunk = next_chunk(state)
+    if chunk:
         save_state(state)
 
-        destroy_actors_not_in(chunk)
+        isolate_chunk(level, chunk, state["to_test"])
         unreal.log(f"🔬 Testing chunk ({len(chunk)} actors):")
         for name in chunk:
-            label = get_label_by_name(name)
-            unreal.log(f"   ↪ {label}")
+            unreal.log(f"   ↪ {level.label(name)}")
         unreal.log("⏳ Ready to build lighting. Watchdog will resume control.")
-        return
+        return "ready"
 
-    state["finished"] = True
+    record_crash_history(state)
     save_state(state)
-    export_crashing_actors(state)
+    restore_level(level)
+    export_crashing_actors(state, level)
     unreal.log("✅ All chunks tested. Crashing actors isolated.")
+    return "finished"
+
+def main():
+    phase = "error"
+    try:
+        phase = run_cycle()
+    finally:
+        write_handshake(phase)
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os, re, mmap
+
+# ---------- CRASH SIGNATURES ----------
+# What the editor log and the newest crash report say about a crash that just ended a bake.
+# The log is memory-mapped and searched backwards from its end, a block at a time, for the
+# last fatal error or GPU crash line; only from there on is it split into lines. The crash
+# section is the run of error lines around that line up to the end of the file, so a
+# multi-GB log that ends in a crash costs about as much as its last block. From that section and
+# Saved/Crashes/<newest>/CrashContext.runtime-xml:
+#
+#   {"error": "Fatal error: [File:D3D12Util.cpp] [Line: 880] GPU crash: DXGI_ERROR_DEVICE_REMOVED",
+#    "callstack": ["UnrealEditor-D3D12RHI.dll!FD3D12DynamicRHI::TerminateOnGPUCrash", ...],
+#    "actors": ["StaticMeshActor_12"], "assets": ["/Game/Props/SM_Rock"]}
+#
+# actors are the object names after "PersistentLevel.", assets /Game package paths, both in
+# the order they appear. A bake that hung or died silently has no section and yields nothing.
+
+BLOCK = 1 << 20
+LIMIT = 10
+# Every crash the engine handles or log_rules reports matches one of these. A block is
+# searched with each on its own: a pattern that starts with a literal runs at memory speed,
+# an alternation of them or a leading \b does not. Only a block with a hit is split into
+# lines, which MARKER then confirms.
+FATAL = [re.compile(p) for p in (rb"Fatal error", rb"Critical error", rb"Assertion failed", rb"GPU ?[Cc]rash(?:ed)?\b",
+                                 rb"DXGI_ERROR_DEVICE_", rb"RHI: .*?Device (?:Removed|Lost)")]
+MARKER = re.compile(rb"Fatal error|Critical error|Assertion failed|\bGPU ?[Cc]rash(?:ed)?\b|DXGI_ERROR_DEVICE_|RHI: .*?Device (?:Removed|Lost)")
+ERROR_LINE = re.compile(rb": Error: |\[Callstack\]|\[GPUBreadCrumb\]|DRED")
+FRAME = re.compile(rb"([\w.\-]+![\w:~<>]+)\(")
+ACTOR = re.compile(rb"PersistentLevel\.(\w+)")
+# A trailing ":" marks an object inside a map package, like the level itself
+ASSET = re.compile(rb"(/Game/[\w/\-]+)(?:\.\w+)?(:?)")
+
+def block_start(mm, start, end):
+    # Start of the last block before `end`, moved forward to a line start
+    lo = end - BLOCK
+    if lo <= start:
+        return start
+    return mm.rfind(b"\n", start, lo) + 1 or start
+
+def release(mm, lo, hi):
+    # Drops searched pages from this process again; they stay in the OS cache. Up to `hi`
+    # = the end, since the kernel maps a few pages around every fault
+    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+        lo -= lo % mmap.PAGESIZE
+        mm.madvise(mmap.MADV_DONTNEED, lo, hi - lo)
+
+def crash_section(mm, start, end):
+    hi = end
+    while hi > start:
+        lo = block_start(mm, start, hi)
+        if any(fatal.search(mm, lo, hi) for fatal in FATAL):
+            # One block more for error lines that lead up to the crash line
+            lines = mm[block_start(mm, start, lo):end].split(b"\n")
+            crashes = [i for i, line in enumerate(lines) if MARKER.search(line)]
+            if crashes:
+                first = crashes[-1]
+                while first > 0 and (MARKER.search(lines[first - 1]) or ERROR_LINE.search(lines[first - 1])):
+                    first -= 1
+                return lines[first:]
+        release(mm, lo, end)
+        hi = lo
+    return []
+
+def mapped_lines(path, start=0, max_bytes=None, section=True):
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            # A start beyond the end means the log was rotated since; read the new one
+            start = start if start <= end else 0
+            if max_bytes:
+                start = max(start, end - max_bytes)
+            return crash_section(mm, start, end) if section else mm[start:end].split(b"\n")
+    except (OSError, ValueError):
+        # Missing, empty or not mappable
+        return []
+
+def newest_report(crash_dir, since=0.0):
+    try:
+        dirs = [os.path.join(crash_dir, d) for d in os.listdir(crash_dir)]
+    except OSError:
+        return None
+    dirs = [d for d in dirs if os.path.isdir(d) and os.path.getmtime(d) >= since]
+    if not dirs:
+        return None
+    path = os.path.join(max(dirs, key=os.path.getmtime), "CrashContext.runtime-xml")
+    return path if os.path.exists(path) else None
+
+def add(found, key, value):
+    if value not in found[key] and len(found[key]) < LIMIT:
+        found[key].append(value)
+
+def analyze(log_path, start=0, crash_dir=None, since=0.0, max_bytes=None):
+    lines = mapped_lines(log_path, start, max_bytes)
+    report = newest_report(crash_dir, since) if crash_dir else None
+    if report:
+        lines += mapped_lines(report, section=False)
+    found = {"error": "", "callstack": [], "actors": [], "assets": []}
+    for line in lines:
+        text = line.decode("utf-8", errors="replace").strip()
+        if not found["error"] and (b"Fatal error" in line or b"Assertion failed" in line):
+            found["error"] = text[text.find("Error: ") + 7:] if "Error: " in text else text
+        for frame in FRAME.findall(line):
+            add(found, "callstack", frame.decode("utf-8", errors="replace"))
+        for name in ACTOR.findall(line):
+            add(found, "actors", name.decode("utf-8", errors="replace"))
+        for path, inside in ASSET.findall(line):
+            if not inside:
+                add(found, "assets", path.decode("utf-8", errors="replace"))
+    if not found["error"] and lines:
+        found["error"] = next((line.decode("utf-8", errors="replace").strip() for line in lines if MARKER.search(line)), "")
+    return found
@@ -0,0 +1,251 @@
+import os, json, time, threading
+
+# ---------- PHASES ----------
+# Wall time of every watchdog cycle, split into the phase it was in, on the monotonic clock:
+#
+#   launch      starting the editor process
+#   startup     until the editor is ready (bounded by initial_delay)
+#   autorunner  auto_runner picking and isolating the next chunk
+#   bake        from the first resource sample to the verdict
+#   recovery    killing a crashed or hung editor and writing the status
+#   reload      loading the map again for the next chunk
+#
+# Phases follow each other: enter() ends the running one. Every finished cycle is one JSONL
+# line in the timing log,
+#   {"event": "cycle", "cycle": 4, "time": 1718000000.0, "chunk": 250, "verdict": "passed",
+#    "seconds": 412.5, "phases": {"autorunner": 2.1, "bake": 405.3, "reload": 5.1}}
+# and the run ends with a "summary" line holding p50/p95 per phase and bakes per hour.
+
+PHASES = ("launch", "startup", "autorunner", "bake", "recovery", "reload")
+# Cycle verdicts that mean a bake ran; a cycle can also end before its bake ("none")
+BAKE_VERDICTS = ("passed", "crashed", "hung", "exited")
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    pos = (len(ordered) - 1) * pct / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+class CycleTimer:
+
+    def __init__(self, path=""):
+        self.lock = threading.Lock()
+        self.reset(path)
+
+    def reset(self, path=""):
+        with self.lock:
+            self.path = path
+            self.started = time.monotonic()
+            self.cycles = 0
+            self.durations = {}
+            self.verdicts = {}
+            self.current = None
+            self.phase = None
+            self.phase_started = None
+
+    def start_cycle(self):
+        self.end_cycle()
+        self.current = {"started": time.monotonic(), "phases": {}, "chunk": None, "verdict": None}
+
+    def enter(self, phase):
+        # Ends the running phase and starts `phase`; outside a cycle only the clock moves on
+        now = time.monotonic()
+        if self.current is not None and self.phase is not None:
+            phases = self.current["phases"]
+            phases[self.phase] = phases.get(self.phase, 0.0) + now - self.phase_started
+        self.phase, self.phase_started = phase, now
+
+    def note(self, **fields):
+        if self.current is not None:
+            self.current.update(fields)
+
+    def end_cycle(self, verdict=None):
+        # The finished cycle's record, or None when no cycle was running
+        if self.current is None:
+            return None
+        self.enter(None)
+        cycle, self.current = self.current, None
+        record = {"event": "cycle", "cycle": None, "time": round(time.time(), 3),
+                  "chunk": cycle["chunk"], "verdict": cycle["verdict"] or verdict or "none",
+                  "seconds": round(time.monotonic() - cycle["started"], 3),
+                  "phases": {k: round(v, 3) for k, v in cycle["phases"].items()}}
+        self.record(record)
+        return record
+
+    def record(self, record):
+        # Adds a finished cycle, also one timed elsewhere (a pool worker's bake)
+        with self.lock:
+            self.cycles += 1
+            record["cycle"] = self.cycles
+            for phase, seconds in record["phases"].items():
+                self.durations.setdefault(phase, []).append(seconds)
+            self.verdicts[record["verdict"]] = self.verdicts.get(record["verdict"], 0) + 1
+        self.write(record)
+
+    def write(self, record):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+
+    def bakes(self):
+        return sum(n for verdict, n in self.verdicts.items() if verdict in BAKE_VERDICTS)
+
+    def summary(self):
+        with self.lock:
+            hours = (time.monotonic() - self.started) / 3600
+            phases = {phase: {"count": len(values), "total": round(sum(values), 3),
+                              "p50": round(percentile(values, 50), 2), "p95": round(percentile(values, 95), 2)}
+                      for phase, values in self.durations.items()}
+            bakes = self.bakes()
+            return {"event": "summary", "time": round(time.time(), 3), "cycles": self.cycles,
+                    "verdicts": dict(self.verdicts), "hours": round(hours, 3),
+                    "bakes_per_hour": round(bakes / hours, 2) if hours > 0 else 0.0, "phases": phases}
+
+    def finish(self):
+        # Summary of the run so far, written to the timing log; None before the first cycle
+        self.end_cycle()
+        if not self.cycles:
+            return None
+        summary = self.summary()
+        self.write(summary)
+        return summary
+
+    def report(self, summary):
+        lines = [f"⏱ {summary['cycles']} cycles in {summary['hours'] * 60:.1f} min, "
+                 f"{summary['bakes_per_hour']:.1f} bakes/h ("
+                 + ", ".join(f"{n} {verdict}" for verdict, n in sorted(summary["verdicts"].items())) + ")"]
+        for phase in sorted(summary["phases"], key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES)):
+            s = summary["phases"][phase]
+            lines.append(f"   {phase:<10} p50 {s['p50']:>8.1f}s  p95 {s['p95']:>8.1f}s  total {s['total'] / 60:>7.1f} min")
+        return lines
+
+    def prometheus(self):
+        # Text exposition format; the quantiles are over the whole run
+        summary = self.summary()
+        lines = ["# HELP watchdog_phase_seconds Wall time per watchdog cycle phase.",
+                 "# TYPE watchdog_phase_seconds summary"]
+        for phase, s in sorted(summary["phases"].items()):
+            lines.append(f'watchdog_phase_seconds{{phase="{phase}",quantile="0.5"}} {s["p50"]}')
+            lines.append(f'watchdog_phase_seconds{{phase="{phase}",quantile="0.95"}} {s["p95"]}')
+            lines.append(f'watchdog_phase_seconds_sum{{phase="{phase}"}} {s["total"]}')
+            lines.append(f'watchdog_phase_seconds_count{{phase="{phase}"}} {s["count"]}')
+        lines += ["# HELP watchdog_cycles_total Finished watchdog cycles by verdict.",
+                  "# TYPE watchdog_cycles_total counter"]
+        for verdict, n in sorted(summary["verdicts"].items()):
+            lines.append(f'watchdog_cycles_total{{verdict="{verdict}"}} {n}')
+        lines += ["# HELP watchdog_bakes_per_hour Bakes per hour since the run started.",
+                  "# TYPE watchdog_bakes_per_hour gauge",
+                  f"watchdog_bakes_per_hour {summary['bakes_per_hour']}",
+                  "# HELP watchdog_current_phase The phase the watchdog is in.",
+                  "# TYPE watchdog_current_phase gauge"]
+        for phase in PHASES:
+            lines.append(f'watchdog_current_phase{{phase="{phase}"}} {int(self.phase == phase)}')
+        return "\n".join(lines) + "\n"
+
+# ---------- METRICS ENDPOINT ----------
+# GET /metrics on 127.0.0.1:port for a local Prometheus scraper. One server per process,
+# kept for the process lifetime and pointed at whichever timer is current.
+
+server = None
+
+def serve(timer, port):
+    global server
+    if server is not None:
+        server.timer = timer
+        return server
+    # Most runs have no endpoint, so http.server is only loaded here
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = self.server.timer.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    server.timer = timer
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# ---------- LEARNED DELAYS ----------
+# How long the readiness waits of one project really take, kept in Saved/GPUCrashFinder/
+# timing_stats.json so the watchdog can wait about that long instead of the hand-set
+# worst case. The newest KEEP samples per kind are kept:
+#
+#   startup, autorunner, reload   seconds until the editor, auto_runner or the reload was done
+#   bake_start                    seconds from the Build click to the first progress line
+#   bake                          [chunk size, seconds, longest gap between progress lines]
+#
+# A wait is the p95 of its samples times `margin`, never more than the configured value. A
+# wait that ran out is recorded at twice its length, so a project that got slower quickly
+# gets longer waits again. The stall limit follows the chunk: the worst progress gap of a
+# healthy bake relative to its length, times the bake length expected for this chunk size.
+
+KEEP = 100
+
+class DelayStats:
+
+    def __init__(self, path, margin=2.0, min_samples=5):
+        self.path = path
+        self.margin = margin
+        self.min_samples = min_samples
+        self.samples = {}
+        try:
+            with open(path, "r") as f:
+                self.samples = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def add(self, kind, value):
+        values = self.samples.setdefault(kind, [])
+        values.append(value)
+        del values[:-KEEP]
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.samples, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def limit(self, kind, cap, floor=0.0):
+        values = self.samples.get(kind, [])
+        if len(values) < self.min_samples:
+            return cap
+        return min(cap, max(floor, percentile(values, 95) * self.margin))
+
+    def bake_seconds(self, chunk):
+        # Least-squares line through (chunk size, seconds) of the recorded bakes
+        bakes = self.samples.get("bake", [])
+        n = len(bakes)
+        mean_x = sum(b[0] for b in bakes) / n
+        mean_y = sum(b[1] for b in bakes) / n
+        var = sum((b[0] - mean_x) ** 2 for b in bakes)
+        if chunk is None or var == 0:
+            return mean_y
+        slope = max(0.0, sum((b[0] - mean_x) * (b[1] - mean_y) for b in bakes) / var)
+        return max(mean_y + slope * (chunk - mean_x), min(b[1] for b in bakes))
+
+    def stall_limit(self, chunk, cap, floor=0.0):
+        bakes = self.samples.get("bake", [])
+        if len(bakes) < self.min_samples:
+            return cap
+        ratio = max(gap / max(seconds, 1e-6) for _, seconds, gap in bakes)
+        return min(cap, max(floor, ratio * self.bake_seconds(chunk) * self.margin))
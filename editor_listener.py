@@ -0,0 +1,200 @@
+import unreal, os, json, time, socket, threading, queue, traceback
+
+# Runs inside the editor, started once by the watchdog with
+#   UnrealEditor.exe Project.uproject Map -ExecutePythonScript="editor_listener.py"
+# It accepts one JSON command per line on a localhost socket and answers with one JSON
+# line. The socket thread only queues commands; they run on the game thread from a Slate
+# tick callback, because the unreal API must not be called from other threads.
+#
+#   {"id": 1, "token": "...", "cmd": "run_autorunner", "args": {"path": ".../auto_runner.py"}}
+#   {"id": 1, "ok": true, "result": {"seq": 12, "phase": "ready"}, "elapsed": 0.84}
+#
+# The port is written to Saved/GPUCrashFinder/listener.json. Requests must carry the token
+# the watchdog put into the editor's environment, so other local programs cannot drive it.
+
+PROJECT_DIR = unreal.SystemLibrary.get_project_directory()
+SAVED_DIR = os.path.join(PROJECT_DIR, "Saved", "GPUCrashFinder")
+LISTENER_FILE = os.path.join(SAVED_DIR, "listener.json")
+HANDSHAKE_FILE = os.path.join(SAVED_DIR, "handshake.json")
+JOB_FILE = os.path.join(SAVED_DIR, "job.json")
+TOKEN = os.environ.get("GPUCF_TOKEN", "")
+PORT = int(os.environ.get("GPUCF_PORT", "0"))
+
+def read_json(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def state_summary():
+    # The state file's first line, or the newest journal record if that is ahead of it.
+    # The journal is folded into the state file every few dozen records, so it stays small.
+    # A queued job keeps its state where job.json points
+    state_dir = (read_json(JOB_FILE) or {}).get("state_dir") or SAVED_DIR
+    try:
+        with open(os.path.join(state_dir, "crash_isolation_state.json"), "r") as f:
+            head = f.readline().rstrip().rstrip(",")
+        summary = json.loads(head + "}")["summary"]
+    except (OSError, ValueError, KeyError):
+        return None
+    try:
+        with open(os.path.join(state_dir, "crash_isolation_state.journal"), "r") as f:
+            lines = f.read().split("\n")[:-1]
+        record = json.loads(lines[-1]) if lines else {}
+        if record.get("seq", 0) > summary.get("seq", 0):
+            summary = record["summary"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return summary
+
+# ---------- COMMANDS ----------
+
+def cmd_ping(args):
+    return {"pid": os.getpid()}
+
+def cmd_run_autorunner(args):
+    path = args["path"]
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    # Same namespace shape as exec(open(path).read()) typed into the console
+    exec(compile(source, path, "exec"), {"__name__": "__main__", "__file__": path})
+    return read_json(HANDSHAKE_FILE)
+
+def cmd_reload_map(args):
+    unreal.get_editor_subsystem(unreal.LevelEditorSubsystem).load_level(args["map"])
+    return {"map": args["map"]}
+
+def cmd_build_lighting(args):
+    # Started from the next tick so this reply goes out before a build that holds the game thread
+    quality = getattr(unreal.LightingBuildQuality, args.get("quality", "QUALITY_PRODUCTION"))
+    def start(delta_seconds):
+        unreal.unregister_slate_post_tick_callback(handle)
+        unreal.get_editor_subsystem(unreal.LevelEditorSubsystem).build_light_maps(quality, True)
+    handle = unreal.register_slate_post_tick_callback(start)
+    return {"quality": args.get("quality", "QUALITY_PRODUCTION")}
+
+def load_runner(path):
+    # auto_runner's functions without running a cycle, for the worker-pool commands
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    namespace = {"__name__": "auto_runner", "__file__": path}
+    exec(compile(source, path, "exec"), namespace)
+    return namespace
+
+def cmd_list_actors(args):
+    runner = load_runner(args["path"])
+    level = runner["LevelSnapshot"]()
+    actors = runner["get_relevant_actors"](level)
+    return {"actors": [[a.get_name(), level.label(a.get_name()), runner["actor_cost"](a), runner["actor_fingerprint"](a),
+                        runner["actor_features"](a)] for a in actors]}
+
+def cmd_isolate(args):
+    # The chunk a pool worker bakes next: every searched actor not in `names` is destroyed or excluded
+    runner = load_runner(args["path"])
+    level = runner["LevelSnapshot"]()
+    searched = [actor.get_name() for actor in runner["get_relevant_actors"](level)]
+    runner["isolate_chunk"](level, args["names"], searched)
+    unreal.log(f"🔬 Testing chunk ({len(args['names'])} actors)")
+    return {"kept": len(args["names"]), "isolation": runner["ISOLATION_MODE"]}
+
+def cmd_query_state(args):
+    actors = unreal.get_editor_subsystem(unreal.EditorActorSubsystem).get_all_level_actors()
+    return {"actors": len(actors), "handshake": read_json(HANDSHAKE_FILE), "summary": state_summary()}
+
+COMMANDS = {
+    "ping": cmd_ping,
+    "run_autorunner": cmd_run_autorunner,
+    "reload_map": cmd_reload_map,
+    "query_state": cmd_query_state,
+    "build_lighting": cmd_build_lighting,
+    "list_actors": cmd_list_actors,
+    "isolate": cmd_isolate,
+}
+
+# ---------- SERVER ----------
+
+class CommandServer:
+
+    def __init__(self, port=0, token=""):
+        self.token = token
+        self.pending = queue.Queue()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", port))
+        self.sock.listen(4)
+        self.port = self.sock.getsockname()[1]
+        self.tick_handle = None
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            f = conn.makefile("rwb")
+            for line in f:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    continue
+                if request.get("token", "") != self.token:
+                    reply = {"id": request.get("id"), "ok": False, "error": "bad token"}
+                else:
+                    # Wait for the game thread to run it
+                    done = queue.Queue(1)
+                    self.pending.put((request, done))
+                    reply = done.get()
+                try:
+                    f.write((json.dumps(reply) + "\n").encode())
+                    f.flush()
+                except OSError:
+                    return
+
+    def tick(self, delta_seconds=0.0):
+        # Game thread: one command per tick keeps the editor responsive between commands
+        try:
+            request, done = self.pending.get_nowait()
+        except queue.Empty:
+            return
+        start = time.perf_counter()
+        reply = {"id": request.get("id"), "ok": True}
+        try:
+            handler = COMMANDS.get(request.get("cmd"))
+            if handler is None:
+                raise KeyError("unknown command: " + str(request.get("cmd")))
+            reply["result"] = handler(request.get("args") or {})
+        except Exception as e:
+            reply["ok"] = False
+            reply["error"] = f"{type(e).__name__}: {e}"
+            unreal.log_error(traceback.format_exc())
+        reply["elapsed"] = time.perf_counter() - start
+        done.put(reply)
+
+    def start(self):
+        self.tick_handle = unreal.register_slate_post_tick_callback(self.tick)
+        os.makedirs(SAVED_DIR, exist_ok=True)
+        tmp = LISTENER_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"port": self.port, "pid": os.getpid()}, f)
+        os.replace(tmp, LISTENER_FILE)
+        unreal.log(f"📡 GPUCrashFinder listener on 127.0.0.1:{self.port}")
+
+    def stop(self):
+        if self.tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self.tick_handle)
+            self.tick_handle = None
+        self.sock.close()
+
+if __name__ == "__main__":
+    # Executing the script twice must not leave two listeners behind
+    previous = getattr(unreal, "_gpucf_listener", None)
+    if previous is not None:
+        previous.stop()
+    unreal._gpucf_listener = CommandServer(PORT, TOKEN)
+    unreal._gpucf_listener.start()
@@ -0,0 +1,137 @@
+import math
+from collections import deque, namedtuple
+
+# ---------- SAMPLES ----------
+# One sample per check: CPU % since the previous sample, cumulative I/O bytes, thread
+# count, resident memory, log lines seen since the previous sample and the latest bake
+# progress (None until the first progress line).
+
+Sample = namedtuple("Sample", "t cpu io threads rss log_lines progress")
+
+STARTING = "starting"
+BAKING   = "baking"
+IDLE     = "idle"
+FROZEN   = "frozen"
+FINISHED = "finished"
+
+# ---------- DETECTOR ----------
+# A GPU Lightmass build blocks the editor's game thread, so its CPU drops from the level of
+# a responsive editor to a lower one and comes back when the build is done. The detector
+# learns the responsive level from the first `warmup` samples, starting with one taken just
+# before the click, and runs a two-sided CUSUM over the standardized EWMA of the CPU to
+# find those two level shifts.
+# Single spikes in either direction are absorbed by the EWMA and the CUSUM slack instead of
+# resetting anything.
+#
+#   baking    the CPU shifted down or stayed under low_cpu for two samples (both latch
+#             until the next reset), or progress lines arrived
+#   idle      none of that happened within idle_after seconds: the click did not start a build
+#   frozen    CPU under frozen_cpu with no I/O, log lines, progress, thread or memory change
+#             for frozen_after seconds
+#   finished  progress reached 100 % and the CPU went back up
+#
+# All state lives in a bounded window, so a run of any length costs the same per sample.
+
+class FreezeDetector:
+
+    def __init__(self, window=120, alpha=0.3, warmup=3, slack=1.0, limit=6.0,
+                 low_cpu=None, frozen_cpu=1.0, io_floor=64 * 1024, frozen_after=180.0, idle_after=60.0):
+        self.window = deque(maxlen=window)
+        self.alpha = alpha
+        self.warmup = warmup
+        self.slack = slack
+        self.limit = limit
+        self.low_cpu = low_cpu
+        self.frozen_cpu = frozen_cpu
+        self.io_floor = io_floor
+        self.frozen_after = frozen_after
+        self.idle_after = idle_after
+        self.reset()
+
+    def reset(self, t=None):
+        self.window.clear()
+        self.start = t
+        self.cpu_ewma = None
+        self.baseline = None
+        self.down = 0.0
+        self.up = 0.0
+        self.dropped_at = None
+        self.low_run = 0
+        self.bake_level = None
+        self.recovered_at = None
+        self.quiet_since = None
+        self.progress = None
+        self.state = STARTING
+
+    def rearm(self, t):
+        # After clicking Build again: give the new click its own idle_after
+        self.start = t
+        self.down = self.up = 0.0
+
+    def _dropped(self, t):
+        self.dropped_at = t
+        self.bake_level = self.cpu_ewma
+
+    def _baseline(self):
+        cpus = [s.cpu for s in self.window]
+        mean = sum(cpus) / len(cpus)
+        std = math.sqrt(sum((c - mean) ** 2 for c in cpus) / len(cpus))
+        # Floor the spread so a perfectly steady warmup does not turn noise into shifts
+        return mean, max(std, 1.0, 0.15 * mean)
+
+    def update(self, s):
+        prev = self.window[-1] if self.window else None
+        self.window.append(s)
+        if self.start is None:
+            self.start = s.t
+        self.cpu_ewma = s.cpu if self.cpu_ewma is None else self.alpha * s.cpu + (1 - self.alpha) * self.cpu_ewma
+
+        if self.baseline is None and len(self.window) >= self.warmup:
+            self.baseline = self._baseline()
+        if self.baseline is not None and self.dropped_at is None:
+            mean, std = self.baseline
+            z = (self.cpu_ewma - mean) / std
+            self.down = max(0.0, self.down - z - self.slack)
+            if self.down > self.limit:
+                self._dropped(s.t)
+        elif self.dropped_at is not None and self.recovered_at is None:
+            # Recovered once the CPU sits above low_cpu, or without one above halfway between
+            # the baking and the responsive level
+            mean, std = self.baseline or (self.bake_level, 1.0)
+            line = self.low_cpu if self.low_cpu is not None else (mean + self.bake_level) / 2
+            self.up = max(0.0, self.up + (self.cpu_ewma - line) / max(std, 1.0, 0.15 * line) - self.slack)
+            if self.up > self.limit:
+                self.recovered_at = s.t
+
+        # The absolute threshold latches too, so a warmup that already caught the build
+        # does not hide it
+        if self.low_cpu is not None and self.dropped_at is None:
+            self.low_run = self.low_run + 1 if self.cpu_ewma < self.low_cpu else 0
+            if self.low_run >= 2:
+                self._dropped(s.t)
+
+        moved = s.progress is not None and s.progress != self.progress
+        if s.progress is not None:
+            self.progress = s.progress
+        active = moved or s.log_lines > 0 or s.cpu >= self.frozen_cpu
+        if prev is not None and not active:
+            dt = max(s.t - prev.t, 1e-9)
+            active = ((s.io - prev.io) / dt > self.io_floor
+                      or s.threads != prev.threads or abs(s.rss - prev.rss) > 16 * 1024 * 1024)
+        if active:
+            self.quiet_since = None
+        elif self.quiet_since is None:
+            self.quiet_since = prev.t if prev is not None else s.t
+
+        if self.progress is not None and self.progress >= 100 and self.recovered_at is not None:
+            self.state = FINISHED
+        elif self.quiet_since is not None and s.t - self.quiet_since >= self.frozen_after:
+            self.state = FROZEN
+        elif (self.dropped_at is not None or self.progress is not None
+              or (self.low_cpu is not None and self.cpu_ewma < self.low_cpu)):
+            self.state = BAKING
+        elif s.t - self.start >= self.idle_after:
+            self.state = IDLE
+        else:
+            self.state = STARTING
+        return self.state
@@ -0,0 +1,80 @@
+import os, json, time, socket
+from collections import defaultdict
+
+# ---------- EDITOR CLIENT ----------
+# Talks to editor_listener.py over localhost: one JSON request per line, one JSON reply per
+# line. Every request is timed twice: "total" as seen from here and "editor" as the time
+# the command took on the game thread, so the gap is queueing plus transport.
+
+class EditorError(Exception):
+    pass
+
+def read_listener(saved_dir):
+    # Port and PID the listener wrote at startup, or None
+    try:
+        with open(os.path.join(saved_dir, "listener.json"), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+class EditorClient:
+
+    def __init__(self, port, token="", host="127.0.0.1", connect_timeout=2.0):
+        self.address = (host, port)
+        self.token = token
+        self.connect_timeout = connect_timeout
+        self.sock = None
+        self.buffer = b""
+        self.next_id = 0
+        self.timings = defaultdict(list)
+
+    def _connect(self):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.address, timeout=self.connect_timeout)
+            self.buffer = b""
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def request(self, cmd, timeout=30.0, abort=None, **args):
+        # Returns the command's result; raises EditorError when the editor reports a failure,
+        # TimeoutError on timeout or abort and OSError when the connection is gone
+        self.next_id += 1
+        payload = {"id": self.next_id, "token": self.token, "cmd": cmd, "args": args}
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        try:
+            self._connect()
+            self.sock.sendall((json.dumps(payload) + "\n").encode())
+            while b"\n" not in self.buffer:
+                if abort is not None and abort.is_set():
+                    raise TimeoutError(f"{cmd} aborted")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"{cmd} timed out after {timeout}s")
+                # Short slices so an abort is noticed while the editor is busy
+                self.sock.settimeout(min(remaining, 0.2))
+                try:
+                    data = self.sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    raise ConnectionResetError("listener closed the connection")
+                self.buffer += data
+        except (OSError, TimeoutError):
+            # A late reply would be read as the answer to the next request
+            self.close()
+            raise
+        line, _, self.buffer = self.buffer.partition(b"\n")
+        reply = json.loads(line)
+        self.timings[cmd].append((time.perf_counter() - start, reply.get("elapsed", 0.0)))
+        if not reply.get("ok"):
+            raise EditorError(reply.get("error", "unknown error"))
+        return reply.get("result")
+
+    def summary(self):
+        # cmd -> (count, mean total s, mean editor s)
+        return {cmd: (len(t), sum(a for a, _ in t) / len(t), sum(b for _, b in t) / len(t))
+                for cmd, t in self.timings.items()}
@@ -0,0 +1,136 @@
+import os, re, json, time
+import watchdog_core as core
+from watchdog_core import config, log
+
+# Persistent queue of isolation jobs, one per map, so a batch of levels runs unattended.
+#
+#   {"jobs": [{"id": "3-Harbor", "project_path": ".../Game.uproject", "map_name": ".../Harbor.umap",
+#              "priority": 5, "status": "queued", "overrides": {"workers": 2}, ...}]}
+#
+# Jobs run highest priority first, then in the order they were added. Every job keeps its
+# isolation state, status and crashing actor list in its own directory under
+# Saved/GPUCrashFinder/jobs/<id>, so a stopped or crashed watchdog picks up each map where it
+# was. Between jobs of the same project the running editor only loads the next map instead of
+# being restarted; among jobs of equal priority those of the current project go first.
+# The queue file is re-read before every job, so jobs can be added while it runs.
+
+queue_path = os.path.join(core.exe_dir, "watchdog_jobs.json")
+# "running" is only seen after the watchdog was killed mid-job; those jobs are resumed
+PENDING = ("queued", "running")
+
+def load_jobs(path=None):
+    try:
+        with open(path or queue_path, "r") as f:
+            return json.load(f).get("jobs", [])
+    except (OSError, ValueError):
+        return []
+
+def save_jobs(jobs, path=None):
+    path = path or queue_path
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"jobs": jobs}, f, indent=2)
+    os.replace(tmp, path)
+
+def job_state_dir(job):
+    return os.path.join(os.path.dirname(job["project_path"]), "Saved", "GPUCrashFinder", "jobs", job["id"])
+
+def map_path(map_name):
+    # Map files become absolute; package paths like /Game/Maps/Harbor are kept for load_level
+    if os.path.exists(map_name) or map_name.lower().endswith(".umap"):
+        return os.path.abspath(map_name)
+    return map_name
+
+def add_job(project_path, map_name, priority=0, overrides=None, path=None):
+    jobs = load_jobs(path)
+    number = max((int(j["id"].split("-")[0]) for j in jobs if j["id"].split("-")[0].isdigit()), default=0) + 1
+    name = re.sub(r"[^A-Za-z0-9_]+", "_", os.path.splitext(os.path.basename(map_name))[0])
+    job = {"id": f"{number}-{name}", "project_path": os.path.abspath(project_path), "map_name": map_path(map_name),
+           "priority": priority, "status": "queued", "overrides": overrides or {}, "added": time.time()}
+    jobs.append(job)
+    save_jobs(jobs, path)
+    return job
+
+def remove_job(job_id, path=None):
+    jobs = load_jobs(path)
+    kept = [j for j in jobs if j["id"] != job_id]
+    save_jobs(kept, path)
+    return len(kept) < len(jobs)
+
+def next_job(jobs, project=None):
+    pending = [j for j in jobs if j["status"] in PENDING]
+    if not pending:
+        return None
+    return min(pending, key=lambda j: (-j["priority"], j["project_path"] != project, j["added"]))
+
+def job_progress(job):
+    try:
+        summary = core.read_isolation_summary(job_state_dir(job))
+    except Exception:
+        summary = None
+    if not summary:
+        return "not started"
+    if summary.get("finished"):
+        return f"finished, {summary.get('culprits', 0)} culprit(s) in {summary.get('bakes', 0)} bakes"
+    return f"{summary.get('chunks_completed', 0)}/{summary.get('all_chunks', 0)} chunks, {summary.get('bakes', 0)} bakes"
+
+def switch_to(job, base):
+    # The job's project, map and state directory on top of the loaded config
+    same_project = config["project_path"] == job["project_path"]
+    config.clear()
+    config.update(base)
+    config.update(job.get("overrides") or {})
+    config.update(project_path=job["project_path"], map_name=job["map_name"], state_dir=job_state_dir(job))
+    core.editor.child_interval = config["log_check_interval"]
+    if not core.editor.is_alive():
+        return
+    if same_project and core.client and config["workers"] <= 1:
+        log(f"🗺 Loading {os.path.basename(job['map_name'])} in the running editor.")
+        if core.reload_map():
+            return
+    # Another project, or the reload failed: the job starts a fresh editor
+    core.kill_editor()
+    core.close_crash_reporter()
+    if core.client:
+        core.client.close()
+        core.client = None
+
+def update_job(job_id, path=None, **fields):
+    jobs = load_jobs(path)
+    for job in jobs:
+        if job["id"] == job_id:
+            job.update(fields)
+    save_jobs(jobs, path)
+
+def run_queue(path=None):
+    # Runs jobs until the queue is empty (True) or a stop is requested (False)
+    base = dict(config)
+    try:
+        while True:
+            if core.stop_requested:
+                core.stop_requested = False
+                log("🛑 Stop requested – job queue paused.")
+                return False
+            job = next_job(load_jobs(path), config["project_path"])
+            if job is None:
+                log("🏁 Job queue empty.")
+                return True
+            log(f"📋 Job {job['id']} (priority {job['priority']}): {job['map_name']}")
+            update_job(job["id"], path, status="running", started=time.time())
+            try:
+                switch_to(job, base)
+                finished = core.watchdog()
+            except Exception as e:
+                log(f"❌ Job {job['id']} failed: {e}", "error")
+                update_job(job["id"], path, status="failed", error=str(e))
+                continue
+            if not finished:
+                # Stopped; the job keeps its state and runs on from there next time
+                update_job(job["id"], path, status="queued")
+                log(f"⏸ Job {job['id']} paused.")
+                return False
+            update_job(job["id"], path, status="done", done=time.time())
+            log(f"✅ Job {job['id']} done: {job_progress(job)}.", "ok")
+    finally:
+        config.clear()
+        config.update(base)
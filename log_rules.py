@@ -0,0 +1,88 @@
+import re, time
+from collections import namedtuple
+
+# ---------- RULES ----------
+# Each rule maps a regex to an event kind. Named captures become event values; the
+# "progress" rule must capture "percent". A line produces at most one event: the first
+# rule in table order that matches it. Override them with "log_rules" in the config:
+#   "log_rules": [{"event": "crashed", "pattern": "Fatal error"}, ...]
+# Patterns that start with a literal are found by the regex engine's fast substring
+# search, so several short rules beat one long alternation.
+
+DEFAULT_RULES = [
+    {"event": "completed",        "pattern": r"LogGPULightmass: Total lighting time"},
+    {"event": "crashed",          "pattern": r"Fatal error"},
+    {"event": "crashed",          "pattern": r"=== Critical error: ==="},
+    {"event": "crashed",          "pattern": r"\bGPU ?[Cc]rash(?:ed)?\b"},
+    {"event": "crashed",          "pattern": r"DXGI_ERROR_DEVICE_(?:REMOVED|HUNG)"},
+    {"event": "crashed",          "pattern": r"RHI: .*?Device (?:Removed|Lost)"},
+    {"event": "editor_ready",     "pattern": r"Total Editor Startup Time"},
+    {"event": "editor_ready",     "pattern": r"LogLoad: \(Engine Initialization\) Total time"},
+    {"event": "progress",         "pattern": r"LogGPULightmass: .*?(?P<percent>\d{1,3}(?:\.\d+)?) ?%"},
+    {"event": "autorunner_ready", "pattern": r"LogPython: .*?(?:(?P<ready>Ready to build lighting)|(?P<initialized>First run complete)|(?P<finished>All chunks tested))"},
+]
+
+LogEvent = namedtuple("LogEvent", "kind line values")
+
+class RuleEngine:
+    # Rules are precompiled once and each scans a whole block of log text in one C-level
+    # pass; matches are merged per line in log order. Python never loops over the lines
+    # that match nothing, which is nearly all of them. Progress is tracked to report a
+    # stall when it stops moving.
+
+    def __init__(self, rules=None, stall_timeout=None, clock=time.monotonic):
+        self.rules = [dict(rule, regex=re.compile(rule["pattern"])) for rule in (rules or DEFAULT_RULES)]
+        self.stall_timeout = stall_timeout
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.progress = None
+        self.progress_time = None
+        self.stalled = False
+
+    def feed(self, lines):
+        if not lines:
+            return []
+        return self.feed_text("\n".join(lines))
+
+    def feed_text(self, text):
+        # line start -> (rule index, match); the earliest rule wins a line
+        hits = {}
+        for index, rule in enumerate(self.rules):
+            for m in rule["regex"].finditer(text):
+                start = text.rfind("\n", 0, m.start()) + 1
+                if start not in hits:
+                    hits[start] = (index, m)
+        events = []
+        for start in sorted(hits):
+            index, m = hits[start]
+            end = text.find("\n", start)
+            values = {k: v for k, v in m.groupdict().items() if v is not None}
+            event = self._event(self.rules[index]["event"], text[start:end if end >= 0 else len(text)], values)
+            if event:
+                events.append(event)
+        return events
+
+    def _event(self, kind, line, values):
+        if kind == "progress":
+            try:
+                percent = float(values["percent"])
+            except (KeyError, ValueError):
+                return None
+            values["percent"] = percent
+            if self.progress is None or percent != self.progress:
+                self.progress_time = self.clock()
+                self.stalled = False
+            self.progress = percent
+        return LogEvent(kind, line, values)
+
+    def check_stall(self):
+        # One "stalled" event once progress has not moved for stall_timeout seconds
+        if self.stall_timeout is None or self.progress_time is None or self.stalled:
+            return None
+        idle = self.clock() - self.progress_time
+        if idle < self.stall_timeout:
+            return None
+        self.stalled = True
+        return LogEvent("stalled", "", {"percent": self.progress, "seconds": idle})
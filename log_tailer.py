@@ -0,0 +1,195 @@
+import os, sys, time, select, ctypes
+
+# ---------- CHANGE NOTIFIERS ----------
+# Wake the tailer as soon as something in the log directory changes. Notifications
+# are only a hint: the tailer re-checks the file itself, so a missed or spurious
+# event costs at most one poll interval.
+
+class _InotifyNotifier:
+    IN_MODIFY      = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM  = 0x00000040
+    IN_MOVED_TO    = 0x00000080
+    IN_CREATE      = 0x00000100
+    IN_DELETE      = 0x00000200
+    IN_NONBLOCK    = 0o4000
+    IN_CLOEXEC     = 0o2000000
+
+    def __init__(self, directory):
+        # The interpreter's own symbols include libc; ctypes.util.find_library would run ldconfig
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM |
+                self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, "inotify_add_watch failed")
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+class _WindowsNotifier:
+    FILE_NOTIFY_CHANGE_FILE_NAME  = 0x001
+    FILE_NOTIFY_CHANGE_SIZE       = 0x008
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x010
+    WAIT_OBJECT_0 = 0
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    def __init__(self, directory):
+        self.k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.k32.FindFirstChangeNotificationW.restype = ctypes.c_void_p
+        self.k32.FindNextChangeNotification.argtypes = [ctypes.c_void_p]
+        self.k32.FindCloseChangeNotification.argtypes = [ctypes.c_void_p]
+        self.k32.WaitForSingleObject.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+        flags = self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE | self.FILE_NOTIFY_CHANGE_LAST_WRITE
+        self.handle = self.k32.FindFirstChangeNotificationW(directory, False, flags)
+        if self.handle in (None, self.INVALID_HANDLE_VALUE):
+            raise OSError(ctypes.get_last_error(), "FindFirstChangeNotification failed")
+
+    def wait(self, timeout):
+        if self.k32.WaitForSingleObject(self.handle, int(max(timeout, 0) * 1000)) != self.WAIT_OBJECT_0:
+            return False
+        self.k32.FindNextChangeNotification(self.handle)
+        return True
+
+    def close(self):
+        self.k32.FindCloseChangeNotification(self.handle)
+
+def make_notifier(directory):
+    try:
+        if sys.platform.startswith("linux"):
+            return _InotifyNotifier(directory)
+        if sys.platform == "win32":
+            return _WindowsNotifier(directory)
+    except (OSError, AttributeError):
+        pass
+    return None
+
+# ---------- TAILER ----------
+
+def open_shared(path):
+    # On Windows a plain open() denies delete/rename, which would stop the editor from
+    # rotating its log while we follow it
+    if sys.platform != "win32":
+        return open(path, "rb")
+    import msvcrt
+    GENERIC_READ = 0x80000000
+    SHARE_ALL = 0x1 | 0x2 | 0x4
+    OPEN_EXISTING = 3
+    k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    k32.CreateFileW.restype = ctypes.c_void_p
+    handle = k32.CreateFileW(path, GENERIC_READ, SHARE_ALL, None, OPEN_EXISTING, 0, None)
+    if handle in (None, ctypes.c_void_p(-1).value):
+        raise ctypes.WinError(ctypes.get_last_error())
+    return os.fdopen(msvcrt.open_osfhandle(handle, os.O_RDONLY | os.O_BINARY), "rb")
+
+class LogTailer:
+    # Follows a log file across truncation and rotation, handing out complete lines only.
+    # wait() blocks on change notifications and falls back to adaptive polling: the poll
+    # interval drops to poll_min after new output and doubles up to poll_max while idle.
+
+    def __init__(self, path, poll_min=0.05, poll_max=0.5, from_start=False, use_notifier=True):
+        self.path = path
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.interval = poll_min
+        self._file = None
+        self._identity = None
+        self._pending = b""
+        self._open(from_start)
+        self.notifier = make_notifier(os.path.dirname(os.path.abspath(path))) if use_notifier else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self, from_start):
+        f = open_shared(self.path)
+        st = os.fstat(f.fileno())
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        if self._file:
+            self._file.close()
+        self._file = f
+        self._identity = (st.st_dev, st.st_ino)
+        self._pending = b""
+
+    def _rotated(self):
+        # Renamed or replaced: the path now names a different file than our handle
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return (st.st_dev, st.st_ino) != self._identity
+
+    def _truncated(self):
+        return os.fstat(self._file.fileno()).st_size < self._file.tell()
+
+    def has_new_data(self):
+        return (os.fstat(self._file.fileno()).st_size > self._file.tell()
+                or self._truncated() or self._rotated())
+
+    def read_lines(self):
+        lines = []
+        if self._truncated():
+            # The editor restarted and overwrote the log in place
+            self._file.seek(0)
+            self._pending = b""
+        lines += self._drain()
+        if self._rotated():
+            # Finish the old file, then follow the new one from its start
+            self._open(from_start=True)
+            lines += self._drain()
+        if lines:
+            self.interval = self.poll_min
+        return lines
+
+    def _drain(self):
+        data = self._file.read()
+        if not data:
+            return []
+        data = self._pending + data
+        *complete, self._pending = data.split(b"\n")
+        return [line.rstrip(b"\r").decode("utf-8", errors="ignore") for line in complete]
+
+    def wait(self, timeout, wake=None):
+        # Returns True when there is something to read, False on timeout or wake
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.has_new_data():
+                return True
+            if wake is not None and wake.is_set():
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            step = min(self.interval, remaining)
+            if self.notifier:
+                self.notifier.wait(step)
+            else:
+                time.sleep(step)
+            self.interval = min(self.interval * 2, self.poll_max)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.notifier:
+            self.notifier.close()
+            self.notifier = None
@@ -0,0 +1,89 @@
+import time, threading
+from collections import deque
+
+# ---------- LOG BUFFER ----------
+# The watchdog thread only appends here; the Tk thread moves the records into the window in
+# batches (TextPump). The buffer holds at most `cap` records, the same number of lines the
+# window keeps, so anything older would be trimmed from the window right away anyway.
+
+class LogBuffer:
+
+    def __init__(self, cap=5000):
+        self.cap = cap
+        self.lock = threading.Lock()
+        self.pending = deque(maxlen=cap)
+        self.countdown = None
+        self.pushed = 0
+        self.dropped = 0
+
+    def push(self, msg, tag=None):
+        with self.lock:
+            if len(self.pending) == self.cap:
+                self.dropped += 1
+            self.pending.append((time.monotonic(), msg, tag))
+            self.pushed += 1
+
+    def set_countdown(self, text):
+        # Only the newest countdown text matters; "" clears the line
+        with self.lock:
+            self.countdown = text
+
+    def drain(self):
+        # (records, countdown) since the last drain; countdown is None when unchanged
+        with self.lock:
+            records = list(self.pending)
+            self.pending.clear()
+            countdown, self.countdown = self.countdown, None
+        return records, countdown
+
+# ---------- TEXT PUMP ----------
+
+class TextPump:
+
+    def __init__(self, root, text, buffer, max_lines=5000, fps=20, mark="countdown_mark"):
+        self.root = root
+        self.text = text
+        self.buffer = buffer
+        self.max_lines = max_lines
+        self.interval = max(1, int(1000 / fps))
+        self.mark = mark
+        # Seconds the oldest record of the last batch waited, and the slowest batch so far
+        self.latency = 0.0
+        self.max_latency = 0.0
+        self.flush_time = 0.0
+        self.max_flush_time = 0.0
+
+    def start(self):
+        self.root.after(self.interval, self._tick)
+
+    def _tick(self):
+        self.flush()
+        self.root.after(self.interval, self._tick)
+
+    def flush(self):
+        records, countdown = self.buffer.drain()
+        if not records and countdown is None:
+            return 0
+        start = time.monotonic()
+        self.text.config(state="normal")
+        if records:
+            # One insert for the whole batch, above the countdown line
+            chunks = []
+            for _, msg, tag in records:
+                chunks += [msg + "\n", tag or ()]
+            self.text.insert(f"{self.mark} linestart", *chunks)
+            # Lines above the countdown line beyond max_lines go, oldest first
+            excess = int(self.text.index(self.mark).split(".")[0]) - 1 - self.max_lines
+            if excess > 0:
+                self.text.delete("1.0", f"{excess + 1}.0")
+            self.latency = start - records[0][0]
+            self.max_latency = max(self.max_latency, self.latency)
+        if countdown is not None:
+            self.text.delete(f"{self.mark} linestart", f"{self.mark} lineend")
+            if countdown:
+                self.text.insert(f"{self.mark} linestart", countdown, "countdown")
+        self.text.config(state="disabled")
+        self.text.see("end")
+        self.flush_time = time.monotonic() - start
+        self.max_flush_time = max(self.max_flush_time, self.flush_time)
+        return len(records)
@@ -0,0 +1,202 @@
+import os, time, threading
+
+class LazyModule:
+    # Imported on first attribute access, then the module global is the real module; the
+    # watchdog's window and status commands start without paying for psutil
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        module = __import__(self.name)
+        globals()[self.name] = module
+        return getattr(module, attr)
+
+psutil = LazyModule("psutil")
+
+EDITOR_NAME = "UnrealEditor"
+CRASH_REPORTER_NAME = "CrashReportClient"
+
+def find_processes(fragment):
+    # Full process table scan; only for the rare paths where nothing is tracked
+    found = []
+    for proc in psutil.process_iter(["name"]):
+        name = proc.info["name"]
+        if name and fragment in name:
+            found.append(proc)
+    return found
+
+# Linux lists direct children per thread under /proc; elsewhere (Windows, macOS) psutil
+# walks the whole process table for them, so the child watch polls less often there
+PROC_CHILDREN = os.path.exists(f"/proc/self/task/{os.getpid()}/children")
+FAST_CHILD_POLL = 0.5
+SLOW_CHILD_POLL = 3.0
+CHILD_POLL = FAST_CHILD_POLL if PROC_CHILDREN else SLOW_CHILD_POLL
+
+def child_pids(proc):
+    if PROC_CHILDREN:
+        try:
+            pids = []
+            for tid in os.listdir(f"/proc/{proc.pid}/task"):
+                with open(f"/proc/{proc.pid}/task/{tid}/children") as f:
+                    pids += [int(pid) for pid in f.read().split()]
+            return pids
+        except (OSError, ValueError):
+            pass
+    try:
+        return [child.pid for child in proc.children()]
+    except psutil.Error:
+        return []
+
+# ---------- TRACKER ----------
+# psutil's cpu_percent() measures against the previous call on the same Process handle,
+# so a handle sampled for the first time always reports 0.0. The tracker keeps one handle
+# per PID for the editor it was given and the processes it spawned, primes each handle
+# when it is first seen and returns the real average between two samples.
+# Liveness is a single check on the root handle; children are looked up at most every
+# child_interval seconds because psutil finds them by walking the process table.
+#
+# Two daemon threads per attached editor turn changes into events: one blocks in wait()
+# on the editor and sets `exited` the moment it ends, the other polls the editor's direct
+# children every child_poll seconds (CHILD_POLL by default) and counts crash reporters as
+# they start. Both also set `wake`, which callers hand to LogTailer.wait() to stop waiting
+# early. A late crash reporter costs little: the crash is in the editor log too, and the
+# exit is seen by the waiting thread.
+
+class ProcessTracker:
+
+    def __init__(self, name=EDITOR_NAME, child_interval=10.0, child_poll=None, clock=time.monotonic):
+        self.name = name
+        self.child_interval = child_interval
+        self.child_poll = child_poll or CHILD_POLL
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.detach()
+
+    def attach(self, pid, handle=None):
+        # handle: the Popen that started the editor; waiting on it also reaps the process
+        try:
+            proc = psutil.Process(pid)
+        except psutil.Error:
+            return False
+        self.detach()
+        self.root = proc
+        self._track(proc)
+        threading.Thread(target=self._wait_exit, args=(handle or proc, self.exited), daemon=True).start()
+        threading.Thread(target=self._watch_children, args=(proc, self.exited), daemon=True).start()
+        return True
+
+    def adopt(self):
+        # An editor the watchdog did not launch, e.g. left open from an earlier session
+        for proc in find_processes(self.name):
+            if self.attach(proc.pid) and self.is_alive():
+                return True
+        self.detach()
+        return False
+
+    def detach(self):
+        self.root = None
+        self.procs = {}
+        self.names = {}
+        self.children_checked = None
+        self.exited = threading.Event()
+        self.reporters_started = 0
+
+    def _track(self, proc):
+        try:
+            name = proc.name()
+            proc.cpu_percent(None)
+        except psutil.Error:
+            return False
+        with self.lock:
+            self.names[proc.pid] = name
+            self.procs[proc.pid] = proc
+        return True
+
+    def _wait_exit(self, handle, exited):
+        try:
+            handle.wait()
+        except Exception:
+            pass
+        exited.set()
+        self.wake.set()
+
+    def _watch_children(self, root, exited):
+        seen = set()
+        while not exited.wait(self.child_poll):
+            if self.root is not root:
+                return
+            for pid in child_pids(root):
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                try:
+                    child = psutil.Process(pid)
+                except psutil.Error:
+                    continue
+                if self._track(child) and CRASH_REPORTER_NAME in self.names[pid]:
+                    self.reporters_started += 1
+                    self.wake.set()
+
+    def is_alive(self):
+        if self.root is None or self.exited.is_set():
+            return False
+        try:
+            # A process we launched stays a zombie until it is reaped
+            return self.root.is_running() and self.root.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    def refresh(self, force=False):
+        now = self.clock()
+        if self.root is None:
+            return
+        if not force and self.children_checked is not None and now - self.children_checked < self.child_interval:
+            return
+        self.children_checked = now
+        try:
+            children = self.root.children(recursive=True)
+        except psutil.Error:
+            children = []
+        for child in children:
+            if child.pid not in self.procs:
+                self._track(child)
+        with self.lock:
+            for pid, proc in list(self.procs.items()):
+                if proc is not self.root and not proc.is_running():
+                    del self.procs[pid]
+                    del self.names[pid]
+
+    def processes(self, fragment=None):
+        # Tracked processes that are still running. Crash reporters stay tracked after the
+        # editor is gone, so they can be closed without a scan
+        fragment = fragment or self.name
+        with self.lock:
+            found = [proc for pid, proc in self.procs.items() if fragment in self.names[pid]]
+        return [proc for proc in found if proc.is_running()]
+
+    def metrics(self):
+        # CPU since the previous call plus I/O bytes, threads and resident memory, summed
+        # over the editor processes; None when the editor is gone
+        if not self.is_alive():
+            return None
+        self.refresh()
+        cpu = io = threads = rss = 0
+        for proc in self.processes():
+            try:
+                with proc.oneshot():
+                    cpu += proc.cpu_percent(None)
+                    threads += proc.num_threads()
+                    rss += proc.memory_info().rss
+                    try:
+                        counters = proc.io_counters()
+                        io += counters.read_bytes + counters.write_bytes
+                    except (AttributeError, psutil.Error):
+                        pass
+            except psutil.Error:
+                continue
+        return {"cpu": cpu, "io": io, "threads": threads, "rss": rss}
+
+    def cpu_percent(self):
+        metrics = self.metrics()
+        return metrics["cpu"] if metrics else None
@@ -0,0 +1,98 @@
+# Post-crash log analysis (crash_log.analyze) over a large synthetic Unreal Engine log.
+#
+#   python -m sim.bench_crash_log --size-mb 2048
+#   python -m sim.bench_crash_log --log path/to/Project.log
+#
+# The generated log is sim.bench_log_rules' editor chatter with a GPU crash section at the
+# end: breadcrumbs naming an actor and a mesh, the fatal error and a callstack. Three runs:
+#   tail     analyze() from the start of the file, as after a bake whose start is unknown
+#   no crash the same log without the crash section, so the marker search covers every block
+#   forward  every line read and matched front to back, keeping the last crash section
+# The file is in the page cache for all of them; RSS is the peak growth of this process.
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import crash_log
+from sim.bench_log_rules import generate
+
+CRASH = [
+    "LogD3D12RHI: Error: GPU crash detected: DXGI_ERROR_DEVICE_REMOVED",
+    "LogD3D12RHI: Error: [GPUBreadCrumb] 3D Queue 0 - GPULightmass "
+    "/Game/Maps/Harbor.Harbor:PersistentLevel.StaticMeshActor_4711.StaticMeshComponent0 /Game/Props/SM_Crane.SM_Crane",
+    "LogWindows: Error: === Critical error: ===",
+    "LogWindows: Error: Fatal error: [File:D3D12Util.cpp] [Line: 880] GPU crash: DXGI_ERROR_DEVICE_REMOVED",
+    "LogWindows: Error: [Callstack] 0x00007ffb1a2b3c4d UnrealEditor-D3D12RHI.dll!FD3D12DynamicRHI::TerminateOnGPUCrash() []",
+    "LogWindows: Error: [Callstack] 0x00007ffb1a2b0011 UnrealEditor-D3D12RHI.dll!D3D12RHI::VerifyD3D12Result() []",
+    "LogExit: Executing StaticShutdownAfterError",
+]
+
+
+def peak_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def forward(path):
+    # The last run of error lines holding a fatal error, found front to back
+    section, run = [], []
+    with open(path, "rb") as f:
+        for line in f:
+            if crash_log.MARKER.search(line) or crash_log.ERROR_LINE.search(line):
+                run.append(line)
+                continue
+            if any(crash_log.MARKER.search(r) for r in run):
+                section = run
+            run = []
+    return section
+
+
+def measure(name, size_mb, run, describe):
+    before = peak_mb()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>9}: {size_mb:8.0f} MB in {elapsed * 1000:9.1f} ms, peak RSS +{peak_mb() - before:6.1f} MB, {describe(result)}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crash section analysis over a large UE log.")
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--log", help="use an existing log instead of generating one")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    path = args.log
+    if not path:
+        fd, path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        start = time.perf_counter()
+        generate(path, args.size_mb, args.seed)
+        print(f"generated {args.size_mb} MB in {time.perf_counter() - start:.1f}s")
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+
+    try:
+        if not args.log:
+            measure("no crash", size_mb, lambda: crash_log.analyze(path),
+                    lambda found: found["error"] or "no crash section")
+            with open(path, "a") as f:
+                f.write("".join(f"[2025.01.01-11.00.01:000][  0]{line}\n" for line in CRASH))
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+        found = measure("tail", size_mb, lambda: crash_log.analyze(path),
+                        lambda found: f"{len(found['callstack'])} frames, {len(found['actors']) + len(found['assets'])} names")
+        measure("forward", size_mb, lambda: forward(path), lambda section: f"{len(section)} section lines")
+        print(f"error:     {found['error']}")
+        print(f"callstack: {' < '.join(found['callstack'])}")
+        print(f"named:     {', '.join(found['actors'] + found['assets'])}")
+    finally:
+        if not args.log:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Editor-side Python cost of one auto_runner cycle against the stubbed `unreal` module.
+#
+#   python -m sim.bench_cycle --actors 1000 5000 10000 20000 40000
+#   python -m sim.bench_cycle --actors 10000 40000 --isolation destroy exclude
+#
+# Each cycle writes the previous verdict to status.json and times main(): state load,
+# verdict, next chunk, isolation, logging and save. After a crash the level is populated
+# again (not timed), as the restarted editor loads the map. After a passing bake
+# the "destroy" isolation reloads the map (LevelEditorSubsystem.load_level, timed as
+# "reload ms"); "exclude" keeps the level and puts actors back on the next run instead.
+# "edits" are the level edits per cycle (destroy_actor, set_mobility, set_visibility), which
+# cost far more in the editor than in the stub. "state KB" is the snapshot plus journal on
+# disk after the last cycle. A flat "us/actor" column means the per-cycle cost grows
+# linearly with the actor count.
+import argparse
+import json
+import os
+import random
+import time
+import types
+
+from sim import fake_unreal
+
+
+def bench(actor_count, cycles, seed, isolation):
+    ar = fake_unreal.load_auto_runner()
+    ar.time = types.SimpleNamespace(sleep=lambda secs: None, time=time.time)
+    ar.ISOLATION_MODE = isolation
+    names = fake_unreal.populate(actor_count)
+    culprit = random.Random(seed).choice(names)
+    subsystem = fake_unreal.get_editor_subsystem(fake_unreal.LevelEditorSubsystem)
+
+    timings, reloads, edits = [], [], []
+    chunk = names
+    for _ in range(cycles + 1):
+        crashed = culprit in chunk
+        with open(ar.STATUS_FILE, "w") as f:
+            json.dump({"crashed": crashed}, f)
+        start = time.perf_counter()
+        if crashed:
+            fake_unreal.populate(actor_count)
+            fake_unreal.__dict__.pop("_gpucf_excluded", None)
+        elif isolation == "destroy":
+            subsystem.load_level("/Game/Maps/Bench")
+            reloads.append(time.perf_counter() - start)
+        fake_unreal.calls.clear()
+        start = time.perf_counter()
+        ar.main()
+        timings.append(time.perf_counter() - start)
+        edits.append(sum(fake_unreal.calls.values()))
+        state = ar.load_state()
+        if state["finished"]:
+            break
+        chunk = set(state["last_chunk"])
+    size = sum(os.path.getsize(p) for p in (ar.STATE_FILE, ar.JOURNAL_FILE) if os.path.exists(p))
+    # The first run only initializes the isolation
+    return timings[1:] or timings, reloads, edits[1:] or edits, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-cycle auto_runner cost versus actor count.")
+    parser.add_argument("--actors", type=int, nargs="+", default=[1000, 5000, 10000, 20000, 40000])
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--isolation", nargs="+", choices=("destroy", "exclude"), default=["exclude"])
+    args = parser.parse_args(argv)
+
+    print(f"{'actors':>7} {'isolation':>9} {'cycles':>6} {'ms/cycle':>9} {'max ms':>8} {'reload ms':>10} "
+          f"{'edits':>7} {'us/actor':>9} {'state KB':>9}")
+    for actor_count in args.actors:
+        for isolation in args.isolation:
+            timings, reloads, edits, size = bench(actor_count, args.cycles, args.seed, isolation)
+            mean = sum(timings) / len(timings)
+            reload = sum(reloads) / len(timings)
+            print(f"{actor_count:>7} {isolation:>9} {len(timings):>6} {mean * 1000:>9.1f} {max(timings) * 1000:>8.1f} "
+                  f"{reload * 1000:>10.1f} {sum(edits) / len(edits):>7.0f} {(mean + reload) / actor_count * 1e6:>9.2f} "
+                  f"{size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Round trips through the IPC channel against the stand-in editor (sim.fake_editor).
+#
+#   python -m sim.bench_ipc --actors 5000 --cycles 20
+#
+# Starts the stand-in as a separate process, waits for its listener.json, then drives an
+# isolation the way the watchdog does: run_autorunner, a fake bake verdict in status.json,
+# reload_map, repeated until auto_runner reports "finished" or --cycles is reached.
+# "total" is measured by EditorClient, "editor" is the time the command took on the
+# stand-in's tick; the difference is queueing for the next tick plus transport.
+# The stand-in runs at --speed 1000, so its simulated startup, reload and auto_runner sleeps
+# take milliseconds and the timings show the channel rather than the simulation.
+import argparse
+import json
+import os
+import random
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+
+from ipc_client import EditorClient, read_listener
+
+
+def wait_listener(saved_dir, proc, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = read_listener(saved_dir)
+        if info and info.get("pid") == proc.pid:
+            return info
+        if proc.poll() is not None:
+            sys.exit("stand-in editor exited during startup")
+        time.sleep(0.02)
+    sys.exit("stand-in editor did not start its listener")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IPC command round trips against the stand-in editor.")
+    parser.add_argument("--actors", type=int, default=5000)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--pings", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    project = tempfile.mkdtemp(prefix="fake_project_")
+    saved_dir = os.path.join(project, "Saved", "GPUCrashFinder")
+    token = secrets.token_hex(16)
+    env = dict(os.environ, GPUCF_TOKEN=token)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "sim.fake_editor", "--project", project,
+                             "--actors", str(args.actors), "--speed", "1000"], env=env)
+    try:
+        info = wait_listener(saved_dir, proc, 30)
+        print(f"stand-in editor listening after {(time.perf_counter() - start) * 1000:.0f} ms, {args.actors} actors")
+        client = EditorClient(info["port"], token)
+
+        for _ in range(args.pings):
+            client.request("ping")
+
+        rng = random.Random(args.seed)
+        cycles = 0
+        while cycles < args.cycles:
+            handshake = client.request("run_autorunner", timeout=120, path=os.path.abspath("auto_runner.py"))
+            state = client.request("query_state")
+            cycles += 1
+            if handshake["phase"] == "finished":
+                break
+            # The chunk left in the level is what would be baked
+            chunk = client.request("query_state")["actors"]
+            with open(os.path.join(saved_dir, "status.json"), "w") as f:
+                json.dump({"crashed": rng.random() < 0.5 or chunk == args.actors}, f)
+            client.request("reload_map", map="/Game/Maps/Fake")
+
+        try:
+            EditorClient(info["port"], "wrong token").request("ping")
+        except Exception as e:
+            print(f"a request with the wrong token is refused: {e}")
+
+        print(f"{cycles} isolation cycles, last phase {handshake['phase']}, summary {state['summary']}")
+        print(f"{'command':>15} {'count':>6} {'total ms':>9} {'editor ms':>10} {'overhead ms':>12}")
+        for cmd, (count, total, editor) in client.summary().items():
+            print(f"{cmd:>15} {count:>6} {total * 1000:>9.2f} {editor * 1000:>10.2f} {(total - editor) * 1000:>12.2f}")
+        client.close()
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
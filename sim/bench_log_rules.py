@@ -0,0 +1,148 @@
+# Throughput of the log rule engine over a synthetic Unreal Engine log.
+#
+#   python -m sim.bench_log_rules --size-mb 2048
+#   python -m sim.bench_log_rules --log path/to/Project.log
+#   python -m sim.bench_log_rules --check
+#
+# The generated log mixes the usual editor chatter with GPU Lightmass progress lines and
+# the occasional marker. "block" feeds the engine 1 MiB reads like a catch-up after a long
+# wait; "lines" feeds it the per-poll line batches the tailer hands to bake_cycle.
+# --check only feeds the CASES lines to the default rules, and to crash_log.MARKER for the
+# crash kinds, and exits with 1 when an event differs from the expected one.
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import crash_log
+from log_rules import RuleEngine
+
+CHATTER = [
+    "LogTemp: Display: Tick group {n} finished",
+    "LogStreaming: Display: Flushing async loaders.",
+    "LogShaderCompilers: Display: ================================================",
+    "LogShaderCompilers: Display: Shaders left to compile {n}",
+    "LogSlate: Window 'Build Lighting' being destroyed",
+    "LogEditorActor: Deleted Actor: StaticMeshActor_{n}",
+    "LogUObjectHash: Compacting FUObjectHashTables data took   {n}.00ms",
+    "LogDerivedDataCache: C:/DDC: Maintenance finished in +00:00:00.{n} and deleted 0 files",
+    "LogRenderer: Reallocating scene render targets to support {n}x1080 Format 10 NumSamples 1",
+    "LogD3D12RHI: Display: Temp texture streaming buffer not large enough, needed {n} bytes",
+    "LogPython: 🔬 Testing chunk ({n} actors):",
+    "LogPython:    ↪ SM_Rock_{n}",
+    "LogPython: 📝 Exported crashing actors to: D:/Game/Saved/GPUCrashFinder/crashing_actors_list.txt",
+]
+
+# (line, event kind or None) the default rules must give
+CASES = [
+    ("LogD3D12RHI: Error: GPU crash detected: DXGI_ERROR_DEVICE_REMOVED", "crashed"),
+    ("LogD3D12RHI: Error: GPU Crash dump Triggered", "crashed"),
+    ("LogRHI: Error: GPUCrash dump written", "crashed"),
+    ("LogWindows: Error: Fatal error: [File:D3D12Util.cpp] [Line: 880]", "crashed"),
+    ("LogPython: 📝 Exported crashing actors to: D:/Game/Saved/GPUCrashFinder/crashing_actors_list.txt", None),
+    ("LogPython: GPUCrashFinder listener on 127.0.0.1:50211", None),
+    ("LogD3D12RHI: Error: D3D12 Device Removed, reason: DXGI_ERROR_DEVICE_HUNG", "crashed"),
+    ("LogVulkanRHI: Error: Device Lost after submitting command buffer", "crashed"),
+    ("LogAudioMixer: Display: Audio Device Removed: {0.0.0.00000000}.{b1f4}", None),
+    ("LogInput: Warning: USB Device Lost: Xbox Controller", None),
+    ("LogGPULightmass: Lighting progress 42%", "progress"),
+    ("LogGPULightmass: Total lighting time 1h 2m", "completed"),
+]
+
+
+def check():
+    failed = 0
+    for line, expected in CASES:
+        events = RuleEngine().feed([line])
+        got = events[0].kind if events else None
+        marker = bool(crash_log.MARKER.search(line.encode()))
+        ok = got == expected and marker == (expected == "crashed")
+        failed += not ok
+        print(f"{'ok' if ok else 'FAIL':>4}  {str(got):>9}  marker {'yes' if marker else 'no ':>3}  {line}")
+    print(f"{len(CASES) - failed}/{len(CASES)} lines as expected")
+    return failed == 0
+
+
+def generate(path, size_mb, seed):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(20000):
+        stamp = f"[2025.01.01-10.{i // 600 % 60:02d}.{i // 10 % 60:02d}:{i % 1000:03d}][{i % 1000:3d}]"
+        if i % 97 == 0:
+            body = f"LogGPULightmass: Lighting progress {rng.randint(0, 100)}%"
+        else:
+            body = rng.choice(CHATTER).format(n=rng.randint(0, 99999))
+        lines.append(stamp + body)
+    block = ("\n".join(lines) + "\n").encode()
+    target = size_mb * 1024 * 1024
+    with open(path, "wb") as f:
+        written = 0
+        while written < target:
+            f.write(block)
+            written += len(block)
+        f.write(b"[2025.01.01-11.00.00:000][  0]LogGPULightmass: Total lighting time 1h 2m\n")
+
+
+def run_blocks(path, engine):
+    events = 0
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        pending = ""
+        while True:
+            data = f.read(1 << 20)
+            if not data:
+                break
+            text, sep, pending = (pending + data).rpartition("\n")
+            events += len(engine.feed_text(text))
+        events += len(engine.feed_text(pending))
+    return events
+
+
+def run_lines(path, engine, batch):
+    events = 0
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        lines = []
+        for line in f:
+            lines.append(line.rstrip("\n"))
+            if len(lines) == batch:
+                events += len(engine.feed(lines))
+                lines = []
+        events += len(engine.feed(lines))
+    return events
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rule engine throughput over a large UE log.")
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--log", help="use an existing log instead of generating one")
+    parser.add_argument("--batch", type=int, default=200, help="lines per tailer batch in lines mode")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--check", action="store_true", help="check the default rules on CASES and exit")
+    args = parser.parse_args(argv)
+    if args.check:
+        sys.exit(0 if check() else 1)
+
+    path = args.log
+    if not path:
+        fd, path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        start = time.perf_counter()
+        generate(path, args.size_mb, args.seed)
+        print(f"generated {args.size_mb} MB in {time.perf_counter() - start:.1f}s")
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+
+    try:
+        for mode in ("block", "lines"):
+            engine = RuleEngine()
+            start = time.perf_counter()
+            events = run_blocks(path, engine) if mode == "block" else run_lines(path, engine, args.batch)
+            elapsed = time.perf_counter() - start
+            print(f"{mode:>6}: {size_mb:8.0f} MB in {elapsed:6.1f}s = {size_mb / elapsed:7.1f} MB/s, {events} events")
+    finally:
+        if not args.log:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# Stress test for the log path: 1M records from the watchdog thread into the window.
+#
+#   python -m sim.bench_log_view --records 1000000
+#   python -m sim.bench_log_view --records 1000000 --cap 5000 --fps 20 --direct 20000
+#
+# A producer thread logs through watchdog_core.log() like the cycle does, so every record
+# also goes to the rotating history file (written to a temp dir here). The window side is a
+# real tkinter ScrolledText fed by TextPump at --fps. Reported: producer throughput, the
+# delay of the oldest record in a batch until it is drawn (p50/p95/max), the time one
+# batch blocks the Tk thread, lines left in the widget, RSS growth and the history files.
+# --direct N runs the old path (insert + see per record on an unbounded widget) for N
+# records to compare. The widget rows need a display; without one only the buffer is
+# drained at --fps and the widget columns stay empty.
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import psutil
+
+import watchdog_core as core
+from log_view import LogBuffer, TextPump
+from sim.search_sim import percentile
+
+MESSAGES = [("🧠 Unreal CPU usage: 23.4% (baking)", None), ("📈 Lightmass progress: 40%", None),
+            ("💥 CrashReportClient started – treating as crash.", "error"), ("✅ Map reloaded.", "ok")]
+
+
+def make_widget():
+    try:
+        import tkinter as tk
+        from tkinter import scrolledtext
+        root = tk.Tk()
+    except Exception as e:
+        return None, None, str(e).splitlines()[0]
+    text = scrolledtext.ScrolledText(root, height=14, width=100)
+    text.pack()
+    text.insert(tk.END, "📝 Log started.\n", "info")
+    text.insert(tk.END, "\n", "countdown")
+    text.mark_set("countdown_mark", "end -1 line")
+    text.mark_gravity("countdown_mark", tk.RIGHT)
+    root.update()
+    return root, text, None
+
+
+def produce(records, done):
+    for i in range(records):
+        msg, tag = MESSAGES[i % len(MESSAGES)]
+        core.log(msg, tag)
+        if i % 1000 == 0:
+            core.show_countdown(f"⏳ Waiting… {i % 60}s")
+    done.set()
+
+
+def run_pump(args, buffer):
+    root, text, error = make_widget()
+    done = threading.Event()
+    latencies = []
+    flushes = []
+    rss_before = psutil.Process().memory_info().rss
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce, args=(args.records, done), daemon=True)
+    producer.start()
+    produced_at = None
+    if root is not None:
+        pump = TextPump(root, text, buffer, max_lines=args.cap, fps=args.fps)
+
+        def tick():
+            if pump.flush():
+                latencies.append(pump.latency)
+                flushes.append(pump.flush_time)
+            if done.is_set() and not buffer.pending:
+                root.quit()
+                return
+            root.after(pump.interval, tick)
+        root.after(pump.interval, tick)
+        root.mainloop()
+        lines = int(text.index("countdown_mark").split(".")[0]) - 1
+    else:
+        # No display: drain at the same pace, only the buffer is measured
+        lines = None
+        while not (done.is_set() and not buffer.pending):
+            time.sleep(1 / args.fps)
+            records, _ = buffer.drain()
+            if records:
+                latencies.append(time.monotonic() - records[0][0])
+    produced_at = time.perf_counter() - start
+    rss_after = psutil.Process().memory_info().rss
+    if root is not None:
+        root.destroy()
+    return {"seconds": produced_at, "latencies": sorted(latencies), "flushes": sorted(flushes), "lines": lines,
+            "rss": (rss_after - rss_before) / (1 << 20), "error": error}
+
+
+def run_direct(records):
+    # The old path: one insert and see("end") per record from the producer, nothing trimmed
+    root, text, error = make_widget()
+    if root is None:
+        return None
+    rss_before = psutil.Process().memory_info().rss
+    start = time.perf_counter()
+    slowest = 0.0
+    for i in range(records):
+        msg, tag = MESSAGES[i % len(MESSAGES)]
+        t = time.perf_counter()
+        text.config(state="normal")
+        text.insert("countdown_mark linestart", msg + "\n", tag)
+        text.config(state="disabled")
+        text.see("end")
+        root.update()
+        slowest = max(slowest, time.perf_counter() - t)
+    seconds = time.perf_counter() - start
+    rss = (psutil.Process().memory_info().rss - rss_before) / (1 << 20)
+    root.destroy()
+    return seconds, slowest, rss
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Log buffer, window pump and history file under load.")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--cap", type=int, default=5000, help="log_view_lines")
+    parser.add_argument("--fps", type=float, default=20, help="log_view_fps")
+    parser.add_argument("--history-mb", type=float, default=20)
+    parser.add_argument("--direct", type=int, default=0, metavar="N", help="also time the old per-record path")
+    args = parser.parse_args(argv)
+
+    history_dir = tempfile.mkdtemp(prefix="watchdog_log_")
+    core.load_config(overrides={"log_history_file": os.path.join(history_dir, "watchdog.log"),
+                                "log_history_mb": args.history_mb})
+    handler = core.open_history()
+    buffer = LogBuffer(args.cap)
+    core.subscribe(lambda kind, data: buffer.push(data["msg"], data["tag"]) if kind == "log"
+                   else buffer.set_countdown(data["text"]) if kind == "countdown" else None)
+
+    r = run_pump(args, buffer)
+    handler.close()
+    files = sorted(os.listdir(history_dir))
+    size = sum(os.path.getsize(os.path.join(history_dir, f)) for f in files) / (1 << 20)
+    print(f"{args.records} records in {r['seconds']:.1f}s ({args.records / r['seconds']:,.0f}/s), "
+          f"{buffer.dropped} dropped before drawing (cap {args.cap})")
+    if r["latencies"]:
+        lat = r["latencies"]
+        print(f"record to window: p50 {percentile(lat, 50) * 1000:.0f} ms, p95 {percentile(lat, 95) * 1000:.0f} ms, "
+              f"max {lat[-1] * 1000:.0f} ms over {len(lat)} batches")
+    if r["error"]:
+        print(f"widget: skipped ({r['error']})")
+    else:
+        fl = r["flushes"]
+        print(f"batch on the Tk thread: p50 {percentile(fl, 50) * 1000:.1f} ms, max {fl[-1] * 1000:.1f} ms; "
+              f"{r['lines']} lines in the widget")
+    print(f"RSS growth {r['rss']:.1f} MB; history {size:.1f} MB in {len(files)} files ({', '.join(files)})")
+
+    if args.direct:
+        d = run_direct(args.direct)
+        if d:
+            print(f"old path, {args.direct} records: {d[0]:.1f}s, slowest record {d[1] * 1000:.1f} ms, RSS growth {d[2]:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
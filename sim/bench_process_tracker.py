@@ -0,0 +1,181 @@
+# Cost and accuracy of editor liveness/CPU checks on a host with thousands of processes.
+#
+#   python -m sim.bench_process_tracker --processes 3000
+#   python -m sim.bench_process_tracker --lookups
+#
+# Starts --processes idle sleepers plus a stand-in editor: a Python interpreter started
+# through a link named UnrealEditor that burns --duty of one core. "scan" is the old
+# approach (process_iter for liveness and CPU on every check), "tracker" is
+# process_tracker.ProcessTracker. Each check is timed; "cpu" is what the check reported
+# after --interval seconds, which should be close to the duty cycle. The tracker's max is
+# its periodic child lookup, which walks the process table.
+# The last section times the watcher events: the stand-in editor starts a child named
+# CrashReportClient and later exits, and the timestamps both processes print are compared
+# with when the tracker's events fired. POSIX only.
+# The child lookup section times what the child watch does every poll: reading /proc (Linux)
+# and psutil's children(), the process table walk Windows and macOS get, as the share of
+# one core it costs at the fast and the slow poll. --lookups runs only that section, over
+# the host's own processes and with this interpreter as the root, so it runs on Windows too.
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import psutil
+
+from process_tracker import FAST_CHILD_POLL, PROC_CHILDREN, SLOW_CHILD_POLL, ProcessTracker, child_pids
+
+BURNER = """
+import time, sys
+duty = float(sys.argv[1])
+while True:
+    start = time.perf_counter()
+    while time.perf_counter() - start < 0.01 * duty:
+        pass
+    time.sleep(0.01 * (1 - duty))
+"""
+
+
+CRASHER = """
+import subprocess, sys, time
+time.sleep(0.5)
+print(time.time(), flush=True)
+reporter = subprocess.Popen([sys.argv[1], "600"], stdout=subprocess.DEVNULL)
+time.sleep(1.0)
+print(time.time(), flush=True)
+"""
+
+
+def scan_is_running():
+    return any("UnrealEditor" in p.name() for p in psutil.process_iter())
+
+
+def scan_cpu():
+    total = 0.0
+    cnt = 0
+    for proc in psutil.process_iter(['name']):
+        try:
+            if proc.info['name'] and "UnrealEditor" in proc.info['name']:
+                total += proc.cpu_percent(interval=0.0)
+                cnt += 1
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / cnt if cnt else 0.0
+
+
+def measure(check, rounds, interval):
+    timings = []
+    values = []
+    for _ in range(rounds):
+        time.sleep(interval)
+        start = time.perf_counter()
+        values.append(check())
+        timings.append(time.perf_counter() - start)
+    return timings, values
+
+
+def event_latency(editor_bin, reporter_bin, child_poll):
+    proc = subprocess.Popen([editor_bin, "-c", CRASHER, reporter_bin], stdout=subprocess.PIPE, text=True)
+    tracker = ProcessTracker(child_poll=child_poll)
+    tracker.attach(proc.pid, proc)
+    reporter_at = exited_at = None
+    while exited_at is None:
+        tracker.wake.wait(5)
+        tracker.wake.clear()
+        now = time.time()
+        if reporter_at is None and tracker.reporters_started:
+            reporter_at = now
+        if tracker.exited.is_set():
+            exited_at = now
+    started, ended = (float(line) for line in proc.stdout.read().split())
+    for reporter in tracker.processes("CrashReportClient"):
+        reporter.kill()
+    return reporter_at - started, exited_at - ended
+
+
+def lookup_costs(root, rounds):
+    lookups = [("psutil", lambda: [child.pid for child in root.children()])]
+    if PROC_CHILDREN:
+        lookups.insert(0, ("/proc", lambda: child_pids(root)))
+    print(f"{'lookup':>8} {'median ms':>10} {f'core @{FAST_CHILD_POLL}s':>12} {f'core @{SLOW_CHILD_POLL}s':>12}"
+          f"  ({len(psutil.pids())} processes)")
+    for name, lookup in lookups:
+        timings, _ = measure(lookup, rounds, 0.0)
+        median = sorted(timings)[len(timings) // 2]
+        print(f"{name:>8} {median * 1000:>10.2f} {median / FAST_CHILD_POLL:>12.2%} {median / SLOW_CHILD_POLL:>12.2%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process scan versus tracked handles.")
+    parser.add_argument("--processes", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between checks")
+    parser.add_argument("--child-poll", type=float, default=0.5, help="tracker child watch interval")
+    parser.add_argument("--duty", type=float, default=0.5, help="CPU share the stand-in editor burns")
+    parser.add_argument("--lookups", action="store_true", help="only time the child lookups, on any OS")
+    args = parser.parse_args(argv)
+
+    if args.lookups:
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+        try:
+            lookup_costs(psutil.Process(), args.rounds * 20)
+        finally:
+            child.kill()
+            child.wait()
+        return
+
+    sleep_bin = shutil.which("sleep")
+    if os.name != "posix" or not sleep_bin:
+        sys.exit("needs a POSIX host with a sleep binary")
+
+    tmp = tempfile.mkdtemp()
+    editor_bin = os.path.join(tmp, "UnrealEditor")
+    os.symlink(sys.executable, editor_bin)
+    sleepers = []
+    editor = None
+    try:
+        start = time.perf_counter()
+        for _ in range(args.processes):
+            sleepers.append(subprocess.Popen([sleep_bin, "3600"]))
+        editor = subprocess.Popen([editor_bin, "-c", BURNER, str(args.duty)])
+        print(f"started {args.processes} sleepers in {time.perf_counter() - start:.1f}s, "
+              f"{len(psutil.pids())} processes on the host, editor duty {args.duty:.0%}")
+
+        tracker = ProcessTracker(child_interval=args.interval * args.rounds)
+        tracker.attach(editor.pid)
+
+        def scan_check():
+            return scan_cpu() if scan_is_running() else None
+
+        def tracked_check():
+            return tracker.cpu_percent() if tracker.is_alive() else None
+
+        print(f"{'mode':>8} {'median ms':>10} {'max ms':>8}  cpu per check")
+        for mode, check in (("scan", scan_check), ("tracker", tracked_check)):
+            timings, values = measure(check, args.rounds, args.interval)
+            cpus = " ".join(f"{v:5.1f}" for v in values)
+            print(f"{mode:>8} {sorted(timings)[len(timings) // 2] * 1000:>10.2f} {max(timings) * 1000:>8.2f}  {cpus}")
+
+        lookup_costs(psutil.Process(editor.pid), args.rounds * 20)
+
+        fresh = psutil.Process(editor.pid).cpu_percent(interval=0.0)
+        print(f"a freshly created handle reports {fresh:.1f}% on its first sample")
+
+        reporter_bin = os.path.join(tmp, "CrashReportClient")
+        os.symlink(sleep_bin, reporter_bin)
+        reporter, exited = event_latency(editor_bin, reporter_bin, args.child_poll)
+        print(f"crash reporter noticed after {reporter * 1000:.0f} ms, editor exit after {exited * 1000:.1f} ms "
+              f"(child_poll {args.child_poll}s)")
+    finally:
+        for proc in sleepers + ([editor] if editor else []):
+            proc.kill()
+        for proc in sleepers + ([editor] if editor else []):
+            proc.wait()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
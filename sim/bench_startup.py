@@ -0,0 +1,130 @@
+# Startup time and memory of the headless watchdog against the tkinter window.
+#
+#   python -m sim.bench_startup --runs 10
+#   python -m sim.bench_startup --check --budget-ms 60
+#
+# Every run is a fresh interpreter. "headless" imports watchdog_core and loads the config
+# the way watchdog_cli does; "gui" imports watchdog.py with mainloop() replaced by a single
+# update(), so the window is built and drawn once and the process ends. Reported: wall time
+# from spawn to exit, time spent in the import inside the child, and resident memory after
+# it. "gui-libs" only adds the tkinter imports to headless and runs without a display; the
+# "gui" row needs one and is reported as skipped otherwise.
+#
+# --check is the startup regression test: `python -X importtime -c "import <module>"` for
+# the watchdog's entry modules (watchdog_core, watchdog_cli and the window's watchdog), in
+# fresh interpreters. It fails (exit code 1) when one of LAZY is loaded by the import, or
+# when the median import time is over --budget-ms, and prints the slowest imports either way.
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from sim import REPO_DIR
+from sim.search_sim import percentile
+
+PROBE = """
+import json, sys, time, psutil
+start = time.perf_counter()
+if sys.argv[1] == "gui":
+    import tkinter
+    def mainloop(self, n=0):
+        self.update()
+        report()
+        self.destroy()
+    tkinter.Misc.mainloop = mainloop
+def report():
+    print(json.dumps({"import": time.perf_counter() - start, "rss": psutil.Process().memory_info().rss,
+                      "modules": len(sys.modules)}))
+if sys.argv[1] == "gui":
+    import watchdog
+    watchdog.main()
+elif sys.argv[1] == "gui-libs":
+    import tkinter, tkinter.filedialog, tkinter.scrolledtext, watchdog_core
+    watchdog_core.load_config()
+    report()
+else:
+    import watchdog_core
+    watchdog_core.load_config()
+    report()
+"""
+
+
+def probe(mode):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", PROBE, mode], cwd=REPO_DIR, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        return None, proc.stderr.strip().splitlines()[-1:] or ["no output"]
+    return dict(json.loads(lines[-1]), wall=wall), None
+
+
+# Entry modules with what of LAZY they may load; the window needs tkinter to define itself
+ENTRIES = {"watchdog_core": (), "watchdog_cli": (), "watchdog": ("tkinter",)}
+LAZY = ("psutil", "pyautogui", "tkinter", "logging", "http.server", "subprocess", "shutil", "worker_pool")
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_times(module):
+    # {module: (self us, cumulative us)} of one fresh import
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=REPO_DIR,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME.match(line)
+        if m:
+            times[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return times
+
+
+def check(runs, budget_ms):
+    ok = True
+    for module, allowed in ENTRIES.items():
+        samples = [import_times(module) for _ in range(runs)]
+        total = statistics.median(s[module][1] for s in samples) / 1000
+        loaded = [name for name in LAZY if name in samples[0] and name not in allowed]
+        slowest = sorted(samples[0].items(), key=lambda item: -item[1][0])[:5]
+        over = total > budget_ms
+        print(f"{module:>14}: {total:6.1f} ms (budget {budget_ms:g}){'  OVER BUDGET' if over else ''}, "
+              f"{len(samples[0])} modules")
+        print(f"{'':>14}  slowest: " + ", ".join(f"{name} {own / 1000:.1f}" for name, (own, _) in slowest))
+        if loaded:
+            print(f"{'':>14}  loaded at import: {', '.join(loaded)}")
+        ok = ok and not over and not loaded
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless vs GUI startup benchmark.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--check", action="store_true", help="import-time regression test")
+    parser.add_argument("--budget-ms", type=float, default=60, help="median import time allowed per entry module")
+    args = parser.parse_args(argv)
+    if args.check:
+        sys.exit(0 if check(args.runs, args.budget_ms) else 1)
+
+    print(f"{'mode':>9} {'wall ms':>8} {'p95 ms':>7} {'import ms':>10} {'rss MB':>7} {'modules':>8}")
+    for mode in ("headless", "gui-libs", "gui"):
+        results = []
+        for _ in range(args.runs):
+            result, error = probe(mode)
+            if result is None:
+                print(f"{mode:>9} skipped: {error[0]}")
+                break
+            results.append(result)
+        if not results:
+            continue
+        wall = sorted(r["wall"] * 1000 for r in results)
+        imported = sorted(r["import"] * 1000 for r in results)
+        rss = sorted(r["rss"] / (1 << 20) for r in results)
+        print(f"{mode:>9} {percentile(wall, 50):>8.0f} {percentile(wall, 95):>7.0f} {percentile(imported, 50):>10.0f} "
+              f"{percentile(rss, 50):>7.1f} {results[-1]['modules']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Bake cycles needed to isolate crashes that only happen with a combination of actors.
+#
+#   python -m sim.ddmin_sim --actors 1000 10000 50000 --ways 2 3 --trials 50
+#   python -m sim.ddmin_sim --actors 10000 --strategies hwang --expected-culprits 1 2 3
+#
+# The hidden crash fires only when every actor of one k-way combination is in the bake.
+# "auto" strategies first search for single culprits and switch to ddmin once a crashing
+# chunk's parts all pass; the ddmin strategy minimizes the whole level right away. hwang runs
+# once per --expected-culprits value (hwang/d); above 1 it carves test groups from a pool.
+import argparse
+import random
+import statistics
+
+from sim import fake_unreal
+from sim.search_sim import percentile, run_isolation
+
+
+def all_of(combination):
+    return lambda names: combination.issubset(names)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake cycles to isolate k-way interaction crashes.")
+    parser.add_argument("--actors", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--ways", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--strategies", nargs="+", default=["bisect", "hwang", "ddmin"])
+    parser.add_argument("--expected-culprits", type=int, nargs="+", default=[1, 3],
+                        help="EXPECTED_CULPRITS values the hwang strategy runs with")
+    parser.add_argument("--trials", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    ar = fake_unreal.load_auto_runner()
+    runs = [(name, d) for name in args.strategies for d in (args.expected_culprits if name == "hwang" else [None])]
+
+    print(f"{'actors':>7} {'ways':>5} {'strategy':>9} {'mean':>7} {'p95':>5} {'max':>5} {'found':>6} {'no ddmin':>9}")
+    for actor_count in args.actors:
+        for ways in args.ways:
+            rng = random.Random(args.seed)
+            combos = [{f"Actor_{i}" for i in rng.sample(range(actor_count), ways)} for _ in range(args.trials)]
+            for strategy, expected in runs:
+                if expected is not None:
+                    ar.EXPECTED_CULPRITS = expected
+                bakes, found = [], 0
+                for combo in combos:
+                    count, state = run_isolation(ar, strategy, actor_count, all_of(combo))
+                    bakes.append(count)
+                    found += any(set(names) == combo for names in state["crashing_sets"])
+
+                # The same runs without the interaction search, as the tree behaved before
+                ar.INTERACTION_SEARCH = False
+                lost = sum(not run_isolation(ar, strategy, actor_count, all_of(combo))[1]["crashing_sets"]
+                           for combo in combos) if strategy != "ddmin" else 0
+                ar.INTERACTION_SEARCH = True
+
+                label = f"{strategy}/{expected}" if expected is not None else strategy
+                print(f"{actor_count:>7} {ways:>5} {label:>9} {statistics.mean(bakes):>7.1f} "
+                      f"{percentile(bakes, 95):>5} {max(bakes):>5} {found / len(combos):>6.0%} "
+                      f"{'-' if strategy == 'ddmin' else f'{1 - lost / len(combos):.0%}':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# Stand-in editor process: the stubbed `unreal` module, a synthetic level and the real
+# editor_listener.py, ticked at --fps like the editor's Slate loop.
+#
+#   python -m sim.fake_editor --project /tmp/proj --actors 5000 --port 0
+#   python -m sim.fake_editor /tmp/proj/Fake.uproject /Game/Maps/Fake -ExecutePythonScript=editor_listener.py \
+#       --actors 1000 --culprits Actor_17 --hangs Actor_512 --speed 20
+#
+# The watchdog's EditorClient talks to it exactly as to a real editor, so the IPC path
+# (listener.json, token, run_autorunner, reload_map, query_state, build_lighting) runs on
+# Linux. The token comes from GPUCF_TOKEN like in the editor. Ctrl+C or SIGTERM ends it.
+#
+# Started the way the watchdog starts UnrealEditor (project, map, -ExecutePythonScript) it
+# also plays the editor's part in the log, Saved/Logs/<project>.log, rotated to a backup on
+# every start: the startup lines, LogPython for unreal.log, and for every build_lighting a
+# GPU Lightmass bake with progress lines and "Total lighting time" at the end. A bake with
+# one of --culprits in the build (in the level and not excluded) writes a fatal error,
+# starts a CrashReportClient and exits; in --named-share of those crashes the GPU
+# breadcrumbs before the fatal error and the crash report in Saved/Crashes name the
+# culprit, like a crash the GPU could pin on a draw;
+# one with a --hangs actor stops dead: no ticks, no log lines, no CPU. --miss-rate ignores
+# that share of builds like a click that missed the button.
+#
+# All durations are editor seconds divided by --speed, auto_runner's sleeps included. The
+# process burns --cpu-idle percent of a core while responsive and --cpu-bake while baking,
+# so the freeze detector sees the drop it looks for.
+import argparse
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from sim import REPO_DIR, fake_unreal
+
+_sleep = time.sleep
+
+
+class EditorLog:
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            # The editor moves the previous session's log aside on start
+            stem = os.path.splitext(path)[0]
+            os.replace(path, f"{stem}-backup-{time.strftime('%Y.%m.%d-%H.%M.%S')}-{os.getpid()}.log")
+        self.f = open(path, "a", encoding="utf-8")
+        self.frame = 0
+
+    def write(self, category, msg):
+        now = time.time()
+        stamp = time.strftime("%Y.%m.%d-%H.%M.%S", time.localtime(now)) + f":{int(now % 1 * 1000):03d}"
+        self.f.write(f"[{stamp}][{self.frame % 1000:3d}]{category}: {msg}\n")
+        self.f.flush()
+
+
+class FakeEditor:
+
+    def __init__(self, args, log, project):
+        self.args = args
+        self.log = log
+        self.project = project
+        self.rng = random.Random(args.seed)
+        self.culprits = set(args.culprits)
+        self.hangs = set(args.hangs)
+        self.bake = None
+
+    def seconds(self, editor_seconds):
+        return editor_seconds / self.args.speed
+
+    def build(self, quality):
+        if self.rng.random() < self.args.miss_rate:
+            return
+        names = fake_unreal.in_build()
+        fail = "hang" if names & self.hangs else "crash" if names & self.culprits else None
+        self.bake = {"start": time.monotonic(), "percent": 0, "fail": fail, "culprit": min(names & self.culprits, default=None),
+                     "length": self.seconds(self.args.bake_base + self.args.bake_per_actor * len(names)),
+                     "fail_at": self.rng.uniform(0.1, 0.9)}
+        self.log.write("LogGPULightmass", f"Starting lighting build for {len(names)} actors")
+
+    def load_level(self, subsystem, path):
+        _sleep(self.seconds(self.args.reload))
+        self.log.write("LogEditorServer", f"Finished loading map {path}")
+        return self.original_load_level(subsystem, path)
+
+    def crash(self):
+        culprit = self.bake["culprit"] if self.rng.random() < self.args.named_share else None
+        if culprit:
+            self.log.write("LogD3D12RHI", "Error: GPU crash detected: DXGI_ERROR_DEVICE_REMOVED")
+            self.log.write("LogD3D12RHI", f"Error: [GPUBreadCrumb] 3D Queue 0 - GPULightmass {self.args.map}:"
+                                          f"PersistentLevel.{culprit}.StaticMeshComponent0")
+        self.log.write("LogWindows", "Error: === Critical error: ===")
+        self.log.write("LogWindows", "Error: Fatal error: [File:D3D12Util.cpp] [Line: 880] "
+                                     "GPU crash: DXGI_ERROR_DEVICE_REMOVED")
+        self.log.write("LogWindows", "Error: [Callstack] 0x00007ffb1a2b3c4d "
+                                     "UnrealEditor-D3D12RHI.dll!FD3D12DynamicRHI::TerminateOnGPUCrash() []")
+        if culprit:
+            report = os.path.join(self.project, "Saved", "Crashes", f"UECC-Windows-{os.getpid()}")
+            os.makedirs(report, exist_ok=True)
+            with open(os.path.join(report, "CrashContext.runtime-xml"), "w") as f:
+                f.write(f"<ErrorMessage>GPU crash in {self.args.map}:PersistentLevel.{culprit}</ErrorMessage>\n"
+                        "<CallStack>UnrealEditor_D3D12RHI!FD3D12DynamicRHI::TerminateOnGPUCrash() []</CallStack>\n")
+        # Named like the real one, so the watchdog's process watcher recognizes it
+        link = os.path.join(tempfile.mkdtemp(prefix="fake_crash_"), "CrashReportClient")
+        os.symlink(sys.executable, link)
+        subprocess.Popen([link, "-c", "import time; time.sleep(60)"],
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _sleep(max(1.0, self.seconds(10)))
+        os._exit(3)
+
+    def hang(self):
+        while True:
+            _sleep(3600)
+
+    def tick(self):
+        bake = self.bake
+        if bake is None:
+            return
+        done = (time.monotonic() - bake["start"]) / bake["length"]
+        if bake["fail"] and done >= bake["fail_at"]:
+            self.crash() if bake["fail"] == "crash" else self.hang()
+        while bake["percent"] + 5 <= min(done, 1.0) * 100 and bake["percent"] < 95:
+            bake["percent"] += 5
+            self.log.write("LogGPULightmass", f"Lighting progress {bake['percent']}%")
+        if done >= 1.0:
+            minutes, seconds = divmod(int(bake["length"] * self.args.speed), 60)
+            self.log.write("LogGPULightmass", f"Total lighting time: {minutes}m {seconds}s")
+            self.bake = None
+
+    def cpu_share(self):
+        return (self.args.cpu_bake if self.bake else self.args.cpu_idle) / 100
+
+
+def load_listener(path=None):
+    spec = importlib.util.spec_from_file_location("__main__", path or os.path.join(REPO_DIR, "editor_listener.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Editor stand-in serving the watchdog's IPC commands.")
+    parser.add_argument("uproject", nargs="?", help="project file, as the watchdog passes it to the editor")
+    parser.add_argument("map", nargs="?")
+    parser.add_argument("--project", help="project directory (Saved/ goes here), without a uproject")
+    parser.add_argument("--actors", type=int, default=1000)
+    parser.add_argument("--culprits", type=lambda s: s.split(","), default=[], help="comma-separated actor names")
+    parser.add_argument("--hangs", type=lambda s: s.split(","), default=[], help="comma-separated actor names")
+    parser.add_argument("--miss-rate", type=float, default=0.0)
+    parser.add_argument("--named-share", type=float, default=0.0, help="share of crashes whose log names the culprit")
+    parser.add_argument("--speed", type=float, default=1.0, help="editor seconds per real second")
+    parser.add_argument("--startup", type=float, default=40, help="editor seconds until the listener is up")
+    parser.add_argument("--bake-base", type=float, default=20)
+    parser.add_argument("--bake-per-actor", type=float, default=0.02)
+    parser.add_argument("--reload", type=float, default=5)
+    parser.add_argument("--cpu-idle", type=float, default=50)
+    parser.add_argument("--cpu-bake", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--echo", action="store_true", help="print unreal.log output")
+    args, extra = parser.parse_known_args(argv)
+    script = next((a.split("=", 1)[1].strip('"') for a in extra if a.startswith("-ExecutePythonScript=")), None)
+    if not args.project and not args.uproject:
+        parser.error("a uproject or --project is required")
+
+    project = args.project or os.path.dirname(os.path.abspath(args.uproject))
+    name = os.path.splitext(os.path.basename(args.uproject))[0] if args.uproject else "FakeProject"
+    log = EditorLog(os.path.join(project, "Saved", "Logs", name + ".log"))
+    editor = FakeEditor(args, log, project)
+    # auto_runner's sleeps run on compressed time too
+    time.sleep = lambda secs: _sleep(editor.seconds(secs))
+
+    log.write("LogInit", f"Command Line: {' '.join(sys.argv[1:])}")
+    _sleep(editor.seconds(args.startup))
+    fake_unreal.install(project)
+    fake_unreal.echo = args.echo
+    fake_unreal.sink = lambda level, msg: log.write("LogPython", msg if level == "log" else f"{level.capitalize()}: {msg}")
+    fake_unreal.on_build = editor.build
+    editor.original_load_level = fake_unreal.LevelEditorSubsystem.load_level
+    fake_unreal.LevelEditorSubsystem.load_level = lambda subsystem, path: editor.load_level(subsystem, path)
+    fake_unreal.populate(args.actors)
+    if args.map:
+        log.write("LogLoad", f"Took {args.startup * 0.3:.2f} seconds to LoadMap({args.map})")
+    log.write("LogLoad", f"(Engine Initialization) Total time: {args.startup * 0.9:.2f} seconds")
+    log.write("LogLoad", f"Total Editor Startup Time, took={args.startup:.3f}")
+    os.environ.setdefault("GPUCF_PORT", str(args.port))
+    # Executed as __main__ like -ExecutePythonScript, which starts the listener
+    load_listener(script)
+
+    frame = 1.0 / args.fps
+    try:
+        while True:
+            start = time.perf_counter()
+            log.frame += 1
+            fake_unreal.tick(frame)
+            editor.tick()
+            # Busy for the editor's share of the frame, asleep for the rest
+            busy = frame * editor.cpu_share()
+            while time.perf_counter() - start < busy:
+                pass
+            _sleep(max(0.0, frame - (time.perf_counter() - start)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# Stand-in for the editor's `unreal` module so auto_runner.py can run outside Unreal.
+import copy
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+
+from sim import REPO_DIR
+
+_project_dir = None
+messages = []
+echo = False
+# Called with (level, msg) for every unreal.log*; the stand-in editor writes them to its log
+sink = None
+# Called with the quality when LevelEditorSubsystem.build_light_maps runs
+on_build = None
+# Level edits by kind (destroy_actor, set_mobility, set_visibility), the editor work of an isolation
+calls = {}
+
+def _record(level, msg):
+    messages.append((level, msg))
+    if echo:
+        print(msg)
+    if sink:
+        sink(level, msg)
+
+def _count(kind):
+    calls[kind] = calls.get(kind, 0) + 1
+
+def log(msg):
+    _record("log", msg)
+
+def log_warning(msg):
+    _record("warning", msg)
+
+def log_error(msg):
+    _record("error", msg)
+
+class SystemLibrary:
+    @staticmethod
+    def get_project_directory():
+        return _project_dir
+
+# ---------- LEVEL ----------
+# The level is a dict name -> actor, so enumeration costs O(actors) like the editor does.
+
+level = {}
+_loaded = {}
+
+class _Class:
+    def __init__(self, name):
+        self._name = name
+
+    def get_name(self):
+        return self._name
+
+class Vector:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x, self.y, self.z = x, y, z
+
+class Rotator:
+    def __init__(self, roll=0.0, pitch=0.0, yaw=0.0):
+        self.roll, self.pitch, self.yaw = roll, pitch, yaw
+
+class _Asset:
+    def __init__(self, path):
+        self._path = path
+
+    def get_path_name(self):
+        return self._path
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+class MaterialInterface(_Asset):
+    pass
+
+class ComponentMobility:
+    STATIC = 0
+    STATIONARY = 1
+    MOVABLE = 2
+
+class ActorComponent:
+    def get_class(self):
+        return _Class(type(self).__name__)
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+class SceneComponent(ActorComponent):
+    mobility = ComponentMobility.STATIC
+    visible = True
+
+    def set_mobility(self, new_mobility):
+        _count("set_mobility")
+        self.mobility = new_mobility
+
+    def set_visibility(self, new_visibility, propagate_to_children=False):
+        _count("set_visibility")
+        self.visible = new_visibility
+
+    def _reloaded(self):
+        # The component as saved: the flags go back to the class defaults
+        component = copy.copy(self)
+        component.__dict__.pop("mobility", None)
+        component.__dict__.pop("visible", None)
+        return component
+
+class StaticMesh(_Asset):
+    def __init__(self, light_map_resolution=64, triangles=2000, path="/Game/Meshes/SM_Cube.SM_Cube"):
+        super().__init__(path)
+        self.light_map_resolution = light_map_resolution
+        self.triangles = triangles
+
+    def get_num_triangles(self, lod_index):
+        return self.triangles
+
+class PrimitiveComponent(SceneComponent):
+    pass
+
+class StaticMeshComponent(PrimitiveComponent):
+    def __init__(self, static_mesh=None, overridden_light_map_res=0, materials=None):
+        self.static_mesh = static_mesh or StaticMesh()
+        self.override_light_map_res = overridden_light_map_res > 0
+        self.overridden_light_map_res = overridden_light_map_res
+        self.materials = materials or [MaterialInterface("/Game/Materials/M_Default.M_Default")]
+
+    def get_materials(self):
+        return list(self.materials)
+
+class LandscapeComponent(PrimitiveComponent):
+    pass
+
+class LightComponent(SceneComponent):
+    pass
+
+class DecalComponent(SceneComponent):
+    pass
+
+class SplineMeshComponent(StaticMeshComponent):
+    pass
+
+class Actor:
+    def __init__(self, name, label=None, components=(), location=None):
+        self._name = name
+        self._label = label or name
+        # Every actor has a root; a blueprint's may be a bare scene component
+        self._components = list(components) or [SceneComponent()]
+        self._location = location or Vector()
+        self._rotation = Rotator()
+        self._scale = Vector(1.0, 1.0, 1.0)
+
+    def get_name(self):
+        return self._name
+
+    def get_actor_label(self):
+        return self._label
+
+    def get_class(self):
+        return _Class(type(self).__name__)
+
+    def get_editor_property(self, name):
+        if name == "root_component":
+            return self._components[0]
+        return getattr(self, name)
+
+    def get_actor_location(self):
+        return self._location
+
+    def get_actor_rotation(self):
+        return self._rotation
+
+    def get_actor_scale3d(self):
+        return self._scale
+
+    def set_actor_location(self, location, sweep=False, teleport=False):
+        self._location = location
+        return True
+
+    def get_components_by_class(self, cls):
+        return [c for c in self._components if isinstance(c, cls)]
+
+    def in_build(self):
+        # Movable or invisible components have no static lighting
+        return any(c.visible and c.mobility != ComponentMobility.MOVABLE for c in self._components)
+
+    def _reloaded(self):
+        actor = copy.copy(self)
+        actor._components = [c._reloaded() for c in self._components]
+        return actor
+
+class StaticMeshActor(Actor):
+    def __init__(self, name, label=None, components=None, location=None):
+        super().__init__(name, label, components if components is not None else [StaticMeshComponent()], location)
+
+class LandscapeProxy(Actor):
+    pass
+
+class Landscape(LandscapeProxy):
+    pass
+
+class Light(Actor):
+    def __init__(self, name, label=None, components=None, location=None):
+        super().__init__(name, label, components or [LightComponent()], location)
+
+class DirectionalLight(Light):
+    pass
+
+class PointLight(Light):
+    pass
+
+class SpotLight(Light):
+    pass
+
+class SkyLight(Actor):
+    pass
+
+class CameraActor(Actor):
+    pass
+
+class DecalActor(Actor):
+    pass
+
+class TriggerBase(Actor):
+    pass
+
+class TriggerBox(TriggerBase):
+    pass
+
+class AmbientSound(Actor):
+    pass
+
+class EditorActorSubsystem:
+    def get_all_level_actors(self):
+        return list(level.values())
+
+    def destroy_actor(self, actor):
+        _count("destroy_actor")
+        return level.pop(actor.get_name(), None) is not None
+
+class LightingBuildQuality:
+    QUALITY_PREVIEW = 0
+    QUALITY_MEDIUM = 1
+    QUALITY_HIGH = 2
+    QUALITY_PRODUCTION = 3
+
+class LevelEditorSubsystem:
+    def load_level(self, path):
+        # Discards edits, like reloading the map from disk: new actor objects as saved
+        level.clear()
+        level.update((name, actor._reloaded()) for name, actor in _loaded.items())
+        return True
+
+    def build_light_maps(self, quality=LightingBuildQuality.QUALITY_PRODUCTION, with_reflection_captures=False):
+        if on_build:
+            on_build(quality)
+        return True
+
+_subsystems = {}
+
+def get_editor_subsystem(cls):
+    if cls not in _subsystems:
+        _subsystems[cls] = cls()
+    return _subsystems[cls]
+
+def in_build():
+    # Names of the actors a lighting build would bake
+    return {name for name, actor in level.items() if actor.in_build()}
+
+def populate(actor_count, prefix="Actor", others=0.0):
+    # Mostly static meshes with a few spline meshes and blueprints, like a typical level, plus
+    # a landscape. Lightmap resolution and triangle count vary per area of 100 actors (hero
+    # areas next to background props), so bake cost is unevenly spread over the level order.
+    # `others` is the share of actors without a lightmap: lights (with a sun and a sky light
+    # first), decals, cameras, triggers, sounds and movable props
+    level.clear()
+    rng = random.Random(actor_count)
+    kinds = random.Random(-actor_count)
+    for i in range(actor_count):
+        name = f"{prefix}_{i}"
+        if i % 100 == 0:
+            detail = rng.choices([0, 1, 2, 3], weights=[50, 30, 15, 5])[0]
+        mesh = StaticMesh(2 ** (5 + detail + rng.randint(0, 1)), int(rng.lognormvariate(7 + detail, 1)),
+                          f"/Game/Props/SM_Prop{i % 37}_D{detail}.SM_Prop{i % 37}_D{detail}")
+        location = Vector(i % 100 * 400.0, i // 100 * 400.0, 0.0)
+        other = others and i != 1 and (i in (0, 2) or kinds.random() < others)
+        if other:
+            actor = other_actor(name, i, kinds, mesh, location)
+        elif i == 1:
+            actor = Landscape(name, "Landscape", [LandscapeComponent() for _ in range(64)])
+        elif i % 50 == 0:
+            actor = Actor(name, f"BP_Prop{i}", [SceneComponent(), StaticMeshComponent(mesh)], location)
+        elif i % 20 == 0:
+            actor = Actor(name, f"Spline{i}", [SplineMeshComponent(mesh)], location)
+        else:
+            actor = StaticMeshActor(name, f"SM_Mesh{i}", [StaticMeshComponent(mesh)], location)
+        level[name] = actor
+    _loaded.clear()
+    _loaded.update(level)
+    return list(level)
+
+def other_actor(name, i, rng, mesh, location):
+    if i == 0:
+        return DirectionalLight(name, "Sun")
+    if i == 2:
+        return SkyLight(name, "SkyLight", [LightComponent()])
+    kind = rng.choices(["point", "spot", "decal", "camera", "trigger", "sound", "movable"],
+                       weights=[35, 15, 20, 5, 10, 5, 10])[0]
+    if kind == "point":
+        return PointLight(name, f"PointLight{i}", location=location)
+    if kind == "spot":
+        return SpotLight(name, f"SpotLight{i}", location=location)
+    if kind == "decal":
+        return DecalActor(name, f"Decal{i}", [DecalComponent()], location)
+    if kind == "camera":
+        return CameraActor(name, f"Camera{i}", location=location)
+    if kind == "trigger":
+        return TriggerBox(name, f"Trigger{i}", location=location)
+    if kind == "sound":
+        return AmbientSound(name, f"Sound{i}", location=location)
+    component = StaticMeshComponent(mesh)
+    component.mobility = ComponentMobility.MOVABLE
+    return StaticMeshActor(name, f"SM_Movable{i}", [component], location)
+
+# ---------- TICK ----------
+
+_tick_callbacks = {}
+
+def register_slate_post_tick_callback(fn):
+    handle = object()
+    _tick_callbacks[handle] = fn
+    return handle
+
+def unregister_slate_post_tick_callback(handle):
+    _tick_callbacks.pop(handle, None)
+
+def tick(delta_seconds):
+    for fn in list(_tick_callbacks.values()):
+        fn(delta_seconds)
+
+def install(project_dir=None):
+    global _project_dir
+    _project_dir = project_dir or tempfile.mkdtemp(prefix="fake_project_")
+    # auto_runner's crash history stays out of the user's real one
+    os.environ.setdefault("GPUCF_CRASH_HISTORY", os.path.join(_project_dir, "crash_history.sqlite"))
+    messages.clear()
+    sys.modules["unreal"] = sys.modules[__name__]
+    return _project_dir
+
+def load_auto_runner(project_dir=None):
+    # A fresh module per call so module-level paths follow the fake project directory
+    install(project_dir)
+    spec = importlib.util.spec_from_file_location("auto_runner", os.path.join(REPO_DIR, "auto_runner.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
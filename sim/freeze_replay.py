@@ -0,0 +1,219 @@
+# Replays editor resource traces through the freeze detector and the old single-sample rule.
+#
+#   python -m sim.freeze_replay --runs 200
+#   python -m sim.freeze_replay --set frozen_after=60 --set limit=4
+#   python -m sim.freeze_replay --trace metrics.jsonl
+#
+# Without --trace, synthetic bakes are generated with a known timeline, sampled every
+# --interval seconds like bake_cycle does:
+#   bake       responsive editor, then a build that lowers the CPU, then responsive again
+#   noisy      the same with bursts of editor CPU during the build (shader compiles, flushes)
+#   no_start   the click missed, the editor stays responsive
+#   hang       a build that stops dead: no CPU, I/O or log output
+# Reported per scenario: how often each rule re-clicked Build while a build was running
+# ("false restart"), how often it called a hang outside one ("false hang"), and the median
+# delay to the right call: idle for no_start, frozen for hang, finished after the build.
+#
+# --trace replays samples recorded by the watchdog ("metrics_trace" in the config) and
+# prints the state transitions per bake next to the state recorded live.
+# --set passes detector settings, so thresholds can be tuned against the same traces.
+import argparse
+import json
+import random
+from collections import defaultdict
+
+from freeze_detector import FreezeDetector, Sample, STARTING, BAKING, IDLE, FROZEN, FINISHED
+from sim.search_sim import percentile
+
+SCENARIOS = ["bake", "noisy", "no_start", "hang"]
+
+
+class LegacyRule:
+    # The check bake_cycle used before: one CPU sample against cpu_freeze_threshold and a
+    # wall-clock timer reset by every low sample
+    frozen_after = None
+
+    def __init__(self, low_cpu, idle_after):
+        self.low_cpu = low_cpu
+        self.idle_after = idle_after
+        self.timer = None
+
+    def rearm(self, t):
+        self.timer = t
+
+    def update(self, s):
+        if self.timer is None:
+            self.timer = s.t
+        if s.progress is not None:
+            return BAKING
+        if s.cpu < self.low_cpu:
+            self.timer = s.t
+            return BAKING
+        if s.t - self.timer > self.idle_after:
+            return IDLE
+        return STARTING
+
+
+def synthesize(kind, rng, interval, progress_lines):
+    # Returns (samples, timeline) with timeline["bake"] = (start, end) and optional "hang"
+    responsive = rng.uniform(45, 70)
+    baking = rng.uniform(8, 30)
+    start = rng.uniform(2, 10)
+    length = rng.uniform(60, 600)
+    timeline = {}
+    if kind != "no_start":
+        timeline["bake"] = (start, start + length)
+    if kind == "hang":
+        timeline["hang"] = start + rng.uniform(0.2, 0.8) * length
+    horizon = (start + length + 120) if kind != "no_start" else 180
+    if kind == "hang":
+        horizon = timeline["hang"] + 900
+
+    samples = []
+    io = 0
+    rss = 4 << 30
+    threads = 180
+    progress = None
+    burst = 0
+    # The first sample is taken before the click, like bake_cycle does
+    t = -interval
+    while t < horizon:
+        t += interval
+        in_bake = "bake" in timeline and timeline["bake"][0] <= t < timeline["bake"][1]
+        hung = "hang" in timeline and t >= timeline["hang"]
+        lines = 0
+        if hung:
+            cpu = rng.uniform(0.0, 0.4)
+        elif in_bake:
+            if kind == "noisy" and burst == 0 and rng.random() < 0.08:
+                burst = rng.randint(2, 6)
+            if burst:
+                burst -= 1
+                cpu = rng.gauss(responsive, 8)
+            else:
+                cpu = rng.gauss(baking, 4)
+            io += int(rng.uniform(0.2, 4) * (1 << 20) * interval)
+            rss += rng.randint(-1, 4) << 20
+            if progress_lines and rng.random() < interval / 10:
+                progress = min(99.0, round(100 * (t - timeline["bake"][0]) / length))
+                lines += 1
+        else:
+            cpu = rng.gauss(responsive, 8)
+            io += int(rng.uniform(0, 0.5) * (1 << 20) * interval)
+            if progress_lines and "bake" in timeline and t >= timeline["bake"][1] and progress != 100:
+                progress = 100.0
+                lines += 1
+            if rng.random() < 0.3:
+                lines += 1
+            if rng.random() < 0.05:
+                threads += rng.choice((-1, 1))
+        samples.append(Sample(t, max(0.0, cpu), io, threads, rss, lines, progress))
+    return samples, timeline
+
+
+def replay(rule, samples):
+    # (time, state) for every sample; a re-click rearms the rule like bake_cycle does
+    states = []
+    for s in samples:
+        state = rule.update(s)
+        states.append((s.t, state))
+        if state == IDLE:
+            rule.rearm(s.t)
+        if state in (FROZEN, FINISHED):
+            break
+    return states
+
+
+def score(states, timeline):
+    result = {"false_restart": False, "false_hang": False, "delay": None}
+    bake = timeline.get("bake")
+    hang = timeline.get("hang")
+    for t, state in states:
+        if state == IDLE and bake and bake[0] <= t < (hang or bake[1]):
+            result["false_restart"] = True
+        if state == FROZEN and (hang is None or t < hang):
+            result["false_hang"] = True
+        if result["delay"] is None:
+            if not bake and state == IDLE:
+                result["delay"] = t
+            elif hang is not None and state == FROZEN and t >= hang:
+                result["delay"] = t - hang
+            elif bake and hang is None and state == FINISHED:
+                result["delay"] = t - bake[1]
+    return result
+
+
+def parse_settings(pairs):
+    settings = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        settings[key] = float(value) if value.replace(".", "", 1).isdigit() else value
+    return settings
+
+
+def run_synthetic(args, settings):
+    print(f"{'scenario':>9} {'rule':>9} {'false restart':>14} {'false hang':>11} {'median delay s':>15} {'p95 s':>8} {'missed':>7}")
+    for kind in SCENARIOS:
+        results = defaultdict(list)
+        for run in range(args.runs):
+            rng = random.Random(f"{args.seed}-{kind}-{run}")
+            samples, timeline = synthesize(kind, rng, args.interval, progress_lines=run % 2 == 0)
+            for name, rule in (("legacy", LegacyRule(args.low_cpu, args.idle_after)),
+                               ("detector", FreezeDetector(low_cpu=args.low_cpu, idle_after=args.idle_after, **settings))):
+                results[name].append(score(replay(rule, samples), timeline))
+        for name, scored in results.items():
+            delays = sorted(r["delay"] for r in scored if r["delay"] is not None)
+            restarts = sum(r["false_restart"] for r in scored) / len(scored)
+            hangs = sum(r["false_hang"] for r in scored) / len(scored)
+            median = f"{percentile(delays, 50):.0f}" if delays else "-"
+            p95 = f"{percentile(delays, 95):.0f}" if delays else "-"
+            # no_start only expects idle; bake and noisy expect finished only with progress lines
+            expected = len(scored) if kind != "bake" and kind != "noisy" else (len(scored) + 1) // 2
+            print(f"{kind:>9} {name:>9} {restarts:>14.1%} {hangs:>11.1%} {median:>15} {p95:>8} {max(0, expected - len(delays)):>7}")
+
+
+def run_trace(args, settings):
+    bakes = defaultdict(list)
+    with open(args.trace) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            bakes[record.get("bake")].append(record)
+    for bake_id, records in bakes.items():
+        detector = FreezeDetector(low_cpu=args.low_cpu, idle_after=args.idle_after, **settings)
+        start = records[0]["t"]
+        print(f"bake {bake_id}: {len(records)} samples over {records[-1]['t'] - start:.0f}s")
+        previous = None
+        for record in records:
+            sample = Sample(*(record[field] for field in Sample._fields))
+            state = detector.update(sample)
+            if state == IDLE:
+                detector.rearm(sample.t)
+            if state != previous:
+                print(f"  {sample.t - start:7.1f}s  {state:<9} (live: {record.get('state')})")
+                previous = state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Freeze detector replay and detection benchmark.")
+    parser.add_argument("--trace", help="JSONL written by the watchdog's metrics_trace")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between samples (log_check_interval)")
+    parser.add_argument("--low-cpu", type=float, default=5, help="cpu_freeze_threshold")
+    parser.add_argument("--idle-after", type=float, default=60, help="max_bake_time_without_freeze")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="detector setting")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    settings = parse_settings(args.set)
+    settings.setdefault("frozen_after", 300.0)
+
+    if args.trace:
+        run_trace(args, settings)
+    else:
+        run_synthetic(args, settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Re-isolation after a map edit with and without the verdict cache.
+#
+#   python -m sim.incremental_sim --actors 2000 10000 --changed 1 5 20
+#   python -m sim.incremental_sim --actors 5000 --changed 5 --hidden-culprits 1 --trials 50
+#   python -m sim.incremental_sim --actors 2000 --changed 5 --combination 2
+#
+# Each trial isolates the stand-in level (sim.fake_unreal.populate) once, which fills
+# verdict_cache.jsonl, then moves --changed percent of the actors, makes --new-culprits of the
+# moved actors crash as well and isolates again after a reset: once from scratch and once with
+# the cache. --hidden-culprits makes unchanged actors start crashing too (a shared material
+# edited in place); only the spot check can find those. --combination adds unchanged actors
+# that crash only when all of them are baked, in both isolations. Reported per layout: bakes and
+# estimated bake hours (sim.search_sim costs) of both second runs, and how often each found
+# every culprit.
+import argparse
+import os
+import random
+import statistics
+
+from sim import fake_unreal
+from sim.ddmin_sim import all_of
+from sim.search_sim import any_culprit, bake_hours
+
+
+def isolate(ar, strategy, crashes, verdicts):
+    actors = list(fake_unreal.level.values())
+    state = ar.new_state()
+    state["strategy"] = strategy
+    ar.start_isolation(state, [a.get_name() for a in actors], [ar.actor_cost(a) for a in actors],
+                       [ar.actor_fingerprint(a) for a in actors], verdicts)
+    ar.save_state(state)
+    baked = []
+    chunk = state["last_chunk"] or ar.next_chunk(state)
+    while chunk:
+        crashed = crashes(chunk)
+        baked.append((chunk, crashed))
+        ar.record_verdict(state, crashed)
+        chunk = ar.next_chunk(state)
+        ar.save_state(state)
+    return baked, state
+
+
+def found(state, culprits, combination):
+    sets = [set(names) for names in state["crashing_sets"]]
+    return set(state["tested_bad"]) == culprits and (not combination or combination in sets)
+
+
+def reset(ar, forget=False):
+    files = [ar.STATE_FILE, ar.JOURNAL_FILE] + ([ar.VERDICT_CACHE_FILE] if forget else [])
+    for path in files:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bakes for a re-isolation with and without the verdict cache.")
+    parser.add_argument("--actors", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--changed", type=float, nargs="+", default=[1, 5, 20], help="percent of actors moved")
+    parser.add_argument("--culprits", type=int, default=1, help="culprits of the first isolation")
+    parser.add_argument("--new-culprits", type=int, default=1, help="moved actors that crash afterwards")
+    parser.add_argument("--hidden-culprits", type=int, default=0, help="unchanged actors that crash afterwards")
+    parser.add_argument("--combination", type=int, default=0, help="unchanged actors that crash only together")
+    parser.add_argument("--strategy", default="hwang")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    ar = fake_unreal.load_auto_runner()
+    print(f"{'actors':>7} {'changed':>8} {'full bakes':>11} {'cached':>7} {'full h':>7} {'cached h':>9} "
+          f"{'full found':>11} {'cached found':>13}")
+    for actor_count in args.actors:
+        for changed in args.changed:
+            rng = random.Random(args.seed)
+            rows = []
+            for _ in range(args.trials):
+                reset(ar, forget=True)
+                fake_unreal.populate(actor_count)
+                cost_of = {a.get_name(): ar.actor_cost(a) for a in fake_unreal.level.values()}
+                names = list(fake_unreal.level)
+                culprits = set(rng.sample(names, args.culprits))
+                combination = set(rng.sample([n for n in names if n not in culprits], args.combination))
+                crashes = lambda chunk: any_culprit(culprits)(chunk) or bool(combination) and all_of(combination)(chunk)
+                isolate(ar, args.strategy, crashes, ar.load_verdict_cache())
+
+                moved = rng.sample([n for n in names if n not in combination], max(1, round(actor_count * changed / 100)))
+                for name in moved:
+                    actor = fake_unreal.level[name]
+                    location = actor.get_actor_location()
+                    actor.set_actor_location(fake_unreal.Vector(location.x + 100.0, location.y, location.z))
+                unchanged = [n for n in names if n not in set(moved) and n not in culprits and n not in combination]
+                culprits |= set(rng.sample(moved, min(args.new_culprits, len(moved))))
+                culprits |= set(rng.sample(unchanged, args.hidden_culprits))
+
+                reset(ar)
+                verdicts = ar.load_verdict_cache()
+                full, full_state = isolate(ar, args.strategy, crashes, {})
+                reset(ar)
+                cached, cached_state = isolate(ar, args.strategy, crashes, verdicts)
+                rows.append((len(full), len(cached), bake_hours(full, cost_of), bake_hours(cached, cost_of),
+                             found(full_state, culprits, combination), found(cached_state, culprits, combination)))
+            mean = [statistics.mean(column) for column in zip(*rows)]
+            print(f"{actor_count:>7} {changed:>7g}% {mean[0]:>11.1f} {mean[1]:>7.1f} {mean[2]:>7.2f} {mean[3]:>9.2f} "
+                  f"{mean[4]:>11.0%} {mean[5]:>13.0%}")
+
+
+if __name__ == "__main__":
+    main()
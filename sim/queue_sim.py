@@ -0,0 +1,115 @@
+# Runs job_queue.run_queue() over several maps of one project against the stand-in editor.
+#
+#   python -m sim.queue_sim --maps 4 --actors 200
+#   python -m sim.queue_sim --maps 6 --actors 300 --restart --stop-after 5
+#
+# Every map becomes a queued job with its own state directory, set up like sim.watchdog_sim
+# (launcher as unreal_path, compressed time). Between jobs the running stand-in only loads
+# the next map; --restart kills it before every job to compare with one launch per map.
+# --stop-after N requests a stop after N bakes, then runs the queue again from the files
+# alone, as after a watchdog restart. Reported: jobs done, bakes, editor launches, simulated
+# minutes and whether every job's crashing_actors_list.txt names the culprits.
+import argparse
+import os
+import random
+import shutil
+import signal
+import sys
+import tempfile
+import time
+
+import watchdog_core as core
+import job_queue
+from sim.watchdog_sim import TIMED, EDITOR, make_project, make_launcher, expected_labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-map job queue against the stand-in editor.")
+    parser.add_argument("--maps", type=int, default=4)
+    parser.add_argument("--actors", type=int, default=200)
+    parser.add_argument("--culprits", type=int, default=1)
+    parser.add_argument("--strategy", default="hwang")
+    parser.add_argument("--speed", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--restart", action="store_true", help="kill the editor before every job")
+    parser.add_argument("--stop-after", type=int, default=0, metavar="N", help="stop after N bakes, then resume")
+    parser.add_argument("--keep", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    if args.verbose:
+        core.subscribe(lambda kind, data: print(data["msg"]) if kind == "log" else None)
+
+    rng = random.Random(args.seed)
+    root = tempfile.mkdtemp(prefix="queue_sim_")
+    uproject, umap, runner = make_project(root, args.strategy)
+    picks = [f"Actor_{i}" for i in rng.sample(range(args.actors), args.culprits)]
+    editor_args = [f"--actors {args.actors}", f"--speed {args.speed}", f"--seed {args.seed}",
+                   "--culprits " + ",".join(picks)] + [f"--{k.replace('_', '-')} {v}" for k, v in EDITOR.items()]
+    overrides = {key: value / args.speed for key, value in TIMED.items()}
+    overrides["log_check_interval"] = max(overrides["log_check_interval"], 0.25)
+    overrides.update(unreal_path=make_launcher(root, editor_args), project_path=uproject, map_name=umap,
+                     autorunner_path=runner, use_ipc=True, cpu_freeze_threshold=25, log_history_file="",
+                     timing_log="")
+    core.load_config(overrides=overrides)
+    core.editor.detach()
+    core.client = None
+
+    queue = os.path.join(root, "jobs.json")
+    maps = []
+    for i in range(args.maps):
+        path = os.path.join(os.path.dirname(umap), f"Map{i}.umap")
+        open(path, "w").close()
+        maps.append(job_queue.add_job(uproject, path, priority=rng.randrange(3), path=queue))
+
+    counts = {"bakes": 0, "launches": 0}
+
+    def count(kind, data):
+        if kind != "log":
+            return
+        if "Launching Unreal" in data["msg"]:
+            counts["launches"] += 1
+        elif "Build lighting started" in data["msg"]:
+            counts["bakes"] += 1
+            if args.stop_after and counts["bakes"] == args.stop_after:
+                core.request_stop()
+    core.subscribe(count)
+
+    switch_to = job_queue.switch_to
+    if args.restart:
+        def restarting(job, base):
+            core.kill_editor()
+            switch_to(job, base)
+        job_queue.switch_to = restarting
+
+    start = time.perf_counter()
+    runs = 0
+    try:
+        while True:
+            runs += 1
+            if job_queue.run_queue(queue):
+                break
+            print(f"stopped after {counts['bakes']} bakes: "
+                  + ", ".join(f"{j['id']} {j['status']}" for j in job_queue.load_jobs(queue)), flush=True)
+    finally:
+        elapsed = time.perf_counter() - start
+        job_queue.switch_to = switch_to
+        core.kill_editor()
+        core.close_crash_reporter()
+
+    expected = expected_labels(args.actors, picks)
+    correct = 0
+    for job in job_queue.load_jobs(queue):
+        path = os.path.join(job_queue.job_state_dir(job), "crashing_actors_list.txt")
+        lines = open(path, encoding="utf-8").read().splitlines() if os.path.exists(path) else []
+        correct += job["status"] == "done" and {line for line in lines[1:] if line} == expected
+    print(f"{args.maps} maps, {args.actors} actors, {'restart per job' if args.restart else 'editor reused'}, "
+          f"{runs} queue run(s)")
+    print(f"jobs ok {correct}/{args.maps}, bakes {counts['bakes']}, launches {counts['launches']}, "
+          f"sim {elapsed * args.speed / 60:.1f} min ({elapsed:.0f}s real)")
+    if not args.keep:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Search space and bakes per isolation with and without auto_runner's relevance filter.
+#
+#   python -m sim.relevance_sim --actors 2000 10000 --others 0.2 0.4
+#   python -m sim.relevance_sim --actors 10000 --others 0.3 --culprits 2 --strategy bisect --trials 50
+#
+# The stand-in level (sim.fake_unreal.populate) gets --others of its actors without a
+# lightmap: point, spot and sky lights, decals, cameras, triggers, sounds and movable props.
+# Culprits are picked among the actors with a lightmap. "all" isolates every actor of the
+# level, as get_relevant_actors did before the filter; "filtered" isolates what
+# classify_actors puts into "search". Reported per layout: actors searched and kept in every
+# bake, mean bakes and estimated bake hours (sim.search_sim costs) of both, how often each
+# found every culprit, and the time of one classify_actors pass over the stand-in level.
+import argparse
+import random
+import statistics
+import time
+
+from sim import fake_unreal
+from sim.search_sim import any_culprit, bake_hours, run_isolation
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bakes per isolation with and without the relevance filter.")
+    parser.add_argument("--actors", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--others", type=float, nargs="+", default=[0.2, 0.4], help="share of actors without a lightmap")
+    parser.add_argument("--culprits", type=int, default=1)
+    parser.add_argument("--strategy", default="hwang")
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    ar = fake_unreal.load_auto_runner()
+    print(f"{'actors':>7} {'others':>7} {'searched':>9} {'required':>9} {'all bakes':>10} {'filtered':>9} "
+          f"{'all h':>6} {'filt h':>7} {'all found':>10} {'filt found':>11} {'classify ms':>12}")
+    for actor_count in args.actors:
+        for others in args.others:
+            fake_unreal.populate(actor_count, others=others)
+            level = ar.LevelSnapshot()
+            start = time.perf_counter()
+            roles = ar.classify_actors(level)
+            classify = time.perf_counter() - start
+            searched = [a.get_name() for a in roles["search"]]
+            everything = list(level.names)
+            cost_of = {name: ar.actor_cost(actor) for name, actor in zip(level.names, level.actors)}
+
+            rng = random.Random(args.seed)
+            rows = []
+            for _ in range(args.trials):
+                culprits = set(rng.sample(searched, args.culprits))
+                result = []
+                for names in (everything, searched):
+                    baked = []
+                    bakes, state = run_isolation(ar, args.strategy, len(names), any_culprit(culprits),
+                                                 [cost_of[name] for name in names], baked, names=names)
+                    result += [bakes, bake_hours(baked, cost_of), set(state["tested_bad"]) == culprits]
+                rows.append(result)
+            mean = [statistics.mean(column) for column in zip(*rows)]
+            print(f"{actor_count:>7} {others:>7.0%} {len(searched):>9} {len(roles['required']):>9} {mean[0]:>10.1f} "
+                  f"{mean[3]:>9.1f} {mean[1]:>6.2f} {mean[4]:>7.2f} {mean[2]:>10.0%} {mean[5]:>11.0%} "
+                  f"{classify * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
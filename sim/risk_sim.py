@@ -0,0 +1,105 @@
+# Bakes until the first culprit is confirmed, with and without the cross-run crash history.
+#
+#   python -m sim.risk_sim --actors 2000 10000 --history 20 --trials 50
+#   python -m sim.risk_sim --actors 10000 --correlation 0 0.5 0.9
+#
+# Some actor features crash GPU Lightmass more often than others: with probability
+# --correlation a culprit is drawn from the actors having one of the --hazards features (by
+# prefix; sim.fake_unreal.populate names its meshes /Game/Props/SM_Prop<n>_D<detail>), else
+# from the whole level. --history earlier isolations of other stand-in levels are recorded
+# into a fresh crash history through record_crash_history, as a finished run does. Every trial
+# then isolates a new level twice: in level order, and ranked by that history. Reported per
+# layout: mean bakes until the first culprit is confirmed and for the whole isolation, the
+# reduction of the first, and the share of levels the history ranked at all.
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+
+from sim import fake_unreal
+from sim.search_sim import any_culprit
+
+
+def make_level(ar, actor_count):
+    fake_unreal.populate(actor_count)
+    actors = list(fake_unreal.level.values())
+    return ([a.get_name() for a in actors], [ar.actor_cost(a) for a in actors],
+            [ar.actor_features(a) for a in actors])
+
+
+def draw_culprits(rng, names, features, hazards, correlation, count):
+    hazardous = [name for name, feats in zip(names, features) if any(f.startswith(hazards) for f in feats)]
+    culprits = set()
+    while len(culprits) < count:
+        culprits.add(rng.choice(hazardous if hazardous and rng.random() < correlation else names))
+    return culprits
+
+
+def isolate(ar, strategy, names, costs, features, crashes):
+    # (bakes until the first culprit, bakes in all, state); features=None searches in level order
+    state = ar.new_state()
+    state["strategy"] = strategy
+    ar.start_isolation(state, list(names), costs, None, None, features)
+    bakes, first = 0, None
+    chunk = state["last_chunk"]
+    while chunk:
+        bakes += 1
+        ar.record_verdict(state, crashes(chunk))
+        if first is None and state["tested_bad"]:
+            first = bakes
+        chunk = ar.next_chunk(state)
+    return first or bakes, bakes, state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bakes to the first culprit with and without the crash history.")
+    parser.add_argument("--actors", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--correlation", type=float, nargs="+", default=[0.0, 0.5, 0.9],
+                        help="share of culprits drawn from hazardous actors")
+    parser.add_argument("--hazards", nargs="+", default=["mesh:/Game/Props/SM_Prop5_", "component:SplineMeshComponent"])
+    parser.add_argument("--culprits", type=int, default=1)
+    parser.add_argument("--history", type=int, default=20, help="earlier isolations in the history")
+    parser.add_argument("--strategy", default="hwang")
+    parser.add_argument("--trials", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="risk_sim_")
+    ar = fake_unreal.load_auto_runner(root)
+    hazards = tuple(args.hazards)
+    print(f"{'actors':>7} {'corr':>5} {'ranked':>7} {'first':>6} {'first ranked':>13} {'saved':>6} "
+          f"{'total':>6} {'total ranked':>13} {'found':>6}")
+    try:
+        for actor_count in args.actors:
+            for correlation in args.correlation:
+                rng = random.Random(args.seed)
+                ar.CRASH_HISTORY_FILE = os.path.join(root, f"history_{actor_count}_{correlation}.sqlite")
+                # Earlier runs over levels of other sizes, so their layouts differ from the trials'
+                for run in range(args.history):
+                    names, costs, features = make_level(ar, actor_count + 1 + run)
+                    state = ar.new_state()
+                    ar.start_isolation(state, names, costs, None, None, features)
+                    state["tested_bad"] = sorted(draw_culprits(rng, names, features, hazards, correlation,
+                                                               args.culprits))
+                    ar.record_crash_history(state)
+
+                rows = []
+                for trial in range(args.trials):
+                    names, costs, features = make_level(ar, actor_count + 1 + args.history + trial)
+                    culprits = draw_culprits(rng, names, features, hazards, correlation, args.culprits)
+                    crashes = any_culprit(culprits)
+                    plain = isolate(ar, args.strategy, names, costs, None, crashes)
+                    ranked = isolate(ar, args.strategy, names, costs, features, crashes)
+                    rows.append((plain[0], ranked[0], plain[1], ranked[1], bool(ranked[2]["risks"]),
+                                 set(plain[2]["tested_bad"]) == culprits and set(ranked[2]["tested_bad"]) == culprits))
+                mean = [statistics.mean(column) for column in zip(*rows)]
+                print(f"{actor_count:>7} {correlation:>5g} {mean[4]:>7.0%} {mean[0]:>6.1f} {mean[1]:>13.1f} "
+                      f"{1 - mean[1] / mean[0]:>6.0%} {mean[2]:>6.1f} {mean[3]:>13.1f} {mean[5]:>6.0%}", flush=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
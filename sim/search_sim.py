@@ -0,0 +1,151 @@
+# Offline bake-count simulator for the auto_runner search strategies.
+#
+#   python -m sim.search_sim --actors 1000 10000 40000 --culprits 1 2 5 --trials 200
+#   python -m sim.search_sim --actors 10000 --culprits 1 2 --bake-time
+#   python -m sim.search_sim --actors 10000 --culprits 1 2 --named 0.5
+#
+# Every chunk handed out by auto_runner counts as one editor bake cycle, including the
+# bake of the untouched level the watchdog runs right after initialization.
+#
+# --bake-time also estimates GPU Lightmass hours per isolation on the stand-in level's
+# per-actor costs (auto_runner.actor_cost over sim.fake_unreal.populate): BAKE_BASE seconds
+# per bake plus SECONDS_PER_COST per cost unit, half of that for a bake that crashes. It
+# runs every layout twice, chunks split by actor count and by estimated cost, and reports
+# the time the cost-weighted split saves, and the longest single bake (after the untouched
+# level) split by count > split by cost.
+#
+# --named SHARE lets that share of the crashing bakes name one of their culprits in the crash
+# log; record_verdict gets it as a suspect, as run_cycle does after the watchdog read the log.
+import argparse
+import random
+import statistics
+
+from sim import fake_unreal
+
+BAKE_BASE = 60
+SECONDS_PER_COST = 0.5
+
+
+def run_isolation(ar, strategy, actor_count, crashes, costs=None, baked=None, named=None, names=None):
+    # crashes(names) is the hidden oracle: does a bake with these actors crash?
+    # baked, if given, collects (chunk, crashed) per bake; named(names) lists the actors a
+    # crash log names; names replaces Actor_0 … Actor_<actor_count - 1>
+    state = ar.new_state()
+    state["strategy"] = strategy
+    names = names or [f"Actor_{i}" for i in range(actor_count)]
+    ar.start_isolation(state, names, costs)
+
+    bakes = 1
+    crashed = crashes(names)
+    chunk = names
+    while True:
+        if baked is not None:
+            baked.append((chunk, crashed))
+        ar.record_verdict(state, crashed, named(chunk) if named and crashed else None)
+        chunk = ar.next_chunk(state)
+        if chunk is None:
+            break
+        bakes += 1
+        crashed = crashes(chunk)
+    return bakes, state
+
+
+def level_costs(ar, actor_count):
+    fake_unreal.populate(actor_count)
+    return [ar.actor_cost(fake_unreal.level[f"Actor_{i}"]) for i in range(actor_count)]
+
+
+def bake_seconds(chunk, cost_of):
+    return BAKE_BASE + SECONDS_PER_COST * sum(cost_of[name] for name in chunk)
+
+
+def bake_hours(baked, cost_of):
+    return sum(bake_seconds(chunk, cost_of) / (2 if crashed else 1) for chunk, crashed in baked) / 3600
+
+
+def longest_bake(logs, cost_of):
+    # Mean over trials of the longest bake after the untouched level, in minutes
+    return statistics.mean(max([bake_seconds(chunk, cost_of) for chunk, _ in log[1:]] or [0]) for log in logs) / 60
+
+
+def any_culprit(culprits):
+    return lambda names: any(name in culprits for name in names)
+
+
+def named_culprit(rng, culprits, share):
+    return lambda names: [name for name in names if name in culprits][:1] if rng.random() < share else []
+
+
+def place_culprits(rng, actor_count, count, clustered):
+    if clustered:
+        first = rng.randrange(max(actor_count - count, 1))
+        picks = range(first, first + count)
+    else:
+        picks = rng.sample(range(actor_count), count)
+    return {f"Actor_{i}" for i in picks}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Expected bake cycles per isolation for each search strategy.")
+    parser.add_argument("--actors", type=int, nargs="+", default=[1000, 10000, 40000])
+    parser.add_argument("--culprits", type=int, nargs="+", default=[1, 2, 5])
+    parser.add_argument("--strategies", nargs="+", default=None)
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--expected-culprits", type=int, default=None,
+                        help="EXPECTED_CULPRITS used by the hwang strategy (default: auto_runner setting)")
+    parser.add_argument("--clustered", action="store_true", help="place culprits next to each other")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--bake-time", action="store_true", help="estimate bake hours, split by count vs by cost")
+    parser.add_argument("--named", type=float, default=0.0, help="share of crashes whose log names a culprit")
+    args = parser.parse_args(argv)
+
+    ar = fake_unreal.load_auto_runner()
+    if args.expected_culprits is not None:
+        ar.EXPECTED_CULPRITS = args.expected_culprits
+    # ddmin hunts a single minimal combination; see sim.ddmin_sim for interaction crashes
+    strategies = args.strategies or [name for name in ar.SEARCH_STRATEGIES if name != "ddmin"]
+
+    header = f"{'actors':>7} {'culprits':>8} {'strategy':>9} {'mean':>7} {'p95':>5} {'max':>5} {'vs bisect':>10} {'found':>6}"
+    if args.bake_time:
+        header += f" {'count h':>8} {'cost h':>7} {'saved':>6} {'longest m':>14}"
+    print(header)
+    for actor_count in args.actors:
+        costs = level_costs(ar, actor_count) if args.bake_time else None
+        cost_of = {f"Actor_{i}": c for i, c in enumerate(costs)} if costs else None
+        for culprit_count in args.culprits:
+            rng = random.Random(args.seed)
+            layouts = [place_culprits(rng, actor_count, culprit_count, args.clustered) for _ in range(args.trials)]
+            baseline = None
+            for strategy in strategies:
+                by_cost = [[] for _ in layouts]
+                named = random.Random(args.seed)
+                results = [(run_isolation(ar, strategy, actor_count, any_culprit(culprits), costs, log,
+                                          named_culprit(named, culprits, args.named)), culprits)
+                           for culprits, log in zip(layouts, by_cost)]
+                bakes = [b for (b, _), _ in results]
+                found = sum(set(state["tested_bad"]) == culprits for (_, state), culprits in results) / len(results)
+                mean = statistics.mean(bakes)
+                if strategy == "bisect":
+                    baseline = mean
+                change = f"{(mean - baseline) / baseline:+.0%}" if baseline else "-"
+                line = (f"{actor_count:>7} {culprit_count:>8} {strategy:>9} {mean:>7.1f} {percentile(bakes, 95):>5} "
+                        f"{max(bakes):>5} {change:>10} {found:>6.0%}")
+                if args.bake_time:
+                    by_count = [[] for _ in layouts]
+                    for culprits, log in zip(layouts, by_count):
+                        run_isolation(ar, strategy, actor_count, any_culprit(culprits), None, log,
+                                      named_culprit(named, culprits, args.named))
+                    count_h = statistics.mean(bake_hours(log, cost_of) for log in by_count)
+                    cost_h = statistics.mean(bake_hours(log, cost_of) for log in by_cost)
+                    longest = f"{longest_bake(by_count, cost_of):.1f} > {longest_bake(by_cost, cost_of):.1f}"
+                    line += f" {count_h:>8.2f} {cost_h:>7.2f} {(count_h - cost_h) / count_h:>6.0%} {longest:>14}"
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
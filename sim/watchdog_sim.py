@@ -0,0 +1,244 @@
+# Runs watchdog_core.watchdog() end to end against the stand-in editor (sim.fake_editor).
+#
+#   python -m sim.watchdog_sim --actors 500 --culprits 1 --trials 3
+#   python -m sim.watchdog_sim --actors 2000 --culprits 2 --hang-share 0.5 --strategies bisect hwang
+#   python -m sim.watchdog_sim --actors 500 --miss-rate 0.3 --speed 10 --verbose --trace sim_metrics.jsonl
+#   python -m sim.watchdog_sim --actors 2000 --culprits 3 --workers 1 2 4 --strategies kway --cpu-idle 0 --cpu-bake 0
+#   python -m sim.watchdog_sim --actors 500 --culprits 2 --hang-share 0.5 --phases --timing sim_timing.jsonl
+#   python -m sim.watchdog_sim --actors 300 --culprits 2 --hang-share 0.5 --miss-rate 0.2 --delays static adaptive
+#   python -m sim.watchdog_sim --actors 500 --culprits 2 --named-share 0 1
+#   python -m sim.watchdog_sim --actors 2000 --culprits 1 --isolation destroy exclude --phases
+#
+# Every trial gets a fresh project with a level of --actors actors and hidden culprits, and a
+# launcher script as "unreal_path", so the watchdog starts, drives, kills and restarts the
+# stand-in exactly like UnrealEditor: listener handshake, auto_runner over IPC, build,
+# log and process monitoring, crash and hang handling, map reload. Time is compressed by
+# --speed: the stand-in divides its durations by it, and every time setting in the config
+# below is divided by it too, so the run behaves like a real one at --speed times the pace.
+#
+# --workers N runs the worker pool (worker_pool.py) with N project copies and N stand-ins.
+# Every stand-in burns --cpu-idle percent of a core, so with more stand-ins than cores keep
+# both CPU settings at 0: bakes then end on their log lines and hangs on the stall timeout.
+#
+# Reported per strategy (means over trials):
+#   bakes      bakes per isolation, from the state file
+#   launches   editor starts
+#   sim min    wall-clock of the isolation in editor minutes (real seconds * speed)
+#   cpu s      CPU time of the watchdog: this process plus the pool's workers, stand-ins excluded
+#   cpu ms/bk  of that per bake
+#   idle min   bake-phase time beyond the stand-in's own bake length (beyond half of it for
+#              a hang, the mean point where one starts): waiting for a stall limit or a retry
+#   found      trials whose crashing_actors_list.txt names exactly the culprits
+# --delays compares the configured waits ("static") with learned ones (adaptive_delays); the
+# learning starts from an empty timing_stats.json in every trial.
+# --named-share makes that share of the stand-in's crashes name the culprit in the log and a
+# crash report, which the watchdog passes on to auto_runner as a suspect (crash_log.py).
+# --isolation compares auto_runner's ISOLATION_MODE settings: "destroy" reloads the map after
+# every passing bake, "exclude" only after a crash.
+# --phases adds p50/p95 per cycle phase (cycle_timing.py) over all trials, in editor seconds.
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import signal
+import stat
+import sys
+import tempfile
+import time
+
+import psutil
+
+import watchdog_core as core
+import worker_pool
+from cycle_timing import PHASES, percentile
+from sim import REPO_DIR, fake_unreal
+
+# Editor-seconds settings in the spirit of a real project, divided by --speed per run
+TIMED = {
+    "initial_delay": 180,
+    "autorunner_delay": 60,
+    "post_reload_delay": 60,
+    "log_check_interval": 2,
+    "max_bake_time_without_freeze": 60,
+    "bake_stall_timeout": 120,
+    "crash_log_grace": 10,
+    "ready_grace": 2,
+    "ipc_timeout": 600,
+}
+EDITOR = {"startup": 40, "bake_base": 20, "bake_per_actor": 0.02, "reload": 5}
+
+
+def make_project(root, strategy, isolation=None):
+    project = os.path.join(root, "FakeProject")
+    os.makedirs(os.path.join(project, "Content", "Maps"))
+    uproject = os.path.join(project, "FakeProject.uproject")
+    open(uproject, "w").write("{}")
+    open(os.path.join(project, "Content", "Maps", "Fake.umap"), "w").close()
+    # The strategy and isolation are constants in auto_runner.py, so every run gets its own copy
+    with open(os.path.join(REPO_DIR, "auto_runner.py"), encoding="utf-8") as f:
+        source = re.sub(r'^SEARCH_STRATEGY = .*$', f'SEARCH_STRATEGY = "{strategy}"', f.read(), count=1, flags=re.M)
+    if isolation:
+        source = re.sub(r'^ISOLATION_MODE = .*$', f'ISOLATION_MODE = "{isolation}"', source, count=1, flags=re.M)
+    runner = os.path.join(root, "auto_runner.py")
+    open(runner, "w", encoding="utf-8").write(source)
+    # The crash history is shared by the stand-in editors and a pool's scheduler, not by sim runs
+    os.environ["GPUCF_CRASH_HISTORY"] = os.path.join(root, "crash_history.sqlite")
+    return uproject, os.path.join(project, "Content", "Maps", "Fake.umap"), runner
+
+
+def make_launcher(root, editor_args):
+    # What the watchdog runs as "unreal_path"; exec keeps the PID the watchdog tracks, and the
+    # interpreter runs through a link named like the editor so the process name matches too
+    os.makedirs(os.path.join(root, "bin"))
+    binary = os.path.join(root, "bin", "UnrealEditor")
+    os.symlink(sys.executable, binary)
+    path = os.path.join(root, "UnrealEditor")
+    with open(path, "w") as f:
+        f.write("#!/bin/sh\n")
+        f.write(f'PYTHONPATH="{REPO_DIR}" exec "{binary}" -m sim.fake_editor "$@" {" ".join(editor_args)}\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def expected_labels(actor_count, names):
+    fake_unreal.populate(actor_count)
+    return {fake_unreal.level[name].get_actor_label() for name in names}
+
+
+def found_labels(uproject):
+    path = os.path.join(os.path.dirname(uproject), "Saved", "GPUCrashFinder", "crashing_actors_list.txt")
+    if not os.path.exists(path):
+        return None
+    lines = open(path, encoding="utf-8").read().splitlines()
+    return {line for line in lines[1:] if line and not line.endswith(":") and " + " not in line}
+
+
+def idle_seconds(path, speed):
+    # Editor seconds spent in bake phases beyond what the stand-in itself needed
+    idle = 0.0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["event"] != "cycle" or "bake" not in record["phases"] or not record["chunk"]:
+                continue
+            length = EDITOR["bake_base"] + EDITOR["bake_per_actor"] * record["chunk"]
+            worked = length if record["verdict"] == "passed" else length / 2
+            idle += max(0.0, record["phases"]["bake"] * speed - worked)
+    return idle
+
+
+def run_trial(args, strategy, workers, seed, adaptive=False, named=0.0, isolation=None):
+    rng = random.Random(seed)
+    root = tempfile.mkdtemp(prefix="watchdog_sim_")
+    uproject, umap, runner = make_project(root, strategy, isolation)
+    picks = [f"Actor_{i}" for i in rng.sample(range(args.actors), args.culprits)]
+    hangs = picks[:round(len(picks) * args.hang_share)]
+    culprits = picks[len(hangs):]
+    editor_args = [f"--actors {args.actors}", f"--speed {args.speed}", f"--miss-rate {args.miss_rate}", f"--named-share {named}",
+                   f"--seed {seed}", f"--cpu-idle {args.cpu_idle}", f"--cpu-bake {args.cpu_bake}"]
+    editor_args += [f"--{k.replace('_', '-')} {v}" for k, v in EDITOR.items()]
+    if culprits:
+        editor_args.append("--culprits " + ",".join(culprits))
+    if hangs:
+        editor_args.append("--hangs " + ",".join(hangs))
+
+    overrides = {key: value / args.speed for key, value in TIMED.items()}
+    # CPU time is counted in 10 ms ticks, so shorter sample windows make cpu_percent jump in
+    # steps of 10% or more and a responsive editor can read like a running build
+    overrides["log_check_interval"] = max(overrides["log_check_interval"], 0.25)
+    overrides.update(unreal_path=make_launcher(root, editor_args), project_path=uproject, map_name=umap,
+                     autorunner_path=runner, use_ipc=True, cpu_freeze_threshold=max((args.cpu_idle + args.cpu_bake) / 2, 1),
+                     metrics_trace=args.trace or "", timing_log=os.path.join(root, "timing.jsonl"), log_history_file="",
+                     workers=workers, worker_dir=os.path.join(root, "workers"), adaptive_delays=adaptive)
+    core.load_config(overrides=overrides)
+    core.editor.detach()
+    core.client = None
+    core.stop_requested = False
+
+    launches = []
+    counter = core.subscribe(lambda kind, data: launches.append(1) if kind == "log" and "Launching Unreal" in data["msg"] else None)
+    me = psutil.Process()
+    cpu_before = sum(me.cpu_times()[:2])
+    worker_pool.run_pool.worker_cpu = 0.0
+    start = time.perf_counter()
+    try:
+        finished = core.watchdog()
+    finally:
+        elapsed = time.perf_counter() - start
+        cpu = sum(me.cpu_times()[:2]) - cpu_before + worker_pool.run_pool.worker_cpu
+        core.unsubscribe(counter)
+        core.kill_editor()
+        core.close_crash_reporter()
+        if core.client:
+            core.client.close()
+            core.client = None
+    bakes = (core.read_isolation_summary() or {}).get("bakes", 0)
+    idle = idle_seconds(os.path.join(root, "timing.jsonl"), args.speed)
+    if args.timing:
+        with open(os.path.join(root, "timing.jsonl"), encoding="utf-8") as src, open(args.timing, "a") as dst:
+            dst.write(src.read())
+    found = found_labels(uproject)
+    correct = finished and found == expected_labels(args.actors, picks)
+    if not args.keep:
+        shutil.rmtree(root, ignore_errors=True)
+    return dict(bakes=bakes, launches=len(launches), sim=elapsed * args.speed, cpu=cpu, idle=idle, correct=correct,
+                phases={phase: list(values) for phase, values in core.timing.durations.items()})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end watchdog runs against the stand-in editor.")
+    parser.add_argument("--actors", type=int, default=500)
+    parser.add_argument("--culprits", type=int, default=1)
+    parser.add_argument("--hang-share", type=float, default=0.0, help="share of culprits that hang instead of crash")
+    parser.add_argument("--miss-rate", type=float, default=0.0, help="share of builds the editor ignores")
+    parser.add_argument("--strategies", nargs="+", default=["hwang"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="pool sizes to compare (1: one editor)")
+    parser.add_argument("--trials", type=int, default=3)
+    parser.add_argument("--speed", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cpu-idle", type=float, default=50, help="stand-in CPU percent while responsive")
+    parser.add_argument("--cpu-bake", type=float, default=10, help="stand-in CPU percent while baking")
+    parser.add_argument("--keep", action="store_true", help="keep the trial projects")
+    parser.add_argument("--trace", help="append the watchdog's metrics_trace here (for sim.freeze_replay --trace)")
+    parser.add_argument("--timing", help="append the watchdog's timing_log here")
+    parser.add_argument("--phases", action="store_true", help="print p50/p95 per cycle phase")
+    parser.add_argument("--delays", nargs="+", choices=("static", "adaptive"), default=["static"],
+                        help="configured waits, learned waits, or both")
+    parser.add_argument("--named-share", type=float, nargs="+", default=[0.0],
+                        help="shares of crashes whose log names the culprit")
+    parser.add_argument("--isolation", nargs="+", choices=("destroy", "exclude"), default=["exclude"],
+                        help="auto_runner ISOLATION_MODE settings to compare")
+    parser.add_argument("--verbose", action="store_true", help="print the watchdog log")
+    args = parser.parse_args(argv)
+    # The finally blocks kill the stand-in; SIGTERM (timeout, CI) must run them too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    if args.verbose:
+        core.subscribe(lambda kind, data: print(data["msg"]) if kind == "log" else None)
+
+    print(f"{args.actors} actors, {args.culprits} culprit(s), {args.hang_share:.0%} hanging, "
+          f"{args.miss_rate:.0%} missed builds, speed x{args.speed:g}")
+    print(f"{'strategy':>9} {'workers':>7} {'delays':>8} {'named':>6} {'isolation':>9} {'bakes':>6} {'launches':>9} {'sim min':>8} {'idle min':>9} "
+          f"{'real s':>7} {'cpu s':>6} {'cpu ms/bk':>10} {'found':>6}")
+    for strategy in args.strategies:
+        for workers, delays, named, isolation in ((w, d, n, i) for w in args.workers for d in args.delays
+                                                  for n in args.named_share for i in args.isolation):
+            results = [run_trial(args, strategy, workers, args.seed * 1000 + trial, delays == "adaptive", named, isolation)
+                       for trial in range(args.trials)]
+            mean = {key: sum(r[key] for r in results) / len(results) for key in ("bakes", "launches", "sim", "cpu", "idle")}
+            print(f"{strategy:>9} {workers:>7} {delays:>8} {named:>6.0%} {isolation:>9} {mean['bakes']:>6.1f} {mean['launches']:>9.1f} "
+                  f"{mean['sim'] / 60:>8.1f} {mean['idle'] / 60:>9.1f} {mean['sim'] / args.speed:>7.1f} {mean['cpu']:>6.2f} "
+                  f"{mean['cpu'] / max(mean['bakes'], 1) * 1000:>10.1f} {sum(r['correct'] for r in results):>3}/{len(results)}",
+                  flush=True)
+            if args.phases:
+                phases = {}
+                for r in results:
+                    for phase, values in r["phases"].items():
+                        phases.setdefault(phase, []).extend(v * args.speed for v in values)
+                print("          " + ", ".join(f"{phase} {percentile(values, 50):.0f}/{percentile(values, 95):.0f}s"
+                                            for phase, values in sorted(phases.items(), key=lambda p: PHASES.index(p[0]))),
+                      flush=True)
+
+if __name__ == "__main__":
+    main()
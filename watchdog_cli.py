@@ -0,0 +1,135 @@
+import os, sys, time, signal, argparse, json
+import watchdog_core as core
+import job_queue
+
+# Headless watchdog for build servers: the same cycle as the window, logging to the console.
+#
+#   python -m watchdog_cli run --config watchdog_config.json
+#   python -m watchdog_cli run --config ci.json --set use_ipc=true --set initial_delay=120
+#   python -m watchdog_cli status --config watchdog_config.json
+#   python -m watchdog_cli reset --config watchdog_config.json
+#   python -m watchdog_cli run --config watchdog_config.json --set workers=4
+#   python -m watchdog_cli queue add --map D:/Game/Content/Maps/Harbor.umap --priority 5
+#   python -m watchdog_cli queue list
+#   python -m watchdog_cli queue run --config watchdog_config.json
+#
+# Ctrl+C (or SIGTERM) stops after the current cycle like the Stop button; a second Ctrl+C
+# exits at once and leaves the editor running. `run` exits with 0 once every chunk is tested
+# and 3 when it was stopped before that; `queue run` likewise once the job queue is empty.
+# `worker` is the process worker_pool starts per
+# project copy; it talks JSON lines on stdin/stdout and is not meant to be run by hand.
+
+def console(kind, data):
+    if kind == "log":
+        if console.countdown:
+            sys.stdout.write("\r\033[K")
+            console.countdown = False
+        print(time.strftime("%H:%M:%S ") + data["msg"], flush=True)
+    elif kind == "countdown" and sys.stdout.isatty():
+        # Redrawn in place; redirected output only gets the log lines
+        sys.stdout.write("\r\033[K" + data["text"])
+        sys.stdout.flush()
+        console.countdown = bool(data["text"])
+    elif kind == "status":
+        print(time.strftime("%H:%M:%S ") + data["text"], flush=True)
+    elif kind == "chunks":
+        print(time.strftime("%H:%M:%S ") + data["text"], flush=True)
+        if data["faulty"] is not None:
+            print(data["faulty"], flush=True)
+console.countdown = False
+
+def parse_value(value):
+    # --set key=value takes JSON (numbers, true/false, lists) and falls back to a plain string
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def handle_stop(signum, frame):
+    if core.stop_requested:
+        raise KeyboardInterrupt
+    core.log("🛑 Stop requested – finishing the current cycle (press Ctrl+C again to quit now).")
+    core.request_stop()
+
+def queue_command(args):
+    if args.action == "add":
+        if not args.map:
+            print("queue add needs --map", file=sys.stderr)
+            return 2
+        overrides = {}
+        for pair in args.job_set:
+            key, _, value = pair.partition("=")
+            overrides[key] = parse_value(value)
+        job = job_queue.add_job(args.project or core.config["project_path"], args.map, args.priority, overrides, args.queue)
+        print(f"Added job {job['id']}")
+    elif args.action == "remove":
+        if not job_queue.remove_job(args.job, args.queue):
+            print(f"No job {args.job}", file=sys.stderr)
+            return 1
+    else:
+        jobs = job_queue.load_jobs(args.queue)
+        for job in sorted(jobs, key=lambda j: (-j["priority"], j["added"])):
+            print(f"{job['id']:<24} {job['priority']:>4} {job['status']:<8} {os.path.basename(job['project_path'])}: "
+                  f"{os.path.basename(job['map_name'])} – {job_queue.job_progress(job)}")
+        if not jobs:
+            print("Job queue empty")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GPU Lightmass Watchdog without a window.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, text in (("run", "run the watchdog cycle until every chunk is tested"),
+                       ("status", "print the isolation progress"),
+                       ("reset", "delete the isolation progress"),
+                       ("worker", "one editor of a worker pool (started by the watchdog)"),
+                       ("queue", "add, list, remove or run isolation jobs for several maps")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("--config", help="config JSON (default: watchdog_config.json next to the watchdog)")
+        p.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="override one config value")
+        if name == "reset":
+            p.add_argument("--forget", action="store_true", help="also delete the verdicts of earlier runs")
+        if name == "queue":
+            p.add_argument("action", choices=("add", "list", "remove", "run"))
+            p.add_argument("job", nargs="?", help="job id for remove")
+            p.add_argument("--queue", help="queue file (default: watchdog_jobs.json next to the watchdog)")
+            p.add_argument("--project", help="uproject for add (default: project_path from the config)")
+            p.add_argument("--map", help="map file for add")
+            p.add_argument("--priority", type=int, default=0, help="higher runs first")
+            p.add_argument("--job-set", action="append", default=[], metavar="KEY=VALUE",
+                           help="config override stored with the job on add")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    for pair in args.set:
+        key, _, value = pair.partition("=")
+        overrides[key] = parse_value(value)
+    core.init(args.config, overrides)
+    if args.command == "worker":
+        # Only pool workers need it; watchdog() loads it itself for a pool run
+        import worker_pool
+        return worker_pool.run_worker()
+    core.subscribe(console)
+    if args.command == "run" or args.command == "queue" and args.action == "run":
+        core.open_history()
+
+    if args.command == "status":
+        core.refresh_chunk_info()
+        return 0
+    if args.command == "reset":
+        core.reset_isolation_progress(args.forget)
+        return 0
+    if args.command == "queue" and args.action != "run":
+        return queue_command(args)
+
+    signal.signal(signal.SIGINT, handle_stop)
+    signal.signal(signal.SIGTERM, handle_stop)
+    try:
+        if args.command == "queue":
+            return 0 if job_queue.run_queue(args.queue) else 3
+        return 0 if core.watchdog() else 3
+    except KeyboardInterrupt:
+        core.log("🛑 Interrupted – the editor is left running.")
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
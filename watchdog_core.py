@@ -0,0 +1,905 @@
+import os, sys, json, math, time
+from log_tailer import LogTailer
+from log_rules import RuleEngine
+from process_tracker import ProcessTracker, find_processes, CRASH_REPORTER_NAME
+from freeze_detector import FreezeDetector, Sample, IDLE, FROZEN, FINISHED
+from ipc_client import EditorClient, EditorError, read_listener
+from cycle_timing import CycleTimer, DelayStats, serve as serve_metrics
+import crash_log
+
+# The watchdog cycle without any window: launch, autorunner, bake monitor, reload, status.
+# Frontends (watchdog.py for the tkinter window, watchdog_cli.py for headless runs) call
+# load_config() and watchdog(), and follow what happens through subscribe().
+
+# ---------- RESOURCE PATH FOR BUNDLED FILES ----------
+def resource_path(relative_path):
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+exe_dir = os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__))
+config_path = os.path.join(exe_dir, "watchdog_config.json")
+autorunner_bundle_path = resource_path("auto_runner.py")
+listener_path = os.path.join(exe_dir, "editor_listener.py")
+
+# ---------- INITIAL CONFIG ----------
+default_config = {
+    "unreal_path":         "",
+    "project_path":        "",
+    "map_name":            "",
+    "autorunner_path":     os.path.join(exe_dir, "auto_runner.py"),
+    "click_pos":           (0, 0),
+    "console_pos":         (0, 0),
+    "initial_delay":       30,
+    "autorunner_delay":    15,
+    "post_reload_delay":   5,
+    "log_check_interval":  10,
+    "cpu_freeze_threshold": 5,
+    "max_bake_time_without_freeze": 60,
+    "log_poll_min":        0.05,
+    "log_poll_max":        0.5,
+    "bake_stall_timeout":  300,
+    "crash_log_scan_mb":   64,
+    "crash_log_grace":     10,
+    "log_rules":           None,
+    "freeze_detector":     None,
+    "metrics_trace":       "",
+    "timing_log":          "watchdog_timing.jsonl",
+    "metrics_port":        0,
+    "adaptive_delays":     True,
+    "delay_margin":        2.0,
+    "delay_min_samples":   5,
+    "ready_grace":         2,
+    "use_ipc":             True,
+    "ipc_timeout":         600,
+    "ipc_build":           True,
+    "log_view_lines":      5000,
+    "log_view_fps":        20,
+    "log_history_file":    "watchdog.log",
+    "log_history_mb":      20,
+    "log_history_backups": 5,
+    "editor_args":         [],
+    "scan_processes":      True,
+    "workers":             1,
+    "worker_dir":          "",
+    "worker_projects":     [],
+    "worker_args":         [],
+    "state_dir":           ""
+}
+
+# ---------- WRITE EMBEDDED FILES TO LOCAL DIR IF MISSING ----------
+def install_bundled_files():
+    import shutil
+    if not os.path.exists(config_path):
+        try:
+            shutil.copy(resource_path("watchdog_config.json"), config_path)
+        except Exception:
+            pass
+
+    if not os.path.exists(default_config["autorunner_path"]):
+        try:
+            shutil.copy(autorunner_bundle_path, default_config["autorunner_path"])
+        except Exception:
+            pass
+
+    if not os.path.exists(listener_path):
+        try:
+            shutil.copy(resource_path("editor_listener.py"), listener_path)
+        except Exception:
+            pass
+
+# ---------- LOAD CONFIG ----------
+config = default_config.copy()
+
+def load_config(path=None, overrides=None):
+    # Refills `config` in place, so frontends holding a reference see the loaded values
+    global config_path
+    if path:
+        config_path = os.path.abspath(path)
+    config.clear()
+    config.update(default_config)
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, "r") as f:
+                # Keys no version uses any more are dropped, so the next save_cfg() cleans the file
+                config.update((k, v) for k, v in json.load(f).items() if k in default_config)
+        except Exception:
+            pass
+    config["autorunner_path"] = os.path.join(exe_dir, "auto_runner.py")
+    config.update(overrides or {})
+    editor.child_interval = config["log_check_interval"]
+    return config
+
+def init(path=None, overrides=None):
+    # What a frontend runs first; importing this module reads and writes no files
+    install_bundled_files()
+    return load_config(path, overrides)
+
+def save_cfg(): open(config_path, "w").write(json.dumps(config, indent=2))
+
+# ---------- FLAGS ----------
+stop_requested = False
+watchdog_running = False
+editor = ProcessTracker(child_interval=config["log_check_interval"])
+# Command channel to editor_listener.py in an editor we launched; None means typing into the console
+client = None
+ipc_token = os.urandom(16).hex()
+# Phase durations of every cycle (cycle_timing.py), reset by each watchdog() run
+timing = CycleTimer()
+
+# ---------- EVENTS ----------
+# Subscribers are called as fn(kind, data) on the watchdog's thread:
+#   "log"        msg, tag
+#   "countdown"  text ("" clears it)
+#   "status"     text, running
+#   "chunks"     text, faulty (None until the isolation has finished)
+subscribers = []
+
+def subscribe(fn):
+    subscribers.append(fn)
+    return fn
+
+def unsubscribe(fn):
+    if fn in subscribers:
+        subscribers.remove(fn)
+
+def emit(kind, **data):
+    for fn in list(subscribers):
+        try:
+            fn(kind, data)
+        except Exception as e:
+            # A broken frontend must not take the cycle down with it
+            print(f"⚠️ {kind} subscriber failed: {e}", file=sys.stderr)
+
+def open_history():
+    # Every log line goes to log_history_file (next to the watchdog unless absolute), rotated
+    # at log_history_mb; the window only keeps the newest log_view_lines
+    if not config["log_history_file"]:
+        return None
+    import logging
+    from logging.handlers import RotatingFileHandler
+    handler = RotatingFileHandler(os.path.join(exe_dir, config["log_history_file"]),
+                                  maxBytes=int(config["log_history_mb"] * (1 << 20)),
+                                  backupCount=config["log_history_backups"], encoding="utf-8", delay=True)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+
+    def write(kind, data):
+        if kind == "log":
+            handler.handle(logging.makeLogRecord({"msg": data["msg"]}))
+    subscribe(write)
+    return handler
+
+# ---------- UTILITIES ----------
+
+def log(msg, tag=None):
+    emit("log", msg=msg, tag=tag)
+
+def show_countdown(text):
+    emit("countdown", text=text)
+
+def gui_input():
+    # Console typing and clicks need pyautogui and a desktop; headless runs over IPC don't
+    import pyautogui
+    pyautogui.FAILSAFE = False
+    return pyautogui
+
+def wait_for(msg: str, secs: float, ready, abort=None, poll=0.1):
+    # Counts down like countdown() but returns as soon as ready() holds.
+    # Returns "ready", "timeout" or "aborted"; `secs` is only an upper bound
+    deadline = time.monotonic() + secs
+    result = "timeout"
+    shown = None
+    while True:
+        if ready():
+            result = "ready"
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if math.ceil(remaining) != shown:
+            shown = math.ceil(remaining)
+            show_countdown(f"{msg}… {shown}s")
+        if abort is None:
+            time.sleep(min(poll, remaining))
+        elif abort.wait(min(poll, remaining)):
+            result = "aborted"
+            break
+
+    # Clear countdown after it's done
+    show_countdown("")
+    return result
+
+def countdown(msg: str, secs: int, abort=None):
+    # Returns False when `abort` fired before the time was up
+    return wait_for(msg, secs, lambda: False, abort) != "aborted"
+
+def to_unreal(path: str) -> str:
+    p = path.replace("\\", "/")
+    if p.endswith(".umap"):
+        p = p[:-5]
+    if "/Content/" in p:
+        p = "/Game/" + p.split("/Content/")[-1]
+    return p if p.startswith("/Game/") else p
+
+def close_crash_reporter():
+    # Reporters the editor started are tracked; scan only if one slipped past the watcher
+    reporters = editor.processes(CRASH_REPORTER_NAME)
+    if not reporters and not editor.is_alive() and config["scan_processes"]:
+        reporters = find_processes(CRASH_REPORTER_NAME)
+    for proc in reporters:
+        log("🛑 Closing CrashReporter …")
+        try:
+            proc.terminate()
+            proc.wait(5)
+        except Exception:
+            pass
+
+def kill_editor():
+    # Without scan_processes (pool workers) only the editor this process started is touched
+    procs = editor.processes()
+    if not procs and config["scan_processes"]:
+        procs = find_processes(editor.name)
+    # Heavy imports wait for first use, so the window and status commands start fast
+    import psutil
+    for proc in procs:
+        try:
+            proc.terminate()
+            proc.wait(10)
+        except psutil.TimeoutExpired:
+            proc.kill()
+        except Exception:
+            pass
+
+def is_editor_running():
+    return editor.is_alive() or (config["scan_processes"] and editor.adopt())
+
+def last_line(path, block=4096):
+    # Last complete line of an append-only file, read backwards from the end
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        data = b""
+        while end > 0:
+            start = max(0, end - block)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+            # Whatever follows the final newline is an interrupted append
+            complete = data.split(b"\n")[:-1]
+            if len(complete) >= 2 or (start == 0 and complete):
+                return complete[-1].decode("utf-8", errors="ignore")
+    return None
+
+def read_isolation_summary(directory=None):
+    # Progress from the state file's one-line header, or the newest journal record
+    directory = directory or state_dir()
+    path = os.path.join(directory, "crash_isolation_state.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        first = f.readline()
+    if first.startswith('{"summary": '):
+        summary = json.loads(first[len('{"summary": '):].rstrip().rstrip(","))
+    else:
+        summary = json.load(open(path))
+
+    journal = os.path.join(directory, "crash_isolation_state.journal")
+    if os.path.exists(journal):
+        try:
+            record = json.loads(last_line(journal) or "{}")
+            if record.get("seq", 0) > summary.get("seq", 0):
+                summary = record["summary"]
+        except ValueError:
+            pass
+    return summary
+
+def chunks_finished():
+    try:
+        return bool((read_isolation_summary() or {}).get("finished"))
+    except Exception:
+        return False
+
+def get_last_crash_status():
+    st = os.path.join(state_dir(), "status.json")
+    if os.path.exists(st):
+        try:
+            return json.load(open(st)).get("crashed", False)
+        except Exception:
+            return False
+    return False
+
+# ---------- LEARNED DELAYS ----------
+# With adaptive_delays the configured waits are caps: each wait shrinks to what this project
+# has needed so far (cycle_timing.DelayStats), the stall limit to what the chunk's size needs.
+DELAY_KINDS = {"initial_delay": "startup", "autorunner_delay": "autorunner",
+               "post_reload_delay": "reload", "max_bake_time_without_freeze": "bake_start"}
+delays = None
+
+def delay_stats():
+    global delays
+    path = os.path.join(saved_dir(), "timing_stats.json")
+    if delays is None or delays.path != path:
+        os.makedirs(saved_dir(), exist_ok=True)
+        delays = DelayStats(path, config["delay_margin"], config["delay_min_samples"])
+    return delays
+
+def delay(key, chunk=None):
+    cap = config[key]
+    if not config["adaptive_delays"]:
+        return cap
+    if key == "bake_stall_timeout":
+        # A slow but healthy bake must not be called a hang, so never below a quarter of the setting
+        return delay_stats().stall_limit(chunk, cap, floor=max(cap_floor(), cap / 4))
+    if key == "log_check_interval":
+        # Several samples within a stall limit, but never below a quarter of the setting
+        return min(cap, max(cap / 4, delay("bake_stall_timeout", chunk) / 4))
+    floor = cap_floor() if key == "max_bake_time_without_freeze" else 0.0
+    return delay_stats().limit(DELAY_KINDS[key], cap, floor)
+
+def cap_floor():
+    # The detector needs a few resource samples before it can call a bake idle or frozen
+    return 2 * config["log_check_interval"]
+
+def learn(key, secs, result):
+    # A wait that ran out counts double, so the next one is longer
+    if config["adaptive_delays"] and result in ("ready", "timeout"):
+        delay_stats().add(DELAY_KINDS[key], round(secs if result == "ready" else 2 * secs, 3))
+
+# ---------- EXEC HELPERS ----------
+def saved_dir():
+    return os.path.join(os.path.dirname(config["project_path"]), "Saved", "GPUCrashFinder")
+
+def state_dir():
+    # Isolation state, status and results; a queued job has its own, the editor files stay in saved_dir()
+    return config["state_dir"] or saved_dir()
+
+def point_state_dir():
+    # auto_runner finds a job's state directory through job.json next to the handshake
+    path = os.path.join(saved_dir(), "job.json")
+    if config["state_dir"]:
+        os.makedirs(config["state_dir"], exist_ok=True)
+        os.makedirs(saved_dir(), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"state_dir": config["state_dir"], "map": config["map_name"]}, f)
+    elif os.path.exists(path):
+        os.remove(path)
+
+def launch_unreal():
+    global client
+    import subprocess
+    log("🚀 Launching Unreal …")
+    args = [config["unreal_path"], config["project_path"], config["map_name"]] + list(config["editor_args"])
+    env = None
+    if config["use_ipc"] and os.path.exists(listener_path):
+        if sys.platform == "win32":
+            # UE stops an unquoted value at the first space, and the quote must follow the "="
+            args = subprocess.list2cmdline(args) + f' -ExecutePythonScript="{listener_path}"'
+        else:
+            args.append(f'-ExecutePythonScript={listener_path}')
+        env = dict(os.environ, GPUCF_TOKEN=ipc_token)
+    if client:
+        client.close()
+    client = None
+    proc = subprocess.Popen(args, env=env)
+    editor.attach(proc.pid, proc)
+
+def connect_editor():
+    # True once the listener of the editor we launched answers
+    global client
+    info = read_listener(saved_dir())
+    if not info or editor.root is None or info.get("pid") != editor.root.pid:
+        return False
+    candidate = EditorClient(info["port"], ipc_token)
+    try:
+        candidate.request("ping", timeout=2)
+    except (OSError, EditorError):
+        candidate.close()
+        return False
+    client = candidate
+    return True
+
+def editor_request(cmd, **args):
+    # Runs one listener command; on failure logs it and falls back to the console from now on
+    global client
+    try:
+        result = client.request(cmd, timeout=config["ipc_timeout"], abort=editor.exited, **args)
+    except (OSError, EditorError) as e:
+        log(f"⚠️ Listener command {cmd} failed: {e}")
+        if not isinstance(e, EditorError):
+            client.close()
+            client = None
+        return None
+    total, spent = client.timings[cmd][-1]
+    log(f"📡 {cmd} done in {total:.2f}s (editor {spent:.2f}s).")
+    return result
+
+def start_editor():
+    # Follow the log from before the launch so the startup line cannot be missed; the
+    # editor rotates the old log away and LogTailer moves on to the new one
+    try:
+        tailer = LogTailer(log_file(), poll_min=config["log_poll_min"], poll_max=config["log_poll_max"])
+    except OSError:
+        tailer = None
+    timing.enter("launch")
+    launch_unreal()
+    timing.enter("startup")
+    if tailer is None and not config["use_ipc"]:
+        countdown("⏳ Initializing", delay("initial_delay"), abort=editor.exited)
+        return
+    rules = RuleEngine(config["log_rules"])
+
+    def ready():
+        # The listener only starts once the editor has finished initializing
+        if config["use_ipc"] and connect_editor():
+            return True
+        return tailer is not None and any(e.kind == "editor_ready" for e in rules.feed(tailer.read_lines()))
+
+    started = time.monotonic()
+    try:
+        result = wait_for("⏳ Initializing", delay("initial_delay"), ready, abort=editor.exited)
+    finally:
+        if tailer:
+            tailer.close()
+    learn("initial_delay", time.monotonic() - started, result)
+    if result == "ready" and client is None and config["use_ipc"]:
+        # Startup line first; the listener follows within a moment
+        wait_for("⏳ Waiting for listener", config["ready_grace"], connect_editor, abort=editor.exited)
+    if client:
+        log(f"📡 Connected to the editor listener after {time.monotonic() - started:.0f}s.")
+    elif result == "ready":
+        log(f"✅ Editor ready after {time.monotonic() - started:.0f}s.")
+        countdown("⏳ Settling", config["ready_grace"], abort=editor.exited)
+
+def handshake_path():
+    return os.path.join(saved_dir(), "handshake.json")
+
+def read_handshake():
+    try:
+        with open(handshake_path(), "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def handshake_seq():
+    # auto_runner and the reload command bump this number when they are done
+    return read_handshake().get("seq", 0)
+
+def restores_in_place():
+    # auto_runner's "exclude" isolation puts actors back on its next run, without a reload
+    return read_handshake().get("isolation") == "exclude"
+
+def wait_handshake(msg, key, before):
+    started = time.monotonic()
+    secs = delay(key)
+    result = wait_for(msg, secs, lambda: handshake_seq() > before, abort=editor.exited)
+    learn(key, time.monotonic() - started, result)
+    if result == "ready":
+        log(f"🤝 Done after {time.monotonic() - started:.1f}s.")
+    elif result == "timeout":
+        log(f"⌛ No handshake within {secs:.0f}s – continuing.")
+    return result
+
+def exec_runner():
+    timing.enter("autorunner")
+    log("📜 Running autorunner …")
+    if client:
+        result = editor_request("run_autorunner", path=config["autorunner_path"])
+        if result is not None:
+            log(f"🤝 Autorunner: {result.get('phase')}")
+            return
+        if client or editor.exited.is_set():
+            return
+    before = handshake_seq()
+    pyautogui = gui_input()
+    pyautogui.click(config["console_pos"])
+    time.sleep(0.4)
+    runner_path = config["autorunner_path"].replace("\\", "/")
+    pyautogui.typewrite(f'exec(open("{runner_path}").read())')
+    pyautogui.press("enter")
+    wait_handshake("⏳ Waiting autorunner", "autorunner_delay", before)
+
+def click_build():
+    if client and config["ipc_build"]:
+        if editor_request("build_lighting") is not None:
+            log("🔨 Build lighting started")
+            return
+        if client or editor.exited.is_set():
+            return
+    log("🖱 Build lighting click")
+    pyautogui = gui_input()
+    pyautogui.moveTo(config["click_pos"], duration=1)
+    pyautogui.click()
+
+def log_file():
+    log_dir = os.path.join(os.path.dirname(config["project_path"]), "Saved", "Logs")
+    return os.path.join(log_dir, os.path.splitext(os.path.basename(config["project_path"]))[0] + ".log")
+
+def write_status(crashed: bool, suspects=None):
+    os.makedirs(state_dir(), exist_ok=True)
+    st = os.path.join(state_dir(), "status.json")
+    status = {"crashed": crashed}
+    if suspects:
+        status["suspects"] = suspects
+    json.dump(status, open(st, "w"))
+    log("📝  Status written → " + st)
+
+def record_metrics(bake_id, sample, state):
+    # Optional JSONL trace of every resource sample, for python -m sim.freeze_replay --trace
+    if not config["metrics_trace"]:
+        return
+    try:
+        with open(config["metrics_trace"], "a") as f:
+            f.write(json.dumps(dict(sample._asdict(), bake=bake_id, state=state)) + "\n")
+    except OSError:
+        pass
+
+# ---------- MONITOR ----------
+def give_up(verdict):
+    # The bake is over; what follows is cleaning up after the editor
+    timing.note(verdict=verdict)
+    timing.enter("recovery")
+
+def extend_stall_limit(rules, detector, seconds):
+    # A learned stall limit ran out: wait up to the configured one before the hang is a verdict
+    cap = config["bake_stall_timeout"]
+    if rules.stall_timeout is None or rules.stall_timeout >= cap:
+        return False
+    log(f"⏳ No progress for {seconds:.0f}s, longer than earlier bakes of this project – waiting up to {cap:.0f}s.")
+    rules.stall_timeout = detector.frozen_after = cap
+    rules.stalled = False
+    return True
+
+def learn_bake(chunk, clicked, moved_at, gap):
+    # A healthy bake: its length and longest progress gap set the stall limits of later ones
+    if config["adaptive_delays"] and moved_at is not None:
+        now = time.monotonic()
+        delay_stats().add("bake", [chunk or 0, round(now - clicked, 3), round(max(gap, now - moved_at), 3)])
+
+def bake_cycle(chunk=None):
+    timing.enter("bake")
+    bake_cycle.started = time.time()
+    try:
+        tailer = LogTailer(log_file(), poll_min=config["log_poll_min"], poll_max=config["log_poll_max"])
+        # Where this bake's log output starts, for crash_suspects()
+        bake_cycle.log_start = os.path.getsize(log_file())
+    except Exception as e:
+        log("❌ Failed to open log file: " + str(e))
+        return False
+    stall = delay("bake_stall_timeout", chunk)
+    interval = delay("log_check_interval", chunk)
+    idle_after = delay("max_bake_time_without_freeze")
+    if stall < config["bake_stall_timeout"] or idle_after < config["max_bake_time_without_freeze"]:
+        log(f"🎚 Learned limits: hang after {stall:.0f}s without progress, build retried after {idle_after:.0f}s.")
+    rules = RuleEngine(config["log_rules"], stall_timeout=stall)
+
+    with tailer:
+        if not editor.is_alive():
+            give_up("exited")
+            close_crash_reporter()
+            log("🛑 Editor exited before the build started.")
+            return False
+        reporters = editor.reporters_started
+        detector = FreezeDetector(low_cpu=config["cpu_freeze_threshold"],
+                                  idle_after=idle_after,
+                                  frozen_after=stall,
+                                  **(config["freeze_detector"] or {}))
+        bake_id = int(time.time())
+        state = None
+        log_lines = 0
+        # The first sample shows the responsive editor the detector compares the build against.
+        # It gets a fresh window: since the last sample the editor may have been starting up or
+        # blocked in auto_runner, and a low reading there would pass for a running build
+        editor.metrics()
+        time.sleep(min(interval, 1.0))
+        m = editor.metrics()
+        if m is not None:
+            sample = Sample(time.monotonic(), m["cpu"], m["io"], m["threads"], m["rss"], 0, None)
+            state = detector.update(sample)
+            record_metrics(bake_id, sample, state)
+        click_build()
+        clicked = time.monotonic()
+        log("🔎 Monitoring lightbuild log …")
+        next_check = time.monotonic() + interval
+        shown_progress = None
+        # When the progress last moved, and the longest wait between two moves
+        moved_at, gap = None, 0.0
+
+        while True:
+            # Log lines and process events are handled as they arrive; resource samples keep
+            # the log_check_interval pace
+            lines = tailer.read_lines()
+            log_lines += len(lines)
+            for event in rules.feed(lines):
+                if event.kind == "completed":
+                    learn_bake(chunk, clicked, moved_at, gap)
+                    timing.note(verdict="passed")
+                    log("✅ Lightbuild finished.")
+                    return True
+                if event.kind == "crashed":
+                    give_up("crashed")
+                    log("💥 Crash reported in log: " + event.line.strip())
+                    await_crash_report()
+                    kill_editor()
+                    close_crash_reporter()
+                    return False
+                if event.kind == "progress" and (shown_progress is None or event.values["percent"] >= shown_progress + 10):
+                    shown_progress = event.values["percent"]
+                    log(f"📈 Lightmass progress: {shown_progress:.0f}%")
+
+            if rules.progress_time is not None and rules.progress_time != moved_at:
+                if moved_at is None:
+                    learn("max_bake_time_without_freeze", rules.progress_time - clicked, "ready")
+                else:
+                    gap = max(gap, rules.progress_time - moved_at)
+                moved_at = rules.progress_time
+
+            stalled = rules.check_stall()
+            if stalled and not extend_stall_limit(rules, detector, stalled.values["seconds"]):
+                give_up("hung")
+                log(f"🧊 Lightmass progress stuck at {stalled.values['percent']:.0f}% for {stalled.values['seconds']:.0f}s – treating as hang.")
+                kill_editor()
+                close_crash_reporter()
+                return False
+
+            editor.wake.clear()
+            if editor.exited.is_set():
+                give_up("exited")
+                close_crash_reporter()
+                log("🛑 Editor exited prematurely.")
+                return False
+            if editor.reporters_started > reporters:
+                give_up("crashed")
+                log("💥 CrashReportClient started – treating as crash.")
+                await_crash_report()
+                kill_editor()
+                close_crash_reporter()
+                return False
+
+            if time.monotonic() >= next_check:
+                if not is_editor_running():
+                    give_up("exited")
+                    close_crash_reporter()
+                    log("🛑 Editor exited prematurely.")
+                    return False
+
+                m = editor.metrics()
+                if m is not None:
+                    sample = Sample(time.monotonic(), m["cpu"], m["io"], m["threads"], m["rss"], log_lines, rules.progress)
+                    log_lines = 0
+                    previous, state = state, detector.update(sample)
+                    record_metrics(bake_id, sample, state)
+                    log(f"🧠 Unreal CPU usage: {sample.cpu:.1f}% ({state})")
+                    if state != previous and state not in (IDLE, FROZEN, FINISHED):
+                        log(f"🔄 Editor looks {state}.")
+
+                    if state == IDLE:
+                        log("🔁 Unreal didn’t freeze – retrying build …")
+                        click_build()
+                        clicked = time.monotonic()
+                        detector.rearm(sample.t)
+                    elif state == FROZEN and not extend_stall_limit(rules, detector, detector.frozen_after):
+                        give_up("hung")
+                        log(f"🧊 Editor idle with no CPU, I/O or log output for {detector.frozen_after:.0f}s – treating as hang.")
+                        kill_editor()
+                        close_crash_reporter()
+                        return False
+                    elif state == FINISHED:
+                        learn_bake(chunk, clicked, moved_at, gap)
+                        timing.note(verdict="passed")
+                        log("✅ Lightbuild finished (progress 100%, editor responsive again).")
+                        return True
+                next_check = time.monotonic() + interval
+
+            tailer.wait(max(0.0, next_check - time.monotonic()), wake=editor.wake)
+
+bake_cycle.started = 0.0
+bake_cycle.log_start = 0
+
+# ---------- CRASH SIGNATURES ----------
+def await_crash_report():
+    # The engine writes the fatal error, callstack and crash report after the first crash
+    # line and exits on its own; killing it right away would cut that short
+    if config["crash_log_scan_mb"]:
+        editor.exited.wait(config["crash_log_grace"])
+
+def crash_suspects():
+    # Actors and assets the crash section of the last bake's log names (crash_log.py), for
+    # auto_runner to bake on their own first; None when it names none
+    if not config["crash_log_scan_mb"]:
+        return None
+    started = time.perf_counter()
+    crash_dir = os.path.join(os.path.dirname(config["project_path"]), "Saved", "Crashes")
+    found = crash_log.analyze(log_file(), bake_cycle.log_start, crash_dir, bake_cycle.started,
+                              int(config["crash_log_scan_mb"] * 1024 * 1024))
+    if not found["error"]:
+        return None
+    log(f"🔍 Crash log read in {(time.perf_counter() - started) * 1000:.0f} ms: {found['error']}")
+    if found["callstack"]:
+        log("   ↪ " + " < ".join(found["callstack"][:3]))
+    if not found["actors"] and not found["assets"]:
+        return None
+    log(f"🔍 Named in the crash: {', '.join(found['actors'] + found['assets'])}")
+    return {"actors": found["actors"], "assets": found["assets"]}
+
+# ---------- MAP RELOAD ----------
+def reload_map():
+    timing.enter("reload")
+    log("⏳ Waiting for map to reload …")
+    upath = to_unreal(config["map_name"])
+    if not upath.startswith("/Game/"):
+        log("❌ Invalid map path: " + upath)
+        return False
+    if client:
+        if editor_request("reload_map", map=upath) is not None:
+            log("✅ Map reloaded.")
+            return True
+        if client or editor.exited.is_set():
+            return False
+    before = handshake_seq()
+    hs_path = handshake_path().replace("\\", "/")
+    pyautogui = gui_input()
+    pyautogui.click(config["console_pos"])
+    time.sleep(0.4)
+    # load_level blocks until the map is loaded, so the handshake write after it marks the end
+    pyautogui.typewrite(f'import unreal, json; unreal.get_editor_subsystem(unreal.LevelEditorSubsystem).load_level("{upath}"); '
+                        f'json.dump({{"seq": {before + 1}, "phase": "reloaded"}}, open("{hs_path}", "w"))')
+    pyautogui.press("enter")
+    if wait_handshake("⏳ Waiting after reload", "post_reload_delay", before) == "aborted":
+        log("🛑 Editor exited during map reload.")
+        return False
+    log("✅ Map reloaded.")
+    return True
+
+def refresh_chunk_info():
+    bad_path = os.path.join(state_dir(), "crashing_actors_list.txt")
+
+    try:
+        s = read_isolation_summary()
+    except Exception:
+        emit("chunks", text="❌ JSON read error", faulty=None)
+        return
+    if s is None:
+        emit("chunks", text="⏳ Waiting for first run …", faulty=None)
+        return
+
+    total = s.get("all_chunks", 0)
+    done  = s.get("chunks_completed", 0)
+    faulty = None
+    if s.get("finished"):
+        faulty = "✅ No crashing actors found."
+        if os.path.exists(bad_path):
+            faulty = open(bad_path).read().strip() or faulty
+    emit("chunks", text=f"🧩 Chunks: {done}/{total} (Left: {total - done})", faulty=faulty)
+    return s
+
+def reset_isolation_progress(forget_verdicts=False):
+    state_file = os.path.join(state_dir(), "crash_isolation_state.json")
+    journal_file = os.path.join(state_dir(), "crash_isolation_state.journal")
+    cache_file = os.path.join(state_dir(), "verdict_cache.jsonl")
+    # Verdicts per actor fingerprint outlive a reset, so the next run only bakes what changed
+    if forget_verdicts and os.path.exists(cache_file):
+        os.remove(cache_file)
+        log("🗑 verdict_cache.jsonl deleted.")
+    elif os.path.exists(cache_file):
+        log("ℹ️ Verdict cache kept – the next run bakes new or changed actors and a spot check.")
+    if os.path.exists(state_file):
+        try:
+            os.remove(state_file)
+            if os.path.exists(journal_file):
+                os.remove(journal_file)
+            log("🗑 crash_isolation_state.json deleted.")
+        except Exception as e:
+            log(f"❌ Failed to delete crash_isolation_state.json: {e}")
+    else:
+        log("ℹ️ No crash_isolation_state.json found to delete.")
+
+# ---------- TIMING ----------
+def start_timing():
+    path = config["timing_log"]
+    timing.reset(os.path.join(exe_dir, path) if path else "")
+    if config["metrics_port"]:
+        try:
+            serve_metrics(timing, config["metrics_port"])
+        except OSError as e:
+            log(f"⚠️ Metrics endpoint on port {config['metrics_port']} failed: {e}")
+
+def log_cycle(record):
+    if record and record["phases"]:
+        log(f"⏱ Cycle {record['cycle']} ({record['verdict']}): "
+            + ", ".join(f"{phase} {seconds:.1f}s" for phase, seconds in record["phases"].items()))
+
+def report_timing():
+    log_cycle(timing.end_cycle())
+    summary = timing.finish()
+    if summary:
+        for line in timing.report(summary):
+            log(line)
+
+# ---------- WATCHDOG ----------
+def watchdog():
+    global stop_requested, watchdog_running
+    # Runs until every chunk is tested or a stop is requested; True when the isolation finished
+    watchdog_running = True
+    emit("status", text="🟢 Watchdog running", running=True)
+    point_state_dir()
+
+    if chunks_finished():
+        log("🏁 Autorunner already finished – stopping Watchdog.")
+        emit("status", text="⚪ Cycle finished", running=False)
+        watchdog_running = False
+        return True
+    start_timing()
+
+    if config["workers"] > 1:
+        # One editor per project copy; worker_pool schedules the chunks across them
+        import worker_pool
+        try:
+            worker_pool.run_pool()
+        finally:
+            report_timing()
+            watchdog_running = False
+            emit("status", text="🔴 Watchdog stopped", running=False)
+        return chunks_finished()
+
+    unreal_crashed = get_last_crash_status()
+    skip_launch = not unreal_crashed and is_editor_running()
+
+    while True:
+        log_cycle(timing.end_cycle())
+        if stop_requested:
+            log("🛑 Stop requested – Watchdog ending after this cycle.")
+            stop_requested = False
+            break
+
+        if chunks_finished():
+            log("🏁 All chunks tested – Watchdog stopping.")
+            break
+
+        timing.start_cycle()
+        if not skip_launch:
+            start_editor()
+
+        # A dead editor falls straight through to bake_cycle, which reports it
+        if not editor.exited.is_set():
+            exec_runner()
+
+        summary = refresh_chunk_info()
+        chunk = summary.get("current_chunk_size") if summary else None
+        timing.note(chunk=chunk)
+
+        if chunks_finished():
+            log("🏁 All chunks tested – Watchdog stopping.")
+            break
+
+        if not bake_cycle(chunk):
+            write_status(True, crash_suspects())
+            skip_launch = False
+            continue
+
+        write_status(False)
+
+        if chunks_finished():
+            log("🏁 All chunks tested – Watchdog stopping.")
+            break
+
+        if restores_in_place():
+            skip_launch = True
+            continue
+
+        if not reload_map():
+            skip_launch = False
+            continue
+
+        skip_launch = True
+
+    report_timing()
+    watchdog_running = False
+    emit("status", text="🔴 Watchdog stopped", running=False)
+    return chunks_finished()
+
+def request_stop():
+    # Honoured between cycles, so a running bake is never cut short
+    global stop_requested
+    stop_requested = True
+
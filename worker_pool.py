@@ -0,0 +1,398 @@
+import os, sys, json, time, queue, types, signal, shutil, threading, subprocess, importlib.util
+import watchdog_core as core
+from watchdog_core import config, log
+
+# Parallel isolation: one editor per project copy, all baking at the same time.
+#
+# The scheduler runs in the watchdog process and owns the isolation state. It loads
+# auto_runner's search code (next_chunk, record_verdict, save_state) outside the editor and
+# hands disjoint chunks from the index stack to idle workers; every verdict is merged with
+# record_verdict into the one state file of the main project, so status, reset and the
+# crashing actor list work as with a single editor.
+#
+# A worker is `watchdog_cli worker` in its own process with its own config: the copy's
+# project, its own editor, token and log. It reads {"cmd": "bake", "names": [...]} lines on
+# stdin, has the listener destroy every other actor, runs the usual bake_cycle and answers
+# {"crashed": ...} on stdout; log lines go the same way and show up here as "[n] …".
+#
+# Started by watchdog() when config["workers"] > 1. The copies are worker_projects, or made
+# under worker_dir (default: next to the project, "<Project>_workers") with hard links for
+# the content and real copies of Config/ and the .uproject. worker_args[i] is appended to
+# worker i's command line, e.g. ["-graphicsadapter=1"] to put it on the second GPU.
+
+# ---------- PROJECT COPIES ----------
+# Written by every editor, so each copy starts without them
+COPY_SKIP = {"Saved", "Intermediate", "DerivedDataCache", ".git", ".vs"}
+# Edited in place by the editor; a hard link would write through to the main project
+COPY_REAL = {"Config"}
+
+def unchanged(src, dst):
+    a, b = os.stat(src), os.stat(dst)
+    return (a.st_ino, a.st_dev) == (b.st_ino, b.st_dev) or (a.st_size, int(a.st_mtime)) == (b.st_size, int(b.st_mtime))
+
+def sync_copy(src, dst):
+    # Brings dst up to date with src; only files that changed since the last run are touched
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel = os.path.relpath(dirpath, src)
+        if rel == ".":
+            dirnames[:] = [d for d in dirnames if d not in COPY_SKIP]
+        target = os.path.normpath(os.path.join(dst, rel))
+        os.makedirs(target, exist_ok=True)
+        real = rel == "." or rel.split(os.sep)[0] in COPY_REAL
+        for name in filenames:
+            s, d = os.path.join(dirpath, name), os.path.join(target, name)
+            if os.path.exists(d):
+                if unchanged(s, d):
+                    continue
+                os.remove(d)
+            if real:
+                shutil.copy2(s, d)
+                continue
+            try:
+                os.link(s, d)
+            except OSError:
+                # Another drive, or a file system without hard links
+                shutil.copy2(s, d)
+
+def worker_projects(count):
+    # None when the copies cannot be made next to the project
+    projects = list(config["worker_projects"])[:count]
+    if len(projects) == count:
+        return projects
+    project_dir = os.path.dirname(os.path.abspath(config["project_path"]))
+    root = config["worker_dir"] or project_dir + "_workers"
+    if os.path.splitdrive(os.path.abspath(root))[0].lower() != os.path.splitdrive(project_dir)[0].lower():
+        # Hard links cannot cross drives, so every copy would duplicate the whole project
+        log(f"❌ worker_dir {root} is on another drive than the project {project_dir} – "
+            f"pick a folder on the same drive or list the copies in worker_projects.", "error")
+        return None
+    for i in range(len(projects), count):
+        copy_dir = os.path.join(root, str(i + 1), os.path.basename(project_dir))
+        log(f"📂 Syncing project copy {i + 1} → {copy_dir}")
+        sync_copy(project_dir, copy_dir)
+        projects.append(os.path.join(copy_dir, os.path.basename(config["project_path"])))
+    return projects
+
+def copy_path(path, uproject):
+    # The map as seen from a copy: same place relative to the project directory
+    project_dir = os.path.dirname(os.path.abspath(config["project_path"]))
+    try:
+        rel = os.path.relpath(os.path.abspath(path), project_dir)
+    except ValueError:
+        # Another drive on Windows, so not inside the project either
+        return path
+    if rel.startswith(".."):
+        return path
+    return os.path.join(os.path.dirname(uproject), rel)
+
+# ---------- WORKERS ----------
+class Worker:
+
+    def __init__(self, index, uproject, results):
+        self.index = index
+        self.uproject = uproject
+        self.results = results
+        self.failures = 0
+        self.cpu = 0.0
+        self.proc = None
+
+    def start(self):
+        worker_args = config["worker_args"][self.index] if self.index < len(config["worker_args"]) else []
+        cfg = dict(config, project_path=self.uproject, map_name=copy_path(config["map_name"], self.uproject),
+                   editor_args=list(config["editor_args"]) + list(worker_args), workers=1,
+                   scan_processes=False, use_ipc=True, ipc_build=True, log_history_file="", state_dir="")
+        saved = os.path.join(os.path.dirname(self.uproject), "Saved", "GPUCrashFinder")
+        os.makedirs(saved, exist_ok=True)
+        path = os.path.join(saved, "worker_config.json")
+        with open(path, "w") as f:
+            json.dump(cfg, f, indent=2)
+        # load_config() always points autorunner_path next to the watchdog, so it is passed on
+        args = [sys.executable, os.path.join(core.exe_dir, "watchdog_cli.py"), "worker", "--config", path,
+                "--set", "autorunner_path=" + json.dumps(config["autorunner_path"])]
+        self.proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     encoding="utf-8", errors="replace", bufsize=1)
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            if "log" in msg:
+                log(f"[{self.index + 1}] {msg['log']}", msg.get("tag"))
+            elif "cpu" in msg:
+                self.cpu = msg["cpu"]
+            else:
+                self.results.put((self, msg))
+        self.results.put((self, {"error": "worker exited", "exited": True}))
+
+    def send(self, **msg):
+        try:
+            self.proc.stdin.write(json.dumps(msg) + "\n")
+            self.proc.stdin.flush()
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def stop(self):
+        # Asks the worker to close its editor and exit; finish() waits for that
+        if self.proc is None:
+            return
+        self.send(cmd="stop")
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+
+    def finish(self, deadline):
+        if self.proc is None:
+            return
+        try:
+            self.proc.wait(max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+# ---------- SCHEDULER ----------
+def load_search(project_dir):
+    # auto_runner's search and state code, run here instead of inside an editor. Away from a
+    # level it only needs unreal's logging and the project directory
+    shim = types.ModuleType("unreal")
+    shim.log = lambda msg: log(msg)
+    shim.log_warning = lambda msg: log(msg, "warn")
+    shim.log_error = lambda msg: log(msg, "error")
+    shim.SystemLibrary = types.SimpleNamespace(get_project_directory=lambda: project_dir)
+    previous = sys.modules.get("unreal")
+    sys.modules["unreal"] = shim
+    try:
+        spec = importlib.util.spec_from_file_location("auto_runner_search", config["autorunner_path"])
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if previous is None:
+            del sys.modules["unreal"]
+        else:
+            sys.modules["unreal"] = previous
+    return module
+
+def take_chunk(search, state, running, retry):
+    if retry:
+        return retry.pop()
+    # A minimization step depends on the verdict before it, so only one runs at a time
+    ddmin_busy = any(entry and "ddmin" in entry for entry, _ in running.values())
+    ddmin = state["ddmin"]
+    if ddmin_busy:
+        state["ddmin"] = None
+    try:
+        chunk = search.next_chunk(state)
+    finally:
+        if ddmin_busy:
+            state["ddmin"] = ddmin
+    if chunk is None:
+        # Bakes still running may split into new chunks
+        if running:
+            state["finished"] = False
+        return None
+    task = (state["last_entry"], chunk)
+    state["last_entry"], state["last_chunk"] = None, []
+    return task
+
+def save(search, state, tasks):
+    # Chunks out for baking go back on the stack in the file, so a restart hands them out again
+    stack = state["index_stack"]
+    state["index_stack"] = stack + [entry for entry, _ in tasks if entry and "ddmin" not in entry]
+    try:
+        search.save_state(state)
+    finally:
+        state["index_stack"] = stack
+
+def wait_reply(worker, results):
+    # The first answer from `worker`; others only report exits at this point
+    while True:
+        sender, msg = results.get()
+        if sender is worker:
+            return msg
+
+def list_actors(workers, results):
+    for worker in workers:
+        if worker.send(cmd="list"):
+            msg = wait_reply(worker, results)
+            if "actors" in msg:
+                return msg["actors"]
+            log(f"⚠️ Worker {worker.index + 1} could not list the actors: {msg.get('error')}")
+    return None
+
+def run_pool():
+    if getattr(sys, "frozen", False):
+        log("❌ Worker pools start watchdog_cli.py per worker and need the Python sources.", "error")
+        return False
+    project_dir = os.path.dirname(os.path.abspath(config["project_path"]))
+    search = load_search(project_dir)
+    state = search.load_state()
+    results = queue.Queue()
+    projects = worker_projects(config["workers"])
+    if projects is None:
+        return False
+    workers = [Worker(i, path, results) for i, path in enumerate(projects)]
+    log(f"👷 Starting {len(workers)} workers …")
+    for worker in workers:
+        worker.start()
+    started = time.monotonic()
+    try:
+        actors = list_actors(workers, results)
+        if actors is None:
+            log("❌ No worker could read the level – stopping.", "error")
+            return False
+        labels = {name: label for name, label, *_ in actors}
+        if not state["initialized"]:
+            search.start_isolation(state, [a[0] for a in actors], [a[2] for a in actors], [a[3] for a in actors],
+                                   search.load_verdict_cache(), [a[4] for a in actors])
+            log(f"🟢 Isolation started over {len(labels)} actors.")
+        state["workers"] = len(workers)
+
+        retry = []
+        if state["last_chunk"]:
+            # The untouched level after initialization, or a chunk a single editor was testing
+            retry.append((state["last_entry"], state["last_chunk"]))
+            state["last_entry"], state["last_chunk"] = None, []
+        running = {}
+        idle = list(workers)
+        stopping = False
+        while True:
+            if core.stop_requested and not stopping:
+                stopping = True
+                core.stop_requested = False
+                log(f"🛑 Stop requested – waiting for {len(running)} running bakes.")
+            while idle and not stopping:
+                task = take_chunk(search, state, running, retry)
+                if task is None:
+                    break
+                worker = idle.pop(0)
+                if not worker.send(cmd="bake", names=task[1]):
+                    retry.append(task)
+                    continue
+                running[worker] = task
+                log(f"🧩 Worker {worker.index + 1}: testing {len(task[1])} actors.")
+                save(search, state, list(running.values()) + retry)
+            if not running:
+                break
+
+            worker, msg = results.get()
+            task = running.pop(worker, None)
+            if "error" in msg:
+                worker.failures += 1
+                if task:
+                    retry.append(task)
+                    log(f"⚠️ Worker {worker.index + 1}: {msg['error']} – chunk handed out again.", "warn")
+                if msg.get("exited") or worker.failures >= 3:
+                    log(f"❌ Worker {worker.index + 1} retired.", "error")
+                    if worker in idle:
+                        idle.remove(worker)
+                    if not running and not idle:
+                        log("❌ No workers left – stopping.", "error")
+                        break
+                elif task:
+                    idle.append(worker)
+                continue
+            if task is None:
+                continue
+
+            worker.failures = 0
+            entry, chunk = task
+            crashed = msg["crashed"]
+            if msg.get("timing"):
+                core.timing.record(dict(msg["timing"], worker=worker.index + 1))
+            log(f"{'💥' if crashed else '✅'} Worker {worker.index + 1}: {len(chunk)} actors "
+                f"{'crashed' if crashed else 'passed'}.", "error" if crashed else "ok")
+            state["last_entry"], state["last_chunk"] = entry, chunk
+            search.record_verdict(state, crashed, (msg.get("suspects") or {}).get("actors"))
+            save(search, state, list(running.values()) + retry)
+            core.refresh_chunk_info()
+            idle.append(worker)
+
+        if state["finished"] and not running:
+            search.record_crash_history(state)
+            search.save_state(state)
+            search.export_crashing_actors(state, types.SimpleNamespace(label=lambda name: labels.get(name, name)))
+            log(f"🏁 All chunks tested by {len(workers)} workers in {(time.monotonic() - started) / 60:.1f} min "
+                f"({state['bakes']} bakes).")
+        core.refresh_chunk_info()
+        return state["finished"]
+    finally:
+        for worker in workers:
+            worker.stop()
+        # A worker still in a bake only reads the stop once it is done
+        deadline = time.monotonic() + 60
+        for worker in workers:
+            worker.finish(deadline)
+        run_pool.worker_cpu = sum(worker.cpu for worker in workers)
+run_pool.worker_cpu = 0.0
+
+# ---------- WORKER PROCESS ----------
+def ensure_editor():
+    if core.client and core.editor.is_alive():
+        return True
+    core.kill_editor()
+    core.close_crash_reporter()
+    core.start_editor()
+    return core.client is not None
+
+def bake(names):
+    # True when the chunk crashed the editor, False when it baked, None when it never got to bake
+    core.timing.enter("autorunner")
+    isolated = core.editor_request("isolate", path=config["autorunner_path"], names=names)
+    if isolated is None:
+        return None
+    if not core.bake_cycle(len(names)):
+        return True
+    # Excluded actors come back with the next isolate; destroyed ones need the map again
+    if isolated.get("isolation") == "exclude":
+        return False
+    if not (core.client and core.reload_map()):
+        # The next chunk gets a fresh editor with the full level
+        core.kill_editor()
+    return False
+
+def run_worker():
+    # The scheduler decides when workers stop; Ctrl+C in its console must not reach them first
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # stdout is the channel to the scheduler; the editor inherits stderr instead
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def send(**msg):
+        out.write(json.dumps(msg) + "\n")
+        out.flush()
+
+    core.subscribe(lambda kind, data: send(log=data["msg"], tag=data["tag"]) if kind == "log" else None)
+    try:
+        ensure_editor()
+        for line in sys.stdin:
+            msg = json.loads(line)
+            if msg["cmd"] == "stop":
+                break
+            if msg["cmd"] == "bake":
+                # Timed like a watchdog cycle; the record goes back with the verdict
+                core.timing.start_cycle()
+                core.timing.note(chunk=len(msg["names"]))
+            try:
+                if not ensure_editor():
+                    send(error="no listener in the editor")
+                elif msg["cmd"] == "list":
+                    result = core.editor_request("list_actors", path=config["autorunner_path"])
+                    send(**(result if result else {"error": "list_actors failed"}))
+                elif msg["cmd"] == "bake":
+                    crashed = bake(msg["names"])
+                    record = core.timing.end_cycle()
+                    if crashed is None:
+                        send(error="isolate failed")
+                    else:
+                        send(crashed=crashed, timing=record, suspects=core.crash_suspects() if crashed else None)
+            except Exception as e:
+                core.kill_editor()
+                send(error=f"{type(e).__name__}: {e}")
+    finally:
+        core.kill_editor()
+        core.close_crash_reporter()
+        send(cpu=sum(os.times()[:2]))
+    return 0